@@ -0,0 +1,144 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# IATA metropolitan area codes -> member airports. Airports whose city matches
+# another member's city in airports.json are grouped with them as well.
+METRO_AREAS = {
+    "NYC": ["JFK", "LGA", "EWR"],
+    "WAS": ["IAD", "DCA", "BWI"],
+    "CHI": ["ORD", "MDW"],
+    "QDF": ["DFW", "DAL"],
+    "QHO": ["IAH", "HOU"],
+    "QLA": ["LAX", "BUR", "LGB", "SNA", "ONT"],
+    "QSF": ["SFO", "OAK", "SJC"],
+    "QMI": ["MIA", "FLL", "PBI"],
+    "YTO": ["YYZ", "YTZ"],
+    "YMQ": ["YUL", "YMX"],
+    "LON": ["LHR", "LGW", "STN", "LTN", "LCY", "SEN"],
+    "PAR": ["CDG", "ORY", "BVA"],
+    "MIL": ["MXP", "LIN", "BGY"],
+    "ROM": ["FCO", "CIA"],
+    "STO": ["ARN", "BMA", "NYO"],
+    "MOW": ["SVO", "DME", "VKO"],
+    "TYO": ["NRT", "HND"],
+    "OSA": ["KIX", "ITM", "UKB"],
+    "SEL": ["ICN", "GMP"],
+    "BJS": ["PEK", "PKX"],
+    "BKK": ["BKK", "DMK"],
+    "JKT": ["CGK", "HLP"],
+    "SAO": ["GRU", "CGH", "VCP"],
+    "RIO": ["GIG", "SDU"],
+    "BUE": ["EZE", "AEP"],
+}
+
+# Default search radius for expand_nearby
+DEFAULT_RADIUS_KM = 100.0
+EARTH_RADIUS_KM = 6371.0
+
+def _coordinates(airport: dict) -> Optional[Tuple[float, float]]:
+    coords = airport.get("coordinates") or airport
+    lat = coords.get("lat", coords.get("latitude"))
+    lng = coords.get("lng", coords.get("lon", coords.get("longitude")))
+    try:
+        return float(lat), float(lng)
+    except (TypeError, ValueError):
+        return None
+
+class AirportIndex:
+    """
+    Airport lookups for search expansion.
+
+    Groups airports by metro code and by city, and keeps their coordinates in
+    radian arrays so every airport within a radius of another is found with one
+    vectorized haversine pass.
+    """
+
+    def __init__(self, airports: List[dict]):
+        self.airports: Dict[str, dict] = {}
+        self._cities: Dict[str, List[str]] = {}
+        codes, lats, lngs = [], [], []
+        for airport in airports:
+            code = str(airport.get("code", "")).upper()
+            if not code or code in self.airports:
+                continue
+            self.airports[code] = airport
+            city = str(airport.get("city", "")).strip().lower()
+            if city:
+                self._cities.setdefault(city, []).append(code)
+            coords = _coordinates(airport)
+            if coords is not None:
+                codes.append(code)
+                lats.append(coords[0])
+                lngs.append(coords[1])
+
+        self._metro_of: Dict[str, str] = {
+            member: metro for metro, members in METRO_AREAS.items() for member in members
+        }
+        self._geo_codes = np.array(codes, dtype=object)
+        self._lat = np.radians(np.array(lats, dtype=np.float64))
+        self._lng = np.radians(np.array(lngs, dtype=np.float64))
+        self._geo_row = {code: i for i, code in enumerate(codes)}
+
+    @classmethod
+    def from_document(cls, data) -> "AirportIndex":
+        if isinstance(data, dict):
+            data = data.get("airports", [])
+        return cls(data)
+
+    def metro(self, code: str) -> List[str]:
+        """Airports sharing a metro code or a city with `code` (which may itself be a metro code)."""
+        code = code.upper()
+        members = list(METRO_AREAS.get(code, []))
+        metro = self._metro_of.get(code)
+        if metro:
+            members += METRO_AREAS[metro]
+        if code in self.airports:
+            members.append(code)
+        for member in list(members):
+            city = str(self.airports.get(member, {}).get("city", "")).strip().lower()
+            members += self._cities.get(city, [])
+        return list(dict.fromkeys(members))
+
+    def serving(self, place: str) -> List[str]:
+        """Airports whose city is named in `place` ("Paris", "Paris, France"), metro siblings included."""
+        place = place.strip().lower()
+        if not place:
+            return []
+        codes = [code for city, members in self._cities.items() if city in place for code in members]
+        for code in list(codes):
+            codes += self.metro(code)
+        return list(dict.fromkeys(codes))
+
+    def within(self, code: str, radius_km: float) -> List[str]:
+        """Airports within `radius_km` of `code`, nearest first."""
+        row = self._geo_row.get(code.upper())
+        if row is None:
+            return []
+        lat, lng = self._lat[row], self._lng[row]
+        h = (np.sin((self._lat - lat) / 2) ** 2
+             + np.cos(lat) * np.cos(self._lat) * np.sin((self._lng - lng) / 2) ** 2)
+        distance = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+        near = np.flatnonzero(distance <= radius_km)
+        return list(self._geo_codes[near[np.argsort(distance[near], kind="stable")]])
+
+    def expand(self, code: str, nearby: bool = False, radius_km: Optional[float] = None) -> List[str]:
+        """
+        Airport codes a search for `code` should cover.
+
+        Metro codes (NYC, LON, ...) always expand to their airports; with
+        `nearby` an airport code also pulls in its metro/city siblings and
+        every airport within the radius.
+        """
+        code = code.upper()
+        if code in METRO_AREAS and code not in self.airports:
+            codes = self.metro(code)
+        elif nearby:
+            codes = self.metro(code)
+        else:
+            return [code]
+        if nearby:
+            radius = DEFAULT_RADIUS_KM if radius_km is None else radius_km
+            for member in list(codes):
+                codes += self.within(member, radius)
+        return list(dict.fromkeys(codes))
@@ -0,0 +1,125 @@
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.errors import InvalidParameter
+
+def _day(value) -> Optional[int]:
+    try:
+        return date.fromisoformat(str(value)[:10]).toordinal()
+    except ValueError:
+        return None
+
+def _units(room: dict) -> int:
+    """Rooms of this type on offer: an explicit count when the data has one, else 1 if available."""
+    for key in ("available_count", "quantity", "inventory"):
+        if isinstance(room.get(key), int):
+            return max(0, room[key])
+    return 1 if room.get("available") else 0
+
+class AvailabilityIndex:
+    """
+    Nightly room inventory per stay and room type.
+
+    Availability records ("room X is/isn't available from check_in to
+    check_out") are compiled into one int16 matrix with a row per night, from
+    the earliest to the latest date seen, and a column per (stay, room type);
+    where records overlap, the one starting later wins for the nights it
+    covers. Night-major rows keep a date range contiguous in memory, and each
+    stay owns a contiguous block of columns, so "can every night of
+    [check_in, check_out) be booked" is a row-slice min, a compare and a
+    reduceat over stays, for any number of stays at once.
+    """
+
+    def __init__(self, records: List[dict], stay_ids: List[str]):
+        self.records: Dict[str, List[dict]] = {}
+        rooms: Dict[Tuple[str, str], dict] = {}
+        spans = []
+        for record in records:
+            stay_id = str(record.get("stay_id"))
+            self.records.setdefault(stay_id, []).append(record)
+            start, end = _day(record.get("check_in")), _day(record.get("check_out"))
+            if start is None or end is None or end <= start:
+                continue
+            spans.append((start, end, stay_id, record))
+            for room in record.get("rooms", []):
+                rooms.setdefault((stay_id, str(room.get("room_id"))), room)
+
+        self.first_day = min((s for s, _, _, _ in spans), default=0)
+        last_day = max((e for _, e, _, _ in spans), default=0)
+        self.nights = max(0, last_day - self.first_day)
+
+        # Room rows grouped by catalog row, so every stay's room types are contiguous
+        per_stay: Dict[str, List[str]] = {}
+        for stay_id, room_id in rooms:
+            per_stay.setdefault(stay_id, []).append(room_id)
+        self.stay_rows = {str(stay_id): row for row, stay_id in enumerate(stay_ids)}
+        self.room_rows: Dict[Tuple[str, str], int] = {}
+        self.room_ids: List[Tuple[str, str]] = []
+        self.start = np.zeros(len(stay_ids), dtype=np.int64)
+        self.end = np.zeros(len(stay_ids), dtype=np.int64)
+        for row, stay_id in enumerate(stay_ids):
+            self.start[row] = len(self.room_ids)
+            for room_id in per_stay.get(str(stay_id), []):
+                self.room_rows[(str(stay_id), room_id)] = len(self.room_ids)
+                self.room_ids.append((str(stay_id), room_id))
+            self.end[row] = len(self.room_ids)
+
+        self.inventory = np.zeros((self.nights, len(self.room_ids)), dtype=np.int16)
+        spans.sort(key=lambda s: s[0])
+        for start, end, stay_id, record in spans:
+            a, b = start - self.first_day, end - self.first_day
+            for room in record.get("rooms", []):
+                row = self.room_rows.get((stay_id, str(room.get("room_id"))))
+                if row is not None:
+                    self.inventory[a:b, row] = min(_units(room), np.iinfo(np.int16).max)
+
+    def _columns(self, check_in: str, check_out: str) -> Optional[Tuple[int, int]]:
+        start, end = _day(check_in), _day(check_out)
+        if start is None or end is None:
+            raise InvalidParameter("check_in and check_out must be YYYY-MM-DD")
+        if end <= start:
+            raise InvalidParameter("check_out must be after check_in")
+        a, b = start - self.first_day, end - self.first_day
+        if a < 0 or b > self.nights:
+            return None  # Nights outside the published horizon cannot be booked
+        return a, b
+
+    def available(self, rows: np.ndarray, check_in: str, check_out: str, rooms: int = 1) -> np.ndarray:
+        """Boolean mask over catalog `rows`: stays with a room type free for `rooms` rooms every night."""
+        columns = self._columns(check_in, check_out)
+        if columns is None or len(rows) == 0:
+            return np.zeros(len(rows), dtype=bool)
+        a, b = columns
+        starts, ends = self.start[rows], self.end[rows]
+        has_rooms = ends > starts
+        if not has_rooms.any():
+            return has_rooms
+
+        # Gather the room columns of the requested stays into one block
+        counts = (ends - starts)[has_rooms]
+        offsets = np.repeat(starts[has_rooms] - np.cumsum(counts) + counts, counts)
+        room_rows = offsets + np.arange(counts.sum())
+        if len(room_rows) * 4 > len(self.room_ids):
+            # Most of the catalog: reduce the contiguous night rows, then pick columns
+            fits = (self.inventory[a:b].min(axis=0) >= rooms)[room_rows]
+        else:
+            fits = self.inventory[a:b, room_rows].min(axis=0) >= rooms
+        bounds = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+        mask = np.zeros(len(rows), dtype=bool)
+        mask[has_rooms] = np.logical_or.reduceat(fits, bounds)
+        return mask
+
+    def rooms(self, stay_id: str, check_in: str, check_out: str) -> List[dict]:
+        """Per room type: fewest rooms free on any night of the stay."""
+        columns = self._columns(check_in, check_out)
+        row = self.stay_rows.get(str(stay_id))
+        if row is None:
+            return []
+        out = []
+        for room_row in range(self.start[row], self.end[row]):
+            free = 0 if columns is None else int(self.inventory[columns[0]:columns[1], room_row].min())
+            out.append({"room_id": self.room_ids[room_row][1], "available": free > 0, "available_count": free})
+        return out
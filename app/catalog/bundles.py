@@ -0,0 +1,54 @@
+import heapq
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+def cheapest_combinations(costs: Sequence[np.ndarray],
+                          budget: Optional[float] = None) -> Iterator[Tuple[float, Tuple[int, ...]]]:
+    """
+    Yield (total, index per component) for picking one entry from each cost
+    list, cheapest total first, without building the cross product.
+
+    Each list is sorted once; a combination is then a tuple of ranks. The
+    search starts from all-zeros and a heap holds the frontier. Every tuple
+    has exactly one parent (its last non-zero rank decremented), so children
+    only bump ranks at or after their last non-zero one and no combination
+    is queued twice. A child never costs less than its parent, so pops come
+    out in ascending total order (ties by rank tuple), and the first total
+    over `budget` ends the search. With a budget, each list is also cut to
+    the entries that could fit next to the cheapest of every other list.
+
+    Indexes refer to positions in the given arrays; the generator is lazy,
+    so a caller wanting the top k just stops after k items.
+    """
+    if not costs or any(len(c) == 0 for c in costs):
+        return
+    orders = [np.argsort(c, kind="stable") for c in costs]
+    sorted_costs = [np.asarray(c, dtype=np.float64)[o] for c, o in zip(costs, orders)]
+
+    if budget is not None:
+        floor = sum(float(c[0]) for c in sorted_costs)
+        if floor > budget:
+            return
+        for d, c in enumerate(sorted_costs):
+            # Entries whose cost alone already breaks the budget next to the others' minimum
+            end = int(np.searchsorted(c, budget - (floor - float(c[0])), side="right"))
+            sorted_costs[d], orders[d] = c[:end], orders[d][:end]
+
+    values: List[List[float]] = [c.tolist() for c in sorted_costs]
+    lengths = [len(v) for v in values]
+    dims = len(values)
+    start = (0,) * dims
+    heap = [(sum(v[0] for v in values), start)]
+    while heap:
+        total, ranks = heapq.heappop(heap)
+        if budget is not None and total > budget:
+            return
+        yield total, tuple(int(orders[d][r]) for d, r in enumerate(ranks))
+
+        last = max((d for d in range(dims) if ranks[d]), default=0)
+        for d in range(last, dims):
+            r = ranks[d] + 1
+            if r < lengths[d]:
+                child = ranks[:d] + (r,) + ranks[d + 1:]
+                heapq.heappush(heap, (sum(v[i] for v, i in zip(values, child)), child))
@@ -0,0 +1,149 @@
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.currency import BASE_CURRENCY, to_usd
+from app.core.errors import InvalidParameter
+
+if TYPE_CHECKING:
+    from app.catalog.flights import FlightIndex
+
+# Longest date window (in days) a single calendar request may span, per axis
+MAX_WINDOW_DAYS = 62
+
+# (USD price, file position, itinerary id) of the cheapest itinerary in a cell
+Cell = Tuple[float, int, str]
+
+def parse_date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise InvalidParameter(f"Invalid date '{value}', expected YYYY-MM-DD")
+
+def _dates(start: str, end: str) -> List[str]:
+    first, last = parse_date(start), parse_date(end)
+    if last < first:
+        raise InvalidParameter("Date window ends before it starts")
+    days = (last - first).days + 1
+    if days > MAX_WINDOW_DAYS:
+        raise InvalidParameter(f"Date window is limited to {MAX_WINDOW_DAYS} days")
+    return [(first + timedelta(days=i)).isoformat() for i in range(days)]
+
+def _min_cells(index: "FlightIndex", prices: np.ndarray, rows: np.ndarray, with_return: bool) -> Dict:
+    """Cheapest row by USD `prices` per departure date (or departure/return pair) among `rows`."""
+    rows = rows[~np.isnan(prices[rows])]
+    if len(rows) == 0:
+        return {}
+    departs = index.depart_date[rows]
+    returns = index.return_date[rows] if with_return else np.full(len(rows), "", dtype="U10")
+    # Cheapest first inside each (depart, return) group, earliest file position on ties
+    order = np.lexsort((index.position[rows], prices[rows], returns, departs))
+    departs, returns, rows = departs[order], returns[order], rows[order]
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = (departs[1:] != departs[:-1]) | (returns[1:] != returns[:-1])
+
+    cells = {}
+    for d, r, row in zip(departs[first], returns[first], rows[first]):
+        cell = (round(float(prices[row]), 2), int(index.position[row]), index.itineraries[row].get("id"))
+        cells[(str(d), str(r)) if with_return else str(d)] = cell
+    return cells
+
+class FareCalendar:
+    """
+    Lowest fare per route and day, precomputed from the flight indexes.
+
+    One-way routes map departure date -> cheapest itinerary; round-trip routes
+    map (departure date, return date) -> cheapest itinerary. Both are built in
+    one pass when the catalog loads, so a calendar request is a handful of
+    dict lookups instead of one full search per date. A catalog reload
+    builds a new calendar along with the new indexes. Itineraries are quoted
+    in their own currencies, so fares are converted to USD before the
+    minimum is taken; ones in a currency without a rate are left out.
+    """
+
+    def __init__(self, one_way: "FlightIndex", round_trip: "FlightIndex"):
+        self.indexes = {"one_way": one_way, "round_trip": round_trip}
+        self.prices = {
+            trip_type: to_usd(index.price, (it.get("price", {}).get("currency") for it in index.itineraries))
+            for trip_type, index in self.indexes.items()
+        }
+        self._cells: Dict[str, Dict[Tuple[str, str], Dict]] = {"one_way": {}, "round_trip": {}}
+        for trip_type, index in self.indexes.items():
+            for origin, destination in index.routes():
+                self._build_route(trip_type, origin, destination)
+
+    def _build_route(self, trip_type: str, origin: str, destination: str) -> None:
+        index = self.indexes[trip_type]
+        route = (origin.upper(), destination.upper())
+        cells = _min_cells(index, self.prices[trip_type], index.rows(*route), trip_type == "round_trip")
+        if cells:
+            self._cells[trip_type][route] = cells
+        else:
+            self._cells[trip_type].pop(route, None)
+
+    def _route_cells(self, trip_type: str, origin: str, destination: str, seat_class: Optional[str],
+                     stops: Optional[int], airline: Optional[str]) -> Dict:
+        if not (seat_class or stops is not None or airline):
+            return self._cells[trip_type].get((origin, destination), {})
+        # Filtered calendars are not precomputed; one vectorized pass over the route slice
+        index = self.indexes[trip_type]
+        rows = index.filter(index.rows(origin, destination), seat_class, stops, airline)
+        return _min_cells(index, self.prices[trip_type], rows, trip_type == "round_trip")
+
+    @staticmethod
+    def _entry(cell: Optional[Cell]) -> dict:
+        if cell is None:
+            return {"min_price": None, "currency": None, "flight_id": None}
+        return {"min_price": cell[0], "currency": BASE_CURRENCY, "flight_id": cell[2]}
+
+    def one_way(self, origin: str, destination: str, start: str, end: str,
+                seat_class: Optional[str] = None, stops: Optional[int] = None,
+                airline: Optional[str] = None) -> dict:
+        origin, destination = origin.upper(), destination.upper()
+        cells = self._route_cells("one_way", origin, destination, seat_class, stops, airline)
+        days = [{"date": d, **self._entry(cells.get(d))} for d in _dates(start, end)]
+        priced = [d for d in days if d["min_price"] is not None]
+        return {
+            "trip_type": "one_way",
+            "origin": origin,
+            "destination": destination,
+            "currency": BASE_CURRENCY,
+            "days": days,
+            "cheapest": min(priced, key=lambda d: d["min_price"]) if priced else None,
+        }
+
+    def round_trip(self, origin: str, destination: str, depart_start: str, depart_end: str,
+                   return_start: str, return_end: str, seat_class: Optional[str] = None,
+                   stops: Optional[int] = None, airline: Optional[str] = None) -> dict:
+        origin, destination = origin.upper(), destination.upper()
+        cells = self._route_cells("round_trip", origin, destination, seat_class, stops, airline)
+        depart_dates = _dates(depart_start, depart_end)
+        return_dates = _dates(return_start, return_end)
+
+        prices: List[List[Optional[float]]] = []
+        cheapest = None
+        for d in depart_dates:
+            row = []
+            for r in return_dates:
+                cell = cells.get((d, r))
+                row.append(None if cell is None else cell[0])
+                if cell is not None and (cheapest is None or cell[:2] < cheapest[1][:2]):
+                    cheapest = ((d, r), cell)
+            prices.append(row)
+
+        best = None
+        if cheapest is not None:
+            (d, r), cell = cheapest
+            best = {"depart": d, "return": r, **self._entry(cell)}
+        return {
+            "trip_type": "round_trip",
+            "origin": origin,
+            "destination": destination,
+            "depart_dates": depart_dates,
+            "return_dates": return_dates,
+            "currency": BASE_CURRENCY,
+            # prices[i][j]: lowest USD fare departing depart_dates[i] and returning return_dates[j]
+            "prices": prices,
+            "cheapest": best,
+        }
@@ -0,0 +1,206 @@
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.catalog.rentals import RentalAvailability
+from app.core.facets import disjunctive_counts, price_histogram, value_counts
+
+# Facets car search can count
+CAR_FACETS = ("car_type", "company", "transmission", "fuel_policy", "price")
+
+def _normalize(text: str) -> str:
+    """Case- and accent-insensitive form used for location matching."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+def _flag(value) -> int:
+    """1 / 0 for real booleans, -1 for anything else (filters compare with `is`)."""
+    if value is True:
+        return 1
+    if value is False:
+        return 0
+    return -1
+
+class _Codes:
+    """Case-insensitive string column; labels keep the first spelling seen."""
+
+    def __init__(self, values: List[str]):
+        self.codes: Dict[str, int] = {}
+        self.labels: List[str] = []
+        column = np.empty(len(values), dtype=np.int32)
+        for row, value in enumerate(values):
+            key = value.lower()
+            code = self.codes.get(key)
+            if code is None:
+                code = self.codes[key] = len(self.labels)
+                self.labels.append(value)
+            column[row] = code
+        self.column = column
+
+    def isin(self, rows: np.ndarray, values: List[str]) -> np.ndarray:
+        wanted = [self.codes[v.lower()] for v in values if v.lower() in self.codes]
+        return np.isin(self.column[rows], wanted)
+
+class LocationIndex:
+    """
+    Rentals by pickup (or dropoff) location.
+
+    Offers are grouped by their distinct (city, airport code) place, joined
+    to meta-ui/car_locations.json so a place also answers to its location id.
+    A query matches a place when it equals the airport code or location id,
+    or is a substring of the city name; there are few places and their names
+    are short, so every substring of every normalized city name is kept in a
+    map and a query is a couple of dict lookups returning the sorted rows of
+    the places it names.
+    """
+
+    def __init__(self, places: List[Optional[dict]], known: Optional[List[dict]] = None):
+        ids = {}
+        for entry in known or []:
+            key = (_normalize(entry.get("city") or ""), _normalize(entry.get("airport_code") or ""))
+            ids.setdefault(key, entry.get("id"))
+
+        rows: Dict[Tuple[str, str], List[int]] = {}
+        for row, place in enumerate(places):
+            place = place or {}
+            key = (_normalize(place.get("city") or ""), _normalize(place.get("airport_code") or ""))
+            rows.setdefault(key, []).append(row)
+
+        self.places = list(rows)
+        self.rows = [np.array(r, dtype=np.int64) for r in rows.values()]
+        self.names: Dict[str, List[int]] = {}
+        for place, (city, airport) in enumerate(self.places):
+            keys = {city[i:j] for i in range(len(city)) for j in range(i + 1, len(city) + 1)}
+            if airport:
+                keys.add(airport)
+            if ids.get((city, airport)):
+                keys.add(_normalize(ids[(city, airport)]))
+            for key in keys:
+                self.names.setdefault(key, []).append(place)
+
+    def lookup(self, query: str) -> np.ndarray:
+        """Sorted rows whose location matches `query`."""
+        places = self.names.get(_normalize(query), [])
+        if len(places) == 1:
+            return self.rows[places[0]]
+        if not places:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate([self.rows[p] for p in places]))
+
+class CarCatalog:
+    """
+    Rental offers with their filter fields as NumPy columns.
+
+    String fields are dictionary-encoded case-insensitively, so every
+    attribute filter is a compare over an int array and facet counts are a
+    bincount over the same codes.
+    """
+
+    def __init__(self, cars: List[dict], locations: Optional[List[dict]] = None):
+        self.cars = cars
+        n = len(cars)
+        self.pickup = LocationIndex([c.get("pickup") for c in cars], locations)
+        self.dropoff = LocationIndex([c.get("dropoff") for c in cars], locations)
+        self.ids = [str(c.get("id")) for c in cars]
+        self.rows_by_id = {rental_id: row for row, rental_id in enumerate(self.ids)}
+        self.car_type = _Codes([c.get("car_type") or "" for c in cars])
+        self.company = _Codes([c.get("company") or "" for c in cars])
+        self.transmission = _Codes([c.get("transmission") or "" for c in cars])
+        self.fuel_policy = _Codes([c.get("fuel_policy") or "" for c in cars])
+        self.price = np.fromiter((c.get("price", {}).get("total", 0) for c in cars), dtype=np.float64, count=n)
+        self.seats = np.fromiter((c.get("capacity", {}).get("seats", 0) for c in cars), dtype=np.int32, count=n)
+        self.free_cancellation = np.fromiter(
+            (_flag(c.get("free_cancellation")) for c in cars), dtype=np.int8, count=n)
+        self.airport_hotel_transfer = np.fromiter(
+            (_flag(c.get("airport_hotel_transfer")) for c in cars), dtype=np.int8, count=n)
+
+    @classmethod
+    def from_documents(cls, cars, locations=None) -> "CarCatalog":
+        """From cars_search.json and (if present) meta-ui/car_locations.json."""
+        return cls(cars, locations or [])
+
+    def __len__(self) -> int:
+        return len(self.cars)
+
+    def candidates(self, pickup_location: Optional[str] = None,
+                   dropoff_location: Optional[str] = None) -> np.ndarray:
+        """Rows (in file order) matching the pickup and dropoff locations, from the location indexes."""
+        rows = self.pickup.lookup(pickup_location) if pickup_location else None
+        if dropoff_location:
+            dropoff = self.dropoff.lookup(dropoff_location)
+            rows = dropoff if rows is None else np.intersect1d(rows, dropoff, assume_unique=True)
+        return np.arange(len(self.cars)) if rows is None else rows
+
+    def _masks(self, rows: np.ndarray, car_type: Optional[List[str]] = None,
+               company: Optional[List[str]] = None, price_min: Optional[float] = None,
+               price_max: Optional[float] = None, seats_min: Optional[int] = None,
+               transmission: Optional[str] = None, fuel_policy: Optional[str] = None,
+               free_cancellation: Optional[bool] = None,
+               airport_hotel_transfer: Optional[bool] = None) -> Dict[str, np.ndarray]:
+        """One boolean mask over `rows` per requested filter, keyed by facet name."""
+        masks = {}
+        if car_type:
+            masks["car_type"] = self.car_type.isin(rows, car_type)
+        if company:
+            masks["company"] = self.company.isin(rows, company)
+        if price_min is not None or price_max is not None:
+            price = self.price[rows]
+            mask = np.ones(len(rows), dtype=bool)
+            if price_min is not None:
+                mask &= price >= price_min
+            if price_max is not None:
+                mask &= price <= price_max
+            masks["price"] = mask
+        if seats_min is not None:
+            masks["seats"] = self.seats[rows] >= seats_min
+        if transmission:
+            masks["transmission"] = self.transmission.isin(rows, [transmission])
+        if fuel_policy:
+            masks["fuel_policy"] = self.fuel_policy.isin(rows, [fuel_policy])
+        if free_cancellation is not None:
+            masks["free_cancellation"] = self.free_cancellation[rows] == int(free_cancellation)
+        if airport_hotel_transfer is not None:
+            masks["airport_hotel_transfer"] = self.airport_hotel_transfer[rows] == int(airport_hotel_transfer)
+        return masks
+
+    def filter(self, rows: np.ndarray, *args, **kwargs) -> np.ndarray:
+        """Apply the attribute filters (arguments as for `_masks`) as one combined mask over `rows`."""
+        mask = np.ones(len(rows), dtype=bool)
+        for part in self._masks(rows, *args, **kwargs).values():
+            mask &= part
+        return rows[mask]
+
+    def facets(self, rows: np.ndarray, names: List[str], *args, **kwargs) -> dict:
+        """Disjunctive facet counts (see CAR_FACETS) over candidate `rows` under the given filters."""
+        masks = self._masks(rows, *args, **kwargs)
+
+        def count(name: str, keep: np.ndarray):
+            matched = rows[keep]
+            if name == "price":
+                return price_histogram(self.price[matched])
+            codes: _Codes = getattr(self, name)
+            return value_counts(codes.column[matched], codes.labels)
+
+        return disjunctive_counts(masks, len(rows), names, count)
+
+    def available(self, rows: np.ndarray, window: Tuple[int, int], reservations: RentalAvailability) -> np.ndarray:
+        """Boolean mask over `rows`: rentals with no reservation overlapping the (start, end) minute window."""
+        if len(reservations) == 0:
+            return np.ones(len(rows), dtype=bool)
+        if len(rows) <= len(reservations):
+            return np.fromiter((reservations.is_free(self.ids[i], *window) for i in rows), dtype=bool, count=len(rows))
+        # Fewer reserved rentals than candidates: look up only those
+        blocked = [self.rows_by_id[i] for i in reservations.blocked(*window) if i in self.rows_by_id]
+        return ~np.isin(rows, blocked)
+
+    def window(self, rental_id) -> Optional[Tuple[str, str]]:
+        """The offer's own (pickup, dropoff) datetimes."""
+        row = self.rows_by_id.get(str(rental_id))
+        if row is None:
+            return None
+        car = self.cars[row]
+        return car.get("pickup", {}).get("datetime"), car.get("dropoff", {}).get("datetime")
+
+    def take(self, rows: np.ndarray) -> List[dict]:
+        return [self.cars[i] for i in rows]
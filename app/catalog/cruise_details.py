@@ -0,0 +1,121 @@
+import json
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+# Segmented layout: DETAILS_DIR/segment-GGGGGG-NNNN.jsonl (one document per line) plus INDEX_NAME.
+# Every rewrite uses a new generation G, so the segments an index points at are never overwritten.
+DETAILS_DIR = "details"
+INDEX_NAME = "index.json"
+SEGMENT_NAME = "segment-{:06d}-{:04d}.jsonl"
+
+def segment_generation(name: str) -> int:
+    """Generation of a segment file name; the unversioned segment-NNNN.jsonl layout counts as 0."""
+    parts = name[len("segment-"):-len(".jsonl")].split("-")
+    return int(parts[0]) if len(parts) == 2 else 0
+
+def _legacy_records(data) -> List[dict]:
+    """Records of the original cruise_details.json (one object, or a list of them)."""
+    if data is None:
+        return []
+    if isinstance(data, dict):
+        data = data.get("cruise_details", [])
+    return [data] if isinstance(data, dict) else list(data)
+
+def scan_segments(directory: Path) -> Tuple[List[str], Dict[str, List[int]]]:
+    """(segment names, id -> [segment, offset, length]) by reading every segment of the newest generation once."""
+    names = [p.name for p in directory.glob("segment-*.jsonl")]
+    latest = max(map(segment_generation, names), default=0)
+    segments = sorted(name for name in names if segment_generation(name) == latest)
+    records: Dict[str, List[int]] = {}
+    for number, name in enumerate(segments):
+        offset = 0
+        with open(directory / name, "rb") as f:
+            for line in f:
+                if line.strip():
+                    # First occurrence wins, as in the other detail stores
+                    records.setdefault(str(json.loads(line)["id"]), [number, offset, len(line)])
+                offset += len(line)
+    return segments, records
+
+class CruiseDetailStore:
+    """
+    Cruise detail documents keyed by cruise id, read on demand.
+
+    Documents live in JSON Lines segment files; only the id -> (segment,
+    byte offset, length) index is kept in memory, taken from the parsed
+    index.json or rebuilt by one pass over the segments when there is none.
+    Segments are the one dataset read after load: a lookup reads and parses
+    one line, and the most recently used documents stay in a small LRU so
+    popular cruises cost no I/O. Ids only found in the original
+    single-document cruise_details.json are served from it.
+
+    A line whose decoded id is not the one looked up (or that can no longer
+    be read) means the segments changed under this index: the lookup is a
+    miss and `on_stale` is called once, to load the new index.
+    """
+
+    def __init__(self, directory: Path, index: Optional[dict] = None, legacy=None,
+                 cache_size: Optional[int] = None, on_stale: Optional[Callable[[], Any]] = None):
+        self.directory = directory
+        self.on_stale = on_stale
+        self._stale = False
+        self.cache_size = settings.CRUISE_DETAILS_CACHE_SIZE if cache_size is None else cache_size
+        self.segments: List[str] = []
+        self.records: Dict[str, List[int]] = {}
+        if index is not None:
+            self.segments, self.records = index["segments"], index["records"]
+        elif self.directory.is_dir():
+            self.segments, self.records = scan_segments(self.directory)
+        self._fallback = {}
+        for record in _legacy_records(legacy):
+            if "id" in record:
+                self._fallback.setdefault(str(record["id"]), record)
+        self._cache: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.records) + sum(1 for i in self._fallback if i not in self.records)
+
+    def __contains__(self, cruise_id) -> bool:
+        cruise_id = str(cruise_id)
+        return cruise_id in self.records or cruise_id in self._fallback
+
+    def _read(self, cruise_id: str, location: List[int]) -> Optional[dict]:
+        segment, offset, length = location
+        try:
+            with open(self.directory / self.segments[segment], "rb") as f:
+                f.seek(offset)
+                record = json.loads(f.read(length))
+        except (OSError, ValueError):
+            record = None
+        if not isinstance(record, dict) or str(record.get("id")) != cruise_id:
+            if not self._stale:
+                self._stale = True
+                print(f"⚠️ Cruise detail segments changed under the loaded index (id {cruise_id}); reloading")
+                if self.on_stale is not None:
+                    self.on_stale()
+            return None
+        return record
+
+    def get(self, cruise_id) -> Optional[dict]:
+        cruise_id = str(cruise_id)
+        with self._lock:
+            record = self._cache.get(cruise_id)
+            if record is not None:
+                self._cache.move_to_end(cruise_id)
+                return record
+
+        location = self.records.get(cruise_id)
+        if location is None:
+            return self._fallback.get(cruise_id)
+        record = self._read(cruise_id, location)
+        if record is not None and self.cache_size > 0:
+            with self._lock:
+                self._cache[cruise_id] = record
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return record
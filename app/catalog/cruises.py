@@ -0,0 +1,148 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.pagination import decode_cursor, encode_cursor
+
+def _postings(values: List[str]) -> Dict[str, np.ndarray]:
+    """Lowercased value -> sorted rows holding it."""
+    rows: Dict[str, List[int]] = {}
+    for row, value in enumerate(values):
+        rows.setdefault(value.lower(), []).append(row)
+    return {value: np.array(r, dtype=np.int64) for value, r in rows.items()}
+
+def _codes(postings: Dict[str, np.ndarray], n: int) -> np.ndarray:
+    """Per-row position of the row's value among `postings`, to check candidate rows against a value set."""
+    codes = np.empty(n, dtype=np.int32)
+    for code, rows in enumerate(postings.values()):
+        codes[rows] = code
+    return codes
+
+class CruiseCatalog:
+    """
+    Sailings with the indexes cruise search runs on.
+
+    Departure dates and night counts are kept as sorted arrays next to the
+    rows they belong to, so a date window or a nights range is a bisect pair
+    and a slice. Cruise lines and departure ports have postings per distinct
+    (lowercased) value; a port query is a substring match, answered by
+    checking the few distinct port names rather than every sailing.
+
+    A query sizes each indexed filter's candidate set from its bisects or
+    postings lengths, materializes only the smallest and checks the other
+    filters on those rows through per-row columns (departure date, nights,
+    line and port codes), then price and destination; no array as long as
+    the catalog is built per query.
+    """
+
+    def __init__(self, cruises: List[dict]):
+        self.cruises = cruises
+        n = len(cruises)
+
+        by_date = sorted(range(n), key=lambda i: (cruises[i].get("departure_date", ""), i))
+        self.dates = [cruises[i].get("departure_date", "") for i in by_date]
+        self.date_rows = np.array(by_date, dtype=np.int64)
+
+        by_nights = sorted(range(n), key=lambda i: (cruises[i].get("nights") or 0, i))
+        self.nights = [cruises[i].get("nights") or 0 for i in by_nights]
+        self.nights_rows = np.array(by_nights, dtype=np.int64)
+
+        self.lines = _postings([c.get("cruise_line") or "" for c in cruises])
+        self.ports = _postings([c.get("departure_port") or "" for c in cruises])
+        self.line_codes = _codes(self.lines, n)
+        self.port_codes = _codes(self.ports, n)
+        self.departure = np.array([c.get("departure_date", "") for c in cruises], dtype=str)
+        self.night_counts = np.fromiter((c.get("nights") or 0 for c in cruises), dtype=np.int64, count=n)
+        self.price = np.fromiter((c.get("price", np.nan) for c in cruises), dtype=np.float64, count=n)
+        self.destination = [(c.get("destination") or "").lower() for c in cruises]
+
+    @classmethod
+    def from_document(cls, search) -> "CruiseCatalog":
+        return cls(search["cruises"])
+
+    def __len__(self) -> int:
+        return len(self.cruises)
+
+    @staticmethod
+    def _span(keys: list, low, high) -> Tuple[int, int]:
+        start = 0 if low is None else bisect_left(keys, low)
+        end = len(keys) if high is None else bisect_right(keys, high)
+        return start, max(start, end)
+
+    @staticmethod
+    def _within(values: np.ndarray, low, high) -> np.ndarray:
+        keep = np.ones(len(values), dtype=bool)
+        if low is not None:
+            keep &= values >= low
+        if high is not None:
+            keep &= values <= high
+        return keep
+
+    def select(self, date_from: Optional[str] = None, date_to: Optional[str] = None,
+               cruise_line: Optional[str] = None, nights: Optional[int] = None,
+               nights_min: Optional[int] = None, nights_max: Optional[int] = None,
+               destination: Optional[str] = None, departure_port: Optional[str] = None,
+               price_min: Optional[float] = None, price_max: Optional[float] = None) -> np.ndarray:
+        """Matching rows in file order. Dates compare as YYYY-MM-DD strings, both bounds inclusive."""
+        # (candidate count, candidate rows, check of the same filter on other rows) per indexed filter
+        filters = []
+        if date_from or date_to:
+            low, high = date_from or None, date_to or None
+            start, end = self._span(self.dates, low, high)
+            filters.append((end - start, lambda: self.date_rows[start:end],
+                            lambda rows: self._within(self.departure[rows], low, high)))
+        if nights or nights_min is not None or nights_max is not None:
+            # An exact night count and a range combine into one range
+            least = max((b for b in (nights or None, nights_min) if b is not None), default=None)
+            most = min((b for b in (nights or None, nights_max) if b is not None), default=None)
+            first, last = self._span(self.nights, least, most)
+            filters.append((last - first, lambda: self.nights_rows[first:last],
+                            lambda rows: self._within(self.night_counts[rows], least, most)))
+        if cruise_line:
+            line = cruise_line.lower()
+            if line not in self.lines:
+                return np.empty(0, dtype=np.int64)
+            code = list(self.lines).index(line)
+            filters.append((len(self.lines[line]), lambda: self.lines[line],
+                            lambda rows: self.line_codes[rows] == code))
+        if departure_port:
+            query = departure_port.lower()
+            codes = [code for code, port in enumerate(self.ports) if query in port]
+            postings = list(self.ports.values())
+            filters.append((sum(len(postings[c]) for c in codes),
+                            lambda: np.concatenate([np.empty(0, dtype=np.int64)] + [postings[c] for c in codes]),
+                            lambda rows: np.isin(self.port_codes[rows], codes)))
+
+        if not filters:
+            rows = np.arange(len(self.cruises))
+        else:
+            filters.sort(key=lambda f: f[0])
+            rows = np.sort(filters[0][1]())
+            for _, _, check in filters[1:]:
+                if len(rows) == 0:
+                    break
+                rows = rows[check(rows)]
+
+        if price_min is not None:
+            rows = rows[self.price[rows] >= price_min]
+        if price_max is not None:
+            rows = rows[self.price[rows] <= price_max]
+        if destination:
+            destination = destination.lower()
+            rows = rows[[destination in self.destination[i] for i in rows]] if len(rows) else rows
+        return rows
+
+    def page(self, rows: np.ndarray, limit: Optional[int],
+             cursor: Optional[str]) -> Tuple[np.ndarray, Optional[str]]:
+        """Slice file-ordered rows after the cursor position; the cursor holds the last row handed out."""
+        if cursor:
+            rows = rows[np.searchsorted(rows, decode_cursor(cursor)["p"], side="right"):]
+        if limit is None or len(rows) <= limit:
+            return rows, None
+        page = rows[:limit]
+        next_cursor = encode_cursor({"s": None, "k": 0, "p": int(page[-1])}) if limit > 0 else None
+        return page, next_cursor
+
+    def take(self, rows: np.ndarray) -> List[dict]:
+        return [self.cruises[i] for i in rows]
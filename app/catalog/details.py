@@ -0,0 +1,31 @@
+from typing import Dict
+
+# vertical -> (details file under app/data, key holding the record list or None for a bare list)
+DETAIL_SOURCES = {
+    "flights": ("flights/flight_details.json", "flights"),
+    "cars": ("cars/car_details.json", None),
+    "stays": ("stays/stays_details.json", "stays"),
+    "packages": ("packages/package_details.json", None),
+    "activities": ("activities/activity_details.json", None),
+    "things_to_do": ("things_to_do/thing_details.json", "activities"),
+}
+
+def detail_index(vertical: str, data) -> Dict[str, dict]:
+    """
+    id -> detail record map of one vertical's details file.
+
+    Built once per load; lookups after that are a dict access with no file
+    I/O. Ids are compared as strings so int and str ids in the JSON (and in
+    path parameters) resolve the same way.
+    """
+    key = DETAIL_SOURCES[vertical][1]
+    if key is not None:
+        if not isinstance(data, dict) or key not in data:
+            raise ValueError(f"Invalid {vertical} details format")
+        data = data[key]
+
+    index: Dict[str, dict] = {}
+    for record in data:
+        # First occurrence wins, as with the old linear scans
+        index.setdefault(str(record["id"]), record)
+    return index
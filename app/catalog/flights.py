@@ -0,0 +1,308 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.catalog.calendar import FareCalendar
+from app.catalog.routing import ConnectionGraph
+from app.core.facets import bit_counts, disjunctive_counts, price_histogram, value_counts
+from app.core.pagination import decode_cursor, encode_cursor
+
+# Canonical seat classes get the low bits; anything else found in the data is appended
+SEAT_CLASSES = ["economy", "premium_economy", "business", "first"]
+
+# Facets flight search can count
+FLIGHT_FACETS = ("airline", "stops", "seat_class", "price")
+
+# Shared pool for the per-airport-pair lookups of metro/nearby searches
+_lookup_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="flight-lookup")
+
+def _route_key(itinerary) -> Tuple[str, str, str]:
+    segments = itinerary["legs"][0]["segments"]
+    return (
+        segments[0]["from"]["code"],
+        segments[-1]["to"]["code"],
+        segments[0]["depart_utc"][:10],
+    )
+
+def _epoch(timestamp: str) -> int:
+    try:
+        return int(datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp())
+    except (AttributeError, ValueError):
+        return 0
+
+def _arrive_utc(itinerary) -> str:
+    return itinerary["legs"][0]["segments"][-1].get("arrive_utc", "")
+
+def _return_date(itinerary) -> str:
+    try:
+        return itinerary["legs"][1]["segments"][0]["depart_utc"][:10]
+    except (KeyError, IndexError):
+        return ""
+
+class FlightIndex:
+    """
+    Columnar view over the itineraries of one trip type.
+
+    Rows are ordered by (origin, destination, departure date) so every route and
+    every route/date bucket is a contiguous slice. Filter fields live in NumPy
+    arrays; a search builds one boolean mask over the bucket, sorts with argsort
+    and only then goes back to the itinerary dicts for the rows it returns.
+    """
+
+    def __init__(self, itineraries: List[dict]):
+        keyed = []
+        for position, itinerary in enumerate(itineraries):
+            try:
+                keyed.append((_route_key(itinerary), position, itinerary))
+            except (KeyError, IndexError, TypeError):
+                continue
+        keyed.sort(key=lambda k: (k[0], k[1]))
+
+        self.itineraries: List[dict] = [it for _, _, it in keyed]
+        self._buckets: Dict[Tuple[str, str, str], Tuple[int, int]] = {}
+        self._routes: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        for row, (key, _, _) in enumerate(keyed):
+            start, _ = self._buckets.get(key, (row, row))
+            self._buckets[key] = (start, row + 1)
+            start, _ = self._routes.get(key[:2], (row, row))
+            self._routes[key[:2]] = (start, row + 1)
+
+        self.airline_codes: Dict[str, int] = {}
+        self.seat_bits: Dict[str, int] = {name: 1 << i for i, name in enumerate(SEAT_CLASSES)}
+
+        n = len(keyed)
+        self.position = np.fromiter((p for _, p, _ in keyed), dtype=np.int64, count=n)
+        self.price = np.fromiter(
+            (it.get("price", {}).get("total", 0) for it in self.itineraries), dtype=np.float64, count=n)
+        self.stops = np.fromiter(
+            (-1 if it.get("stops") is None else it["stops"] for it in self.itineraries), dtype=np.int16, count=n)
+        self.duration = np.fromiter(
+            (it.get("duration_total_minutes", 0) for it in self.itineraries), dtype=np.float64, count=n)
+        self.depart_epoch = np.fromiter(
+            (_epoch(it["legs"][0]["segments"][0]["depart_utc"]) for it in self.itineraries), dtype=np.int64, count=n)
+        self.arrive_epoch = np.fromiter(
+            (_epoch(_arrive_utc(it)) for it in self.itineraries), dtype=np.int64, count=n)
+        self.depart_date = np.array([k[2] for k, _, _ in keyed], dtype="U10")
+        self.return_date = np.array([_return_date(it) for it in self.itineraries], dtype="U10")
+        self.airline = np.fromiter(
+            (self._airline_code(it) for it in self.itineraries), dtype=np.int32, count=n)
+        self.seats = np.fromiter(
+            (self._seat_mask(it) for it in self.itineraries), dtype=np.uint32, count=n)
+
+    def _airline_code(self, itinerary) -> int:
+        code = itinerary.get("airline", {}).get("code")
+        if code is None:
+            return -1
+        return self.airline_codes.setdefault(code, len(self.airline_codes))
+
+    def _seat_mask(self, itinerary) -> int:
+        mask = 0
+        for name in itinerary.get("seat_classes", []):
+            if name not in self.seat_bits and len(self.seat_bits) < 32:
+                self.seat_bits[name] = 1 << len(self.seat_bits)
+            mask |= self.seat_bits.get(name, 0)
+        return mask
+
+    def __len__(self) -> int:
+        return len(self.itineraries)
+
+    def routes(self) -> List[Tuple[str, str]]:
+        return list(self._routes)
+
+    def rows(self, origin: str, destination: str, depart: Optional[str] = None) -> np.ndarray:
+        """Row numbers for a route, optionally restricted to a departure date (or date prefix)."""
+        origin, destination = origin.upper(), destination.upper()
+        if depart and len(depart) == 10:
+            start, end = self._buckets.get((origin, destination, depart), (0, 0))
+            return np.arange(start, end)
+        start, end = self._routes.get((origin, destination), (0, 0))
+        rows = np.arange(start, end)
+        if depart:
+            rows = rows[np.char.startswith(self.depart_date[rows], depart)]
+        return rows
+
+    def _masks(self, rows: np.ndarray, seat_class: Optional[str] = None, stops: Optional[int] = None,
+               airline: Optional[str] = None, price_min: Optional[float] = None,
+               price_max: Optional[float] = None, returnd: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """One boolean mask over `rows` per requested filter, keyed by facet name."""
+        masks = {}
+
+        if seat_class:
+            bit = self.seat_bits.get(seat_class)
+            if bit is None:
+                masks["seat_class"] = np.zeros(len(rows), dtype=bool)
+            else:
+                masks["seat_class"] = (self.seats[rows] & bit) != 0
+
+        if stops is not None:
+            if stops in (0, 1):
+                masks["stops"] = self.stops[rows] == stops
+            else:
+                masks["stops"] = self.stops[rows] >= 2
+
+        if airline:
+            code = self.airline_codes.get(airline.upper())
+            if code is None:
+                masks["airline"] = np.zeros(len(rows), dtype=bool)
+            else:
+                masks["airline"] = self.airline[rows] == code
+
+        if price_min is not None or price_max is not None:
+            price = self.price[rows]
+            mask = np.ones(len(rows), dtype=bool)
+            if price_min is not None:
+                mask &= price >= price_min
+            if price_max is not None:
+                mask &= price <= price_max
+            masks["price"] = mask
+
+        if returnd:
+            if len(returnd) == 10:
+                masks["return"] = self.return_date[rows] == returnd
+            else:
+                masks["return"] = np.char.startswith(self.return_date[rows], returnd)
+
+        return masks
+
+    def filter(self, rows: np.ndarray, seat_class: Optional[str] = None, stops: Optional[int] = None,
+               airline: Optional[str] = None, price_min: Optional[float] = None,
+               price_max: Optional[float] = None, returnd: Optional[str] = None) -> np.ndarray:
+        """Apply every requested filter as one combined boolean mask over `rows`."""
+        mask = np.ones(len(rows), dtype=bool)
+        for part in self._masks(rows, seat_class, stops, airline, price_min, price_max, returnd).values():
+            mask &= part
+        return rows[mask]
+
+    def facets(self, origin: Union[str, Sequence[str]], destination: Union[str, Sequence[str]],
+               names: List[str], depart: Optional[str] = None, returnd: Optional[str] = None,
+               seat_class: Optional[str] = None, stops: Optional[int] = None,
+               airline: Optional[str] = None, price_min: Optional[float] = None,
+               price_max: Optional[float] = None) -> dict:
+        """Disjunctive facet counts (see FLIGHT_FACETS) over a route search, arguments as for `select`."""
+        origins = [origin] if isinstance(origin, str) else list(origin)
+        destinations = [destination] if isinstance(destination, str) else list(destination)
+        rows = np.concatenate([np.arange(0)] + [self.rows(o, d, depart) for o in origins for d in destinations])
+        masks = self._masks(rows, seat_class, stops, airline, price_min, price_max, returnd)
+
+        def count(name: str, keep: np.ndarray):
+            matched = rows[keep]
+            if name == "airline":
+                return value_counts(self.airline[matched], list(self.airline_codes))
+            if name == "stops":
+                stops = self.stops[matched]
+                return value_counts(np.where(stops < 0, -1, np.minimum(stops, 2)), ["0", "1", "2+"])
+            if name == "seat_class":
+                return bit_counts(self.seats[matched], sorted(self.seat_bits, key=self.seat_bits.get))
+            return price_histogram(self.price[matched])
+
+        return disjunctive_counts(masks, len(rows), names, count)
+
+    def sort(self, rows: np.ndarray, sort_by: Optional[str]) -> np.ndarray:
+        """Order rows by file position, then stably by the requested sort key."""
+        rows = rows[np.argsort(self.position[rows], kind="stable")]
+        if sort_by == "price_asc":
+            return rows[np.argsort(self.price[rows], kind="stable")]
+        if sort_by == "price_desc":
+            return rows[np.argsort(-self.price[rows], kind="stable")]
+        if sort_by == "duration":
+            return rows[np.argsort(self.duration[rows], kind="stable")]
+        if sort_by == "departure_time":
+            return rows[np.argsort(self.depart_epoch[rows], kind="stable")]
+        return rows
+
+    def _sort_key(self, rows: np.ndarray, sort_by: Optional[str]) -> np.ndarray:
+        if sort_by == "price_asc":
+            return self.price[rows]
+        if sort_by == "price_desc":
+            return -self.price[rows]
+        if sort_by == "duration":
+            return self.duration[rows]
+        if sort_by == "departure_time":
+            return self.depart_epoch[rows].astype(np.float64)
+        return np.zeros(len(rows))
+
+    def page(self, rows: np.ndarray, sort_by: Optional[str], limit: Optional[int],
+             cursor: Optional[str]) -> Tuple[np.ndarray, Optional[str]]:
+        """
+        Top-k selection over filtered rows, ranked by (sort key, file position).
+
+        Rows at or before the cursor are masked out, argpartition picks the
+        k+1 smallest keys in linear time and only those are fully ordered.
+        """
+        keys = self._sort_key(rows, sort_by)
+        positions = self.position[rows]
+        if cursor:
+            after = decode_cursor(cursor, sort_by)
+            keep = (keys > after["k"]) | ((keys == after["k"]) & (positions > after["p"]))
+            rows, keys, positions = rows[keep], keys[keep], positions[keep]
+
+        if limit is not None and len(rows) > limit + 1:
+            # Keep everything tied with the (k+1)-th key so position can break the tie
+            threshold = keys[np.argpartition(keys, limit)[limit]]
+            keep = keys <= threshold
+            rows, keys, positions = rows[keep], keys[keep], positions[keep]
+
+        order = np.lexsort((positions, keys))
+        if limit is None:
+            return rows[order], None
+
+        order = order[:limit + 1]
+        next_cursor = None
+        if len(order) > limit and limit > 0:
+            last = order[limit - 1]
+            next_cursor = encode_cursor({"s": sort_by, "k": float(keys[last]), "p": int(positions[last])})
+        return rows[order[:limit]], next_cursor
+
+    def take(self, rows: np.ndarray) -> List[dict]:
+        return [self.itineraries[i] for i in rows]
+
+    def iter_rows(self, rows: np.ndarray) -> Iterator[dict]:
+        for i in rows:
+            yield self.itineraries[i]
+
+    def search(self, *args, **kwargs) -> Tuple[List[dict], int, Optional[str]]:
+        """Return (page, total matches, next cursor) for a route search; see `select`."""
+        rows, total, next_cursor = self.select(*args, **kwargs)
+        return self.take(rows), total, next_cursor
+
+    def select(self, origin: Union[str, Sequence[str]], destination: Union[str, Sequence[str]],
+               depart: Optional[str] = None, returnd: Optional[str] = None,
+               seat_class: Optional[str] = None, stops: Optional[int] = None,
+               airline: Optional[str] = None, price_min: Optional[float] = None,
+               price_max: Optional[float] = None, sort_by: Optional[str] = None,
+               limit: Optional[int] = None,
+               cursor: Optional[str] = None) -> Tuple[np.ndarray, int, Optional[str]]:
+        """
+        Return (ordered page rows, total matches, next cursor) for a route search.
+
+        `origin` and `destination` may be lists of airport codes; every pair
+        is looked up and filtered concurrently and the matches are merged
+        before sorting, so the ranking is the same as for a single route.
+        """
+        origins = [origin] if isinstance(origin, str) else list(origin)
+        destinations = [destination] if isinstance(destination, str) else list(destination)
+
+        def lookup(pair: Tuple[str, str]) -> np.ndarray:
+            rows = self.rows(pair[0], pair[1], depart)
+            return self.filter(rows, seat_class, stops, airline, price_min, price_max, returnd)
+
+        pairs = [(o, d) for o in origins for d in destinations]
+        if len(pairs) == 1:
+            rows = lookup(pairs[0])
+        else:
+            rows = np.concatenate([np.arange(0)] + list(_lookup_pool.map(lookup, pairs)))
+        total = len(rows)
+        if limit is None and cursor is None:
+            return self.sort(rows, sort_by), total, None
+        rows, next_cursor = self.page(rows, sort_by, limit, cursor)
+        return rows, total, next_cursor
+
+class FlightCatalog:
+    def __init__(self, one_way: List[dict], round_trip: List[dict]):
+        self.one_way = FlightIndex(one_way)
+        self.round_trip = FlightIndex(round_trip)
+        self.connections = ConnectionGraph(self.one_way)
+        self.calendar = FareCalendar(self.one_way, self.round_trip)
+
@@ -0,0 +1,103 @@
+import math
+from typing import List, Tuple
+
+import numpy as np
+
+from app.core.errors import InvalidParameter
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.195
+
+def haversine_km(lat: np.ndarray, lng: np.ndarray, from_lat: float, from_lng: float) -> np.ndarray:
+    """Great-circle distance in km from one point to arrays of points (degrees)."""
+    lat, lng = np.radians(lat), np.radians(lng)
+    from_lat, from_lng = math.radians(from_lat), math.radians(from_lng)
+    h = (np.sin((lat - from_lat) / 2) ** 2
+         + math.cos(from_lat) * np.cos(lat) * np.sin((lng - from_lng) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+
+def parse_bbox(value: str) -> Tuple[float, float, float, float]:
+    """Parse "south,west,north,east" in degrees. west > east crosses the antimeridian."""
+    try:
+        south, west, north, east = (float(v) for v in value.split(","))
+    except ValueError:
+        raise InvalidParameter("bbox must be four numbers: south,west,north,east")
+    if not (-90 <= south <= north <= 90) or not (-180 <= west <= 180 and -180 <= east <= 180):
+        raise InvalidParameter("bbox is out of range or south > north")
+    return south, west, north, east
+
+class GeoGrid:
+    """
+    Uniform lat/lng grid over point coordinates.
+
+    Points are sorted by cell id (cell row * columns + cell column), so the
+    cells of one grid row that a box covers are a single contiguous slice. A
+    box query is one searchsorted pair per covered grid row plus an exact
+    coordinate check on those slices; radius queries use the circle's bounding
+    box and then an exact haversine distance. Points without coordinates are
+    never returned.
+    """
+
+    def __init__(self, lat: np.ndarray, lng: np.ndarray, cell_degrees: float = 0.1):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lng = np.asarray(lng, dtype=np.float64)
+        self.cell = cell_degrees
+        self.columns = int(math.ceil(360 / cell_degrees))
+        self.grid_rows = int(math.ceil(180 / cell_degrees))
+
+        valid = np.flatnonzero(~(np.isnan(self.lat) | np.isnan(self.lng)))
+        ids = self._cell_row(self.lat[valid]) * self.columns + self._cell_column(self.lng[valid])
+        order = np.argsort(ids, kind="stable")
+        self._ids = ids[order]
+        self._rows = valid[order]
+
+    def _cell_row(self, lat) -> np.ndarray:
+        return np.clip(((np.asarray(lat) + 90) // self.cell).astype(np.int64), 0, self.grid_rows - 1)
+
+    def _cell_column(self, lng) -> np.ndarray:
+        return np.clip(((np.asarray(lng) + 180) // self.cell).astype(np.int64), 0, self.columns - 1)
+
+    def _lng_ranges(self, west: float, east: float) -> List[Tuple[float, float]]:
+        return [(west, east)] if west <= east else [(west, 180.0), (-180.0, east)]
+
+    def within_bbox(self, south: float, west: float, north: float, east: float) -> np.ndarray:
+        """Sorted rows inside the box (edges included)."""
+        first, last = int(self._cell_row(south)), int(self._cell_row(north))
+        chunks = []
+        for lo_lng, hi_lng in self._lng_ranges(west, east):
+            lo_col, hi_col = int(self._cell_column(lo_lng)), int(self._cell_column(hi_lng))
+            starts = np.arange(first, last + 1) * self.columns
+            lo = np.searchsorted(self._ids, starts + lo_col, side="left")
+            hi = np.searchsorted(self._ids, starts + hi_col, side="right")
+            for a, b in zip(lo, hi):
+                if a < b:
+                    chunks.append(self._rows[a:b])
+        if not chunks:
+            return np.empty(0, dtype=np.int64)
+        rows = np.concatenate(chunks)
+        lat, lng = self.lat[rows], self.lng[rows]
+        inside = (lat >= south) & (lat <= north)
+        if west <= east:
+            inside &= (lng >= west) & (lng <= east)
+        else:
+            inside &= (lng >= west) | (lng <= east)
+        return np.sort(rows[inside])
+
+    def within_radius(self, lat: float, lng: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(sorted rows, their distances in km) within `radius_km` of the point."""
+        dlat = radius_km / KM_PER_DEGREE
+        south, north = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+        cos_lat = min(math.cos(math.radians(south)), math.cos(math.radians(north)))
+        if cos_lat <= 1e-9 or radius_km / (KM_PER_DEGREE * cos_lat) >= 180:
+            west, east = -180.0, 180.0
+        else:
+            dlng = radius_km / (KM_PER_DEGREE * cos_lat)
+            west = (lng - dlng + 180) % 360 - 180
+            east = (lng + dlng + 180) % 360 - 180
+        rows = self.within_bbox(south, west, north, east)
+        distance = haversine_km(self.lat[rows], self.lng[rows], lat, lng)
+        keep = distance <= radius_km
+        return rows[keep], distance[keep]
+
+    def distances(self, rows: np.ndarray, lat: float, lng: float) -> np.ndarray:
+        return haversine_km(self.lat[rows], self.lng[rows], lat, lng)
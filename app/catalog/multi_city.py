@@ -0,0 +1,151 @@
+import heapq
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from app.catalog.flights import FlightIndex
+from app.core.currency import BASE_CURRENCY, to_usd, usd_factor
+from app.core.errors import InvalidParameter
+
+# How many cheapest (or shortest) one-way options per leg are considered, relative to k.
+# Extra head-room covers combinations dropped because the legs overlap in time.
+LEG_CANDIDATE_FACTOR = 4
+# Upper bound on heap pops per merge step, relative to the number of combinations kept
+MAX_EXPANSION_FACTOR = 20
+
+class Leg(NamedTuple):
+    origin: str
+    destination: str
+    date: str
+
+class _Partial(NamedTuple):
+    cost: float
+    price: float
+    rows: Tuple[int, ...]
+    arrive: int
+
+def parse_legs(values: List[str]) -> List[Leg]:
+    """Parse ORIGIN-DESTINATION-YYYY-MM-DD strings into legs, in travel order."""
+    legs = []
+    for value in values:
+        parts = value.strip().split("-", 2)
+        if len(parts) != 3 or not all(parts) or len(parts[2]) != 10:
+            raise InvalidParameter(f"Invalid leg '{value}', expected ORIGIN-DESTINATION-YYYY-MM-DD")
+        legs.append(Leg(parts[0].upper(), parts[1].upper(), parts[2]))
+    if len(legs) < 2:
+        raise InvalidParameter("A multi-city search needs at least two legs")
+    return legs
+
+def _merge(partials: List[_Partial], candidates: np.ndarray, costs: np.ndarray, prices: np.ndarray,
+           index: FlightIndex, limit: int, accept: Callable[[_Partial], bool]) -> List[_Partial]:
+    """
+    The `limit` cheapest feasible extensions of cost-sorted partials by cost-sorted candidates.
+
+    Classic k-smallest-pair-sums frontier: start at (0, 0) and push (i+1, j) and
+    (i, j+1) after each pop, so only O(limit) of the partials x candidates grid
+    is ever looked at.
+    """
+    out: List[_Partial] = []
+    if not partials or len(candidates) == 0:
+        return out
+
+    heap = [(partials[0].cost + costs[0], 0, 0)]
+    seen = {(0, 0)}
+    expansions = 0
+    while heap and len(out) < limit and expansions < limit * MAX_EXPANSION_FACTOR:
+        cost, i, j = heapq.heappop(heap)
+        expansions += 1
+        row = int(candidates[j])
+        partial = partials[i]
+        if index.depart_epoch[row] >= partial.arrive:
+            extended = _Partial(cost, partial.price + float(prices[j]),
+                                partial.rows + (row,), int(index.arrive_epoch[row]))
+            if accept(extended):
+                out.append(extended)
+        for ni, nj in ((i + 1, j), (i, j + 1)):
+            if ni < len(partials) and nj < len(candidates) and (ni, nj) not in seen:
+                seen.add((ni, nj))
+                heapq.heappush(heap, (partials[ni].cost + costs[nj], ni, nj))
+    return out
+
+def _combine(index: FlightIndex, rows: Tuple[int, ...]) -> dict:
+    """Join the legs into one itinerary, priced in USD."""
+    parts = [index.itineraries[r] for r in rows]
+    factors = [usd_factor(p.get("price", {}).get("currency")) for p in parts]
+    first = parts[0]
+    seat_classes = [
+        s for s in first.get("seat_classes", [])
+        if all(s in p.get("seat_classes", []) for p in parts[1:])
+    ]
+    member_prices = [p.get("price", {}).get("member_price") for p in parts]
+    price = {
+        "total": round(sum(p.get("price", {}).get("total", 0) * f for p, f in zip(parts, factors)), 2),
+        "currency": BASE_CURRENCY,
+    }
+    if all(m is not None for m in member_prices):
+        price["member_price"] = round(sum(m * f for m, f in zip(member_prices, factors)), 2)
+    return {
+        "id": "mc-" + "+".join(p["id"] for p in parts),
+        "trip_type": "multi_city",
+        "airline": first.get("airline"),
+        "stops": sum(p.get("stops", 0) for p in parts),
+        "seat_classes": seat_classes,
+        "price": price,
+        "duration_total_minutes": sum(p.get("duration_total_minutes", 0) for p in parts),
+        "baggage": first.get("baggage"),
+        "legs": [
+            {"direction": f"segment_{i + 1}", "segments": p["legs"][0]["segments"]}
+            for i, p in enumerate(parts)
+        ],
+        "components": [p["id"] for p in parts],
+    }
+
+def build_itineraries(index: FlightIndex, legs: List[Leg], objective: str = "price", k: int = 20,
+                      seat_class: Optional[str] = None, stops: Optional[int] = None,
+                      airline: Optional[str] = None, price_min: Optional[float] = None,
+                      price_max: Optional[float] = None) -> List[dict]:
+    """
+    Best `k` multi-city itineraries for the ordered legs, built from one-way inventory.
+
+    Each leg contributes its cheapest (or shortest, for objective="duration")
+    options that pass the per-itinerary filters; legs are then folded in one at a
+    time with a bounded k-best merge, so the work grows with k and the number of
+    legs rather than with the product of per-leg option counts. Each leg must
+    depart after the previous one arrives. Legs are quoted in their own
+    currencies, so prices (and `price_min`/`price_max`) are compared in USD;
+    legs in a currency without a rate are left out.
+    """
+    beam = k * LEG_CANDIDATE_FACTOR
+
+    per_leg = []
+    for leg in legs:
+        rows = index.filter(index.rows(leg.origin, leg.destination, leg.date), seat_class, stops, airline)
+        prices = to_usd(index.price[rows], (index.itineraries[r].get("price", {}).get("currency") for r in rows))
+        # Prices are non-negative, so a leg above price_max can never be part of a match
+        keep = ~np.isnan(prices) if price_max is None else prices <= price_max
+        rows, prices = rows[keep], prices[keep]
+        order = np.argsort(index.position[rows], kind="stable")
+        rows, prices = rows[order], prices[order]
+        costs = index.duration[rows] if objective == "duration" else prices
+        order = np.argsort(costs, kind="stable")[:beam]
+        if len(order) == 0:
+            return []
+        per_leg.append((rows[order], costs[order], prices[order]))
+
+    partials = [_Partial(0.0, 0.0, (), 0)]
+    for step, (rows, costs, prices) in enumerate(per_leg):
+        last = step == len(per_leg) - 1
+        keep = k if last else beam
+
+        def accept(p: _Partial, last=last) -> bool:
+            if price_max is not None and p.price > price_max:
+                return False
+            if last and price_min is not None and p.price < price_min:
+                return False
+            return True
+
+        partials = _merge(partials, rows, costs, prices, index, keep, accept)
+        if not partials:
+            return []
+
+    return [_combine(index, p.rows) for p in partials]
@@ -0,0 +1,105 @@
+from bisect import bisect_left
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.errors import InvalidParameter
+
+class RentalUnavailable(ValueError):
+    """The rental is already reserved for part of the requested window."""
+
+def to_minutes(value: str) -> int:
+    """Minutes since the epoch for an ISO date or datetime; aware values are taken in UTC."""
+    try:
+        moment = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        raise InvalidParameter(f"Invalid datetime '{value}', expected YYYY-MM-DDTHH:MM")
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return int((moment - datetime(1970, 1, 1)).total_seconds()) // 60
+
+def parse_window(start: Optional[str], end: Optional[str]) -> Optional[Tuple[int, int]]:
+    """(start, end) minutes for a pickup/dropoff pair, None if neither is given."""
+    if not start and not end:
+        return None
+    if not (start and end):
+        raise InvalidParameter("pickup_datetime and dropoff_datetime must be given together")
+    window = to_minutes(start), to_minutes(end)
+    if window[1] <= window[0]:
+        raise InvalidParameter("dropoff_datetime must be after pickup_datetime")
+    return window
+
+class RentalAvailability:
+    """
+    Reservation intervals per rental id.
+
+    Each rental keeps its reservations as two sorted tuples (starts, ends) of
+    half-open [start, end) minute intervals. Reservations never overlap, so
+    ends are sorted too, and "is [a, b) free" is one bisect: the only
+    reservation that can overlap is the last one starting before b.
+
+    Writers serialize on a lock and replace a rental's tuples with new ones
+    (copy-on-write), so searches read without locking and always see a
+    consistent pair. A booking touches only its own rental.
+    """
+
+    def __init__(self):
+        self._intervals: Dict[str, Tuple[Tuple[int, ...], Tuple[int, ...]]] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    @staticmethod
+    def _overlaps(intervals: Tuple[Tuple[int, ...], Tuple[int, ...]], start: int, end: int) -> bool:
+        starts, ends = intervals
+        i = bisect_left(starts, end)
+        return i > 0 and ends[i - 1] > start
+
+    def is_free(self, rental_id, start: int, end: int) -> bool:
+        intervals = self._intervals.get(str(rental_id))
+        return intervals is None or not self._overlaps(intervals, start, end)
+
+    def blocked(self, start: int, end: int) -> List[str]:
+        """Ids of the rentals with a reservation overlapping [start, end)."""
+        return [rental_id for rental_id, intervals in list(self._intervals.items())
+                if self._overlaps(intervals, start, end)]
+
+    def reserve(self, rental_id, start: int, end: int) -> None:
+        """Add [start, end) for the rental, or raise RentalUnavailable if it overlaps a reservation."""
+        if end <= start:
+            raise ValueError("Reservation must end after it starts")
+        rental_id = str(rental_id)
+        with self._lock:
+            starts, ends = self._intervals.get(rental_id, ((), ()))
+            if self._overlaps((starts, ends), start, end):
+                raise RentalUnavailable(f"Car {rental_id} is already booked for part of that window")
+            i = bisect_left(starts, start)
+            self._intervals[rental_id] = (starts[:i] + (start,) + starts[i:], ends[:i] + (end,) + ends[i:])
+
+    def release(self, rental_id, start: int, end: int) -> None:
+        """Remove an exact reservation, e.g. when the booking it belonged to was not stored."""
+        rental_id = str(rental_id)
+        with self._lock:
+            starts, ends = self._intervals.get(rental_id, ((), ()))
+            i = bisect_left(starts, start)
+            if i < len(starts) and starts[i] == start and ends[i] == end:
+                if len(starts) == 1:
+                    del self._intervals[rental_id]
+                else:
+                    self._intervals[rental_id] = (starts[:i] + starts[i + 1:], ends[:i] + ends[i + 1:])
+
+    def reservations(self, rental_id) -> List[Tuple[int, int]]:
+        starts, ends = self._intervals.get(str(rental_id), ((), ()))
+        return list(zip(starts, ends))
+
+    def load(self, reservations: Iterable[Tuple[str, int, int]]) -> None:
+        """Add stored reservations (rental id, start, end); overlapping ones are skipped."""
+        for rental_id, start, end in reservations:
+            try:
+                self.reserve(rental_id, start, end)
+            except ValueError:
+                continue
+
+# Reservations outlive catalog reloads, so they are kept apart from CarCatalog
+rental_availability = RentalAvailability()
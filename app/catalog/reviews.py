@@ -0,0 +1,101 @@
+from bisect import bisect_right
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.errors import InvalidParameter
+from app.core.pagination import decode_cursor, encode_cursor
+
+def _date_ordinal(review: dict) -> int:
+    try:
+        return date.fromisoformat(str(review.get("date", ""))[:10]).toordinal()
+    except ValueError:
+        return 0
+
+# sort name -> key; every order is ascending by (key, file position)
+REVIEW_SORTS: Dict[str, Callable[[dict], float]] = {
+    "newest": lambda r: -_date_ordinal(r),
+    "oldest": lambda r: _date_ordinal(r),
+    "rating_desc": lambda r: -float(r.get("rating") or 0),
+    "rating_asc": lambda r: float(r.get("rating") or 0),
+    "helpful": lambda r: -float(r.get("helpful_votes") or 0),
+}
+DEFAULT_SORT = "newest"
+
+class _StayReviews:
+    def __init__(self, reviews: List[dict]):
+        self.reviews = reviews
+        # sort -> ([(key, position)], [review index]) so a cursor resumes with one bisect
+        self.orders: Dict[str, Tuple[List[Tuple[float, int]], List[int]]] = {}
+        for name, key in REVIEW_SORTS.items():
+            ranked = sorted((key(r), i) for i, r in enumerate(reviews))
+            self.orders[name] = (ranked, [i for _, i in ranked])
+
+        histogram = {str(stars): 0 for stars in range(1, 6)}
+        total = 0.0
+        for review in reviews:
+            rating = review.get("rating")
+            if rating is None:
+                continue
+            total += rating
+            bucket = str(min(5, max(1, int(round(rating)))))
+            histogram[bucket] += 1
+        rated = sum(histogram.values())
+        self.summary = {
+            "count": len(reviews),
+            "average_rating": round(total / rated, 2) if rated else None,
+            "histogram": histogram,
+        }
+
+class ReviewStore:
+    """
+    Reviews grouped by stay id.
+
+    Each stay's reviews are pre-sorted once per supported order, and the
+    rating average and 1-5 star histogram are computed at load, so a summary
+    is a dict lookup and a page is a bisect plus a slice.
+    """
+
+    def __init__(self, reviews: List[dict]):
+        grouped: Dict[str, List[dict]] = {}
+        for review in reviews:
+            grouped.setdefault(str(review.get("stay_id")), []).append(review)
+        self._stays = {stay_id: _StayReviews(items) for stay_id, items in grouped.items()}
+        self._empty = _StayReviews([])
+
+    @classmethod
+    def from_document(cls, data) -> "ReviewStore":
+        if isinstance(data, dict):
+            data = data.get("reviews", [])
+        return cls(data)
+
+    def _get(self, stay_id: str) -> _StayReviews:
+        return self._stays.get(str(stay_id), self._empty)
+
+    def all(self, stay_id: str) -> List[dict]:
+        """Every review of a stay, in file order."""
+        return list(self._get(stay_id).reviews)
+
+    def summary(self, stay_id: str) -> dict:
+        return dict(self._get(stay_id).summary)
+
+    def page(self, stay_id: str, sort: Optional[str] = None, limit: int = 20,
+             cursor: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+        """One page of a stay's reviews in the requested order, plus the next cursor."""
+        sort = sort or DEFAULT_SORT
+        if sort not in REVIEW_SORTS:
+            raise InvalidParameter(f"Unknown review sort '{sort}', expected one of {', '.join(REVIEW_SORTS)}")
+        stay = self._get(stay_id)
+        ranked, order = stay.orders[sort]
+
+        start = 0
+        if cursor:
+            after = decode_cursor(cursor, sort)
+            start = bisect_right(ranked, (after["k"], after["p"]))
+        end = min(start + limit, len(order))
+        items = [stay.reviews[i] for i in order[start:end]]
+
+        next_cursor = None
+        if end < len(order) and end > start:
+            key, position = ranked[end - 1]
+            next_cursor = encode_cursor({"s": sort, "k": key, "p": position})
+        return items, next_cursor
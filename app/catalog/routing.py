@@ -0,0 +1,168 @@
+import heapq
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from app.core.currency import BASE_CURRENCY, to_usd
+from app.core.errors import InvalidParameter
+
+if TYPE_CHECKING:
+    from app.catalog.flights import FlightIndex
+
+class _Label(NamedTuple):
+    cost: float
+    price: float
+    rows: Tuple[int, ...]
+    airports: Tuple[str, ...]
+
+class ConnectionGraph:
+    """
+    Time-expanded flight graph over the one-way inventory.
+
+    Every bookable one-way itinerary is a hop from the first segment's origin to
+    the last segment's destination. Nodes are departure events; per airport they
+    are kept sorted by departure time, so the hops reachable after landing at X
+    at time t (t + minimum connection .. t + maximum layover) are one bisect away
+    instead of an explicit edge list. The same ordering per (origin, destination)
+    pair lets the final hop of a path jump straight to flights into the target.
+    Hop prices are converted to USD, since each itinerary is quoted in its own
+    currency; hops in a currency without a rate are never used.
+    """
+
+    def __init__(self, index: "FlightIndex"):
+        self.index = index
+        n = len(index)
+        self.origin = np.array(
+            [it["legs"][0]["segments"][0]["from"]["code"] for it in index.itineraries], dtype=object)
+        self.destination = np.array(
+            [it["legs"][0]["segments"][-1]["to"]["code"] for it in index.itineraries], dtype=object)
+        self.price = to_usd(index.price, (it.get("price", {}).get("currency") for it in index.itineraries))
+
+        self._departures: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._route_departures: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] = {}
+        if n:
+            origins, destinations = self.origin.astype(str), self.destination.astype(str)
+            order = np.lexsort((index.depart_epoch, origins))
+            bounds = np.flatnonzero(origins[order][1:] != origins[order][:-1]) + 1
+            for chunk in np.split(order, bounds):
+                self._departures[self.origin[chunk[0]]] = (index.depart_epoch[chunk], chunk)
+
+            order = np.lexsort((index.depart_epoch, destinations, origins))
+            pairs = np.char.add(np.char.add(origins[order], "\n"), destinations[order])
+            bounds = np.flatnonzero(pairs[1:] != pairs[:-1]) + 1
+            for chunk in np.split(order, bounds):
+                key = (self.origin[chunk[0]], self.destination[chunk[0]])
+                self._route_departures[key] = (index.depart_epoch[chunk], chunk)
+
+    def departures(self, airport: str, earliest: int, latest: int,
+                   destination: Optional[str] = None) -> np.ndarray:
+        """Rows departing `airport` in [earliest, latest), optionally only those flying to `destination`."""
+        if destination is None:
+            times, rows = self._departures.get(airport, (None, None))
+        else:
+            times, rows = self._route_departures.get((airport, destination), (None, None))
+        if times is None:
+            return np.empty(0, dtype=np.int64)
+        lo = np.searchsorted(times, earliest, side="left")
+        hi = np.searchsorted(times, latest, side="left")
+        return rows[lo:hi]
+
+    def search(self, origin: str, destination: str, depart: str, k: int = 10,
+               objective: str = "price", max_stops: int = 2, min_connection_minutes: int = 60,
+               max_layover_minutes: int = 1440, allowed: Optional[np.ndarray] = None) -> List[Tuple[int, ...]]:
+        """
+        k shortest origin -> destination paths starting on `depart` (YYYY-MM-DD, UTC).
+
+        Best-first search over partial paths ordered by total USD price, or by
+        elapsed time since the first departure for objective="duration". Both
+        costs only grow along a path, so paths reach the destination in cost
+        order. Each departure event is expanded at most k times, which bounds the
+        work the same way the k-shortest-walks label algorithm does. Paths never
+        revisit an airport; `allowed` optionally masks out rows (seat class,
+        airline, ...).
+        """
+        index = self.index
+        origin, destination = origin.upper(), destination.upper()
+        try:
+            day = datetime.strptime(depart, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        except ValueError:
+            raise InvalidParameter("depart must be YYYY-MM-DD")
+        day_start = int(day.timestamp())
+        min_gap = min_connection_minutes * 60
+        max_gap = max_layover_minutes * 60
+        by_duration = objective == "duration"
+        usable = ~np.isnan(self.price)
+        if allowed is not None:
+            usable &= allowed
+
+        heap: List[Tuple[float, int, _Label]] = []
+        counter = 0
+
+        def push(label: _Label):
+            nonlocal counter
+            heapq.heappush(heap, (label.cost, counter, label))
+            counter += 1
+
+        for row in self.departures(origin, day_start, day_start + 86400):
+            row = int(row)
+            if not usable[row]:
+                continue
+            price = float(self.price[row])
+            cost = float(index.arrive_epoch[row] - index.depart_epoch[row]) if by_duration else price
+            push(_Label(cost, price, (row,), (origin, self.destination[row])))
+
+        found: List[Tuple[int, ...]] = []
+        expanded: Dict[int, int] = {}
+        while heap and len(found) < k:
+            _, _, label = heapq.heappop(heap)
+            last = label.rows[-1]
+            if label.airports[-1] == destination:
+                found.append(label.rows)
+                continue
+            if len(label.rows) > max_stops or expanded.get(last, 0) >= k:
+                continue
+            expanded[last] = expanded.get(last, 0) + 1
+
+            arrive = int(index.arrive_epoch[last])
+            start = int(index.depart_epoch[label.rows[0]])
+            # With one hop left only flights into the destination can complete the path
+            target = destination if len(label.rows) == max_stops else None
+            for row in self.departures(label.airports[-1], arrive + min_gap, arrive + max_gap + 1, target):
+                row = int(row)
+                nxt = self.destination[row]
+                if nxt in label.airports or not usable[row]:
+                    continue
+                price = label.price + float(self.price[row])
+                cost = float(index.arrive_epoch[row] - start) if by_duration else price
+                push(_Label(cost, price, label.rows + (row,), label.airports + (nxt,)))
+        return found
+
+    def describe(self, rows: Tuple[int, ...]) -> dict:
+        """Shape a path like a one-way itinerary, with layover details and its total price in USD."""
+        index = self.index
+        parts = [index.itineraries[r] for r in rows]
+        first = parts[0]
+        layovers = [
+            {
+                "airport": self.destination[a],
+                "minutes": int(index.depart_epoch[b] - index.arrive_epoch[a]) // 60,
+            }
+            for a, b in zip(rows, rows[1:])
+        ]
+        segments = [s for p in parts for s in p["legs"][0]["segments"]]
+        return {
+            "id": "cx-" + "+".join(p["id"] for p in parts),
+            "trip_type": "connection",
+            "airline": first.get("airline"),
+            "airlines": sorted({p.get("airline", {}).get("code") for p in parts} - {None}),
+            "stops": len(parts) - 1 + sum(p.get("stops", 0) for p in parts),
+            "price": {
+                "total": round(float(sum(self.price[r] for r in rows)), 2),
+                "currency": BASE_CURRENCY,
+            },
+            "duration_total_minutes": int(index.arrive_epoch[rows[-1]] - index.depart_epoch[rows[0]]) // 60,
+            "layovers": layovers,
+            "legs": [{"direction": "outbound", "segments": segments}],
+            "components": [p["id"] for p in parts],
+        }
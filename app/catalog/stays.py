@@ -0,0 +1,192 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.catalog.availability import AvailabilityIndex
+from app.catalog.geo import GeoGrid
+from app.catalog.trigram import TrigramIndex
+from app.core.errors import InvalidParameter
+from app.core.facets import bit_counts, disjunctive_counts, price_histogram, value_counts
+
+# Facets stay search can count
+STAY_FACETS = ("stars", "amenities", "price")
+
+def _meta_amenities(data) -> List[str]:
+    if data is None:
+        return []
+    categories = data.get("categories", []) if isinstance(data, dict) else data
+    return [a for c in categories for a in c.get("amenities", [])]
+
+def _coordinate(stay: dict, axis: str) -> float:
+    value = (stay.get("coordinates") or {}).get(axis)
+    return np.nan if value is None else float(value)
+
+class AmenityBits:
+    """
+    Amenity sets as bitmasks.
+
+    Every amenity name gets a bit: the ones listed in meta-ui/stays_amenities.json
+    first (in file order), then any other name found in the data. Each stay's
+    set is a row of uint64 words, so "has all of these amenities" is one AND
+    and compare across the whole catalog.
+    """
+
+    def __init__(self, amenity_lists: List[List[str]], known: Optional[List[str]] = None):
+        self.codes: Dict[str, int] = {}
+        for name in known or []:
+            self.codes.setdefault(name, len(self.codes))
+        for names in amenity_lists:
+            for name in names:
+                self.codes.setdefault(name, len(self.codes))
+
+        self.words = max(1, (len(self.codes) + 63) // 64)
+        self.bits = np.zeros((len(amenity_lists), self.words), dtype=np.uint64)
+        for row, names in enumerate(amenity_lists):
+            for name in names:
+                code = self.codes[name]
+                self.bits[row, code // 64] |= np.uint64(1 << (code % 64))
+
+    def mask(self, names: List[str]) -> Optional[np.ndarray]:
+        """Bitmask of `names`, or None if one of them never occurs."""
+        mask = np.zeros(self.words, dtype=np.uint64)
+        for name in names:
+            code = self.codes.get(name)
+            if code is None:
+                return None
+            mask[code // 64] |= np.uint64(1 << (code % 64))
+        return mask
+
+    def has_all(self, rows: np.ndarray, names: List[str]) -> np.ndarray:
+        """Boolean mask over `rows`: stays offering every amenity in `names`."""
+        mask = self.mask(names)
+        if mask is None:
+            return np.zeros(len(rows), dtype=bool)
+        return np.all((self.bits[rows] & mask) == mask, axis=1)
+
+class StayCatalog:
+    """In-memory stays inventory with the indexes stay search runs on."""
+
+    def __init__(self, stays: List[dict], amenity_names: Optional[List[str]] = None,
+                 availability: Optional[List[dict]] = None):
+        self.stays = stays
+        self.locations = TrigramIndex([s.get("location", "") for s in stays])
+        self.amenities = AmenityBits([s.get("amenities", []) for s in stays], amenity_names)
+
+        n = len(stays)
+        self.price = np.fromiter((s.get("price", np.nan) for s in stays), dtype=np.float64, count=n)
+        self.rating = np.fromiter((s.get("rating", np.nan) for s in stays), dtype=np.float64, count=n)
+        self.stars = np.fromiter((s.get("stars", -1) for s in stays), dtype=np.int16, count=n)
+        self.star_levels = [int(v) for v in np.unique(self.stars[self.stars >= 0])]
+        self.star_codes = np.where(self.stars >= 0, np.searchsorted(self.star_levels, self.stars), -1)
+        self.geo = GeoGrid(
+            np.fromiter((_coordinate(s, "lat") for s in stays), dtype=np.float64, count=n),
+            np.fromiter((_coordinate(s, "lng") for s in stays), dtype=np.float64, count=n),
+        )
+        self.availability = AvailabilityIndex(availability or [], [s.get("id") for s in stays])
+
+    @classmethod
+    def from_documents(cls, search, availability, amenities=None) -> "StayCatalog":
+        """From stays_search.json, stays_availability.json and (if present) meta-ui/stays_amenities.json."""
+        if isinstance(availability, dict):
+            availability = availability.get("availability", [])
+        return cls(search["stays"], _meta_amenities(amenities), availability)
+
+    def __len__(self) -> int:
+        return len(self.stays)
+
+    def candidates(self, location: Optional[str] = None,
+                   bbox: Optional[Tuple[float, float, float, float]] = None,
+                   near: Optional[Tuple[float, float]] = None,
+                   radius_km: Optional[float] = None) -> np.ndarray:
+        """
+        Rows (in file order) matching the text location, map box and radius.
+
+        Each given constraint is answered by its own index (trigrams, grid);
+        the smallest result is then narrowed by the others.
+        """
+        sets = []
+        if location:
+            sets.append(self.locations.search(location))
+        if bbox is not None:
+            sets.append(self.geo.within_bbox(*bbox))
+        if near is not None and radius_km is not None:
+            sets.append(self.geo.within_radius(near[0], near[1], radius_km)[0])
+        if not sets:
+            return np.arange(len(self.stays))
+        sets.sort(key=len)
+        rows = sets[0]
+        for other in sets[1:]:
+            rows = rows[np.isin(rows, other, assume_unique=True)]
+        return rows
+
+    def suggest_locations(self, prefix: str, limit: int = 10) -> List[str]:
+        """Distinct stay locations starting with `prefix` (case-insensitive), most stays first."""
+        counts: Dict[str, int] = {}
+        for row in self.locations.search(prefix, prefix=True):
+            location = self.stays[row].get("location", "")
+            counts[location] = counts.get(location, 0) + 1
+        # sorted() is stable, so equal counts keep file order
+        return sorted(counts, key=lambda name: -counts[name])[:limit]
+
+    def _masks(self, rows: np.ndarray, price_min: Optional[float] = None, price_max: Optional[float] = None,
+               rating: Optional[float] = None, stars: Optional[int] = None,
+               amenities: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """One boolean mask over `rows` per active attribute filter, keyed by facet name."""
+        masks = {}
+        if price_min is not None or price_max is not None:
+            price = self.price[rows]
+            mask = np.ones(len(rows), dtype=bool)
+            if price_min is not None:
+                mask &= price >= price_min
+            if price_max is not None:
+                mask &= price <= price_max
+            masks["price"] = mask
+        if rating is not None:
+            masks["rating"] = self.rating[rows] >= rating
+        if stars is not None:
+            masks["stars"] = self.stars[rows] == stars
+        if amenities:
+            masks["amenities"] = self.amenities.has_all(rows, amenities)
+        return masks
+
+    @staticmethod
+    def _dates(check_in: Optional[str], check_out: Optional[str]) -> bool:
+        if (check_in or check_out) and not (check_in and check_out):
+            raise InvalidParameter("check_in and check_out must be given together")
+        return bool(check_in)
+
+    def filter(self, rows: np.ndarray, price_min: Optional[float] = None, price_max: Optional[float] = None,
+               rating: Optional[float] = None, stars: Optional[int] = None,
+               amenities: Optional[List[str]] = None, check_in: Optional[str] = None,
+               check_out: Optional[str] = None, rooms: int = 1) -> np.ndarray:
+        """Apply the stay filters as one combined boolean mask over `rows`."""
+        mask = np.ones(len(rows), dtype=bool)
+        for part in self._masks(rows, price_min, price_max, rating, stars, amenities).values():
+            mask &= part
+        if self._dates(check_in, check_out):
+            # Only the stays still in the running pay for the nightly inventory check
+            rows = rows[mask]
+            return rows[self.availability.available(rows, check_in, check_out, rooms)]
+        return rows[mask]
+
+    def facets(self, rows: np.ndarray, names: List[str], price_min: Optional[float] = None,
+               price_max: Optional[float] = None, rating: Optional[float] = None,
+               stars: Optional[int] = None, amenities: Optional[List[str]] = None,
+               check_in: Optional[str] = None, check_out: Optional[str] = None, rooms: int = 1) -> dict:
+        """Disjunctive facet counts (see STAY_FACETS) over candidate `rows` under the given filters."""
+        masks = self._masks(rows, price_min, price_max, rating, stars, amenities)
+        if self._dates(check_in, check_out):
+            masks["dates"] = self.availability.available(rows, check_in, check_out, rooms)
+
+        def count(name: str, keep: np.ndarray):
+            matched = rows[keep]
+            if name == "stars":
+                return value_counts(self.star_codes[matched], self.star_levels)
+            if name == "amenities":
+                return bit_counts(self.amenities.bits[matched], list(self.amenities.codes))
+            return price_histogram(self.price[matched])
+
+        return disjunctive_counts(masks, len(rows), names, count)
+
+    def take(self, rows: np.ndarray) -> List[dict]:
+        return [self.stays[i] for i in rows]
@@ -0,0 +1,303 @@
+import json
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from threading import Event, Lock, Thread
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.catalog.airports import AirportIndex
+from app.catalog.cars import CarCatalog
+from app.catalog.cruise_details import DETAILS_DIR, INDEX_NAME, CruiseDetailStore
+from app.catalog.cruises import CruiseCatalog
+from app.catalog.details import DETAIL_SOURCES, detail_index
+from app.catalog.flights import FlightCatalog
+from app.catalog.reviews import ReviewStore
+from app.catalog.stays import StayCatalog
+from app.catalog.things_to_do import ThingsToDoCatalog
+from app.core.cache import search_cache
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+
+class DatasetUnavailable(RuntimeError):
+    """A dataset failed to load and there is no earlier version of it to serve."""
+
+class Dataset(NamedTuple):
+    """Files under app/data a dataset is built from, and the builder taking their parsed JSON in that order."""
+    files: Tuple[str, ...]
+    build: Callable[..., Any]
+    namespaces: Tuple[str, ...] = ()  # search cache namespaces built from it
+    optional: Tuple[str, ...] = ()    # files passed to `build` as None when missing
+
+def _document(data):
+    return data
+
+def _cruise_details(index, legacy) -> CruiseDetailStore:
+    # A lookup that finds the segments rewritten under this index triggers a reload of the new one
+    return CruiseDetailStore(DATA_DIR / "cruises" / DETAILS_DIR, index, legacy,
+                             on_stale=lambda: catalog_store.reload())
+
+# Plain JSON documents served as parsed -> search cache namespace built from them
+DOCUMENTS: Dict[str, Optional[str]] = {
+    "home_navbar.json": None,
+    "trips_list.json": None,
+    "meta-ui/stays_locations.json": None,
+    "meta-ui/stays_amenities.json": None,
+    "meta-ui/stays_stars.json": None,
+    "meta-ui/airports.json": None,
+    "meta-ui/airlines.json": None,
+    "meta-ui/car_locations.json": None,
+    "meta-ui/car_brands.json": None,
+    "meta-ui/currencies.json": None,
+    "meta-ui/languages.json": None,
+    "activities/activities_search.json": "activities",
+    "packages/packages_search.json": "packages",
+    "flights/multi_city.json": "flights",
+    "flights/flight_status.json": None,
+    "stays/stays_nearby.json": None,
+}
+
+# Every dataset under app/data, in load order; documents are keyed by their file name
+DATASETS: Dict[str, Dataset] = {
+    "airports": Dataset(("meta-ui/airports.json",), AirportIndex.from_document, ("flights", "packages")),
+    "flights": Dataset(("flights/one_way.json", "flights/round_trip.json"), FlightCatalog, ("flights",)),
+    "stays": Dataset(("stays/stays_search.json", "stays/stays_availability.json", "meta-ui/stays_amenities.json"),
+                     StayCatalog.from_documents, ("stays",), optional=("meta-ui/stays_amenities.json",)),
+    "cars": Dataset(("cars/cars_search.json", "meta-ui/car_locations.json"), CarCatalog.from_documents,
+                    ("cars",), optional=("meta-ui/car_locations.json",)),
+    "cruises": Dataset(("cruises/cruises_search.json",), CruiseCatalog.from_document, ("cruises",)),
+    "cruise_details": Dataset((f"cruises/{DETAILS_DIR}/{INDEX_NAME}", "cruises/cruise_details.json"),
+                              _cruise_details,
+                              optional=(f"cruises/{DETAILS_DIR}/{INDEX_NAME}", "cruises/cruise_details.json")),
+    "things_to_do": Dataset(("things_to_do/things_to_do_search.json",), ThingsToDoCatalog.from_document,
+                            ("things_to_do",)),
+    "reviews": Dataset(("stays/stays_reviews.json",), ReviewStore.from_document),
+    **{f"details/{vertical}": Dataset((filename,), lambda data, vertical=vertical: detail_index(vertical, data))
+       for vertical, (filename, _) in DETAIL_SOURCES.items()},
+    **{name: Dataset((name,), _document, (namespace,) if namespace else ()) for name, namespace in DOCUMENTS.items()},
+}
+
+Signature = Tuple[Optional[Tuple[int, int]], ...]
+
+def _signature(files: Tuple[str, ...]) -> Signature:
+    """(mtime, size) per file, None for a missing one."""
+    out = []
+    for name in files:
+        try:
+            stat = os.stat(DATA_DIR / name)
+            out.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            out.append(None)
+    return tuple(out)
+
+def _parse(name: str):
+    with open(DATA_DIR / name, encoding="utf-8") as f:
+        return json.load(f)
+
+class Snapshot:
+    """
+    One immutable generation of every dataset.
+
+    A request takes the current snapshot once and reads everything it
+    needs from it, so a package search or a stay page sees flights, stays,
+    cars and details of the same load even while a reload publishes the
+    next snapshot.
+    """
+
+    def __init__(self, values: Dict[str, Any], errors: Dict[str, str], signatures: Dict[str, Signature],
+                 loaded_at: float, retry: Callable[[str], Any]):
+        self.values = MappingProxyType(values)
+        self.errors = MappingProxyType(errors)
+        self.signatures = MappingProxyType(signatures)
+        self.loaded_at = loaded_at
+        self._retry = retry
+
+    def get(self, name: str):
+        """A dataset by name; raises DatasetUnavailable if it failed to load and its files have not changed since."""
+        try:
+            return self.values[name]
+        except KeyError:
+            return self._retry(name)
+
+    @property
+    def airports(self) -> AirportIndex:
+        return self.get("airports")
+
+    @property
+    def flights(self) -> FlightCatalog:
+        return self.get("flights")
+
+    @property
+    def stays(self) -> StayCatalog:
+        return self.get("stays")
+
+    @property
+    def cars(self) -> CarCatalog:
+        return self.get("cars")
+
+    @property
+    def cruises(self) -> CruiseCatalog:
+        return self.get("cruises")
+
+    @property
+    def cruise_details(self) -> CruiseDetailStore:
+        return self.get("cruise_details")
+
+    @property
+    def things_to_do(self) -> ThingsToDoCatalog:
+        return self.get("things_to_do")
+
+    @property
+    def reviews(self) -> ReviewStore:
+        return self.get("reviews")
+
+    def detail(self, vertical: str, record_id) -> Optional[dict]:
+        return self.get(f"details/{vertical}").get(str(record_id))
+
+    def document(self, name: str):
+        """Parsed JSON of app/data/<name>, one of DOCUMENTS."""
+        return self.get(name)
+
+class CatalogStore:
+    """
+    Every dataset under app/data, loaded once and refreshed without a restart.
+
+    The loaded datasets form an immutable Snapshot. A refresh builds the
+    changed datasets (each file parsed once) next to the current ones and
+    publishes a new snapshot with a single assignment, so a request sees
+    either the old or the new data, never a mix; only then are the search
+    cache namespaces built from them cleared.
+
+    Rebuilds run on one background worker, triggered by `reload()` (the
+    admin endpoint) or by the optional mtime watcher; only datasets whose
+    files changed are rebuilt unless forced. A dataset that fails to build
+    keeps serving its previous version, or raises DatasetUnavailable if it
+    has none; either way the error is reported in `status()` and the files
+    are not parsed again until their mtime or size changes.
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[Snapshot] = None
+        self._build_lock = Lock()
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="catalog-reload")
+        self._stop = Event()
+        self._watcher: Optional[Thread] = None
+        self.reloads = 0
+
+    def current(self) -> Snapshot:
+        """The published snapshot, loading every dataset on first use."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._build_lock:
+                if self._snapshot is None:
+                    self._refresh_locked(DATASETS)
+            snapshot = self._snapshot
+        return snapshot
+
+    def load(self) -> None:
+        """Load every dataset and build its indexes (startup); missing or broken files are reported, not fatal."""
+        with self._build_lock:
+            self._refresh_locked(DATASETS)
+
+    def changed(self) -> List[str]:
+        """Datasets whose files differ from the ones they were last built from."""
+        signatures = self.current().signatures
+        return [name for name, dataset in DATASETS.items() if _signature(dataset.files) != signatures.get(name)]
+
+    def _retry(self, name: str):
+        """A dataset missing from the snapshot: rebuilt if its files changed since it failed, else its error."""
+        if name not in DATASETS:
+            raise KeyError(name)
+        if _signature(DATASETS[name].files) != self.current().signatures.get(name):
+            self._refresh([name])
+        snapshot = self.current()
+        if name in snapshot.values:
+            return snapshot.values[name]
+        raise DatasetUnavailable(f"{name}: {snapshot.errors.get(name, 'not loaded')}")
+
+    def _refresh(self, names: Iterable[str]) -> List[str]:
+        names = list(names)
+        if not names:
+            return []
+        with self._build_lock:
+            rebuilt = self._refresh_locked(names)
+        self.reloads += 1
+        return rebuilt
+
+    def _refresh_locked(self, names: Iterable[str]) -> List[str]:
+        old = self._snapshot
+        values = dict(old.values) if old else {}
+        errors = dict(old.errors) if old else {}
+        signatures = dict(old.signatures) if old else {}
+        parsed: Dict[str, Any] = {}
+        rebuilt = []
+        for name in names:
+            dataset = DATASETS[name]
+            # Recorded even on failure: a broken file is parsed again only once it changes
+            signatures[name] = _signature(dataset.files)
+            try:
+                documents = []
+                for filename in dataset.files:
+                    if filename not in parsed:
+                        if filename in dataset.optional and not (DATA_DIR / filename).exists():
+                            parsed[filename] = None
+                        else:
+                            parsed[filename] = _parse(filename)
+                    documents.append(parsed[filename])
+                values[name] = dataset.build(*documents)
+            except Exception as e:
+                # One malformed record must not stop startup or take down the loaded version
+                errors[name] = f"{type(e).__name__}: {e}"
+                print(f"⚠️ Could not load {name}, keeping the loaded version if any: {e}")
+                continue
+            errors.pop(name, None)
+            rebuilt.append(name)
+
+        self._snapshot = Snapshot(values, errors, signatures, time.time(), self._retry)
+        for namespace in {namespace for name in rebuilt for namespace in DATASETS[name].namespaces}:
+            search_cache.invalidate(namespace)
+        return rebuilt
+
+    def reload(self, force: bool = False) -> "Future[List[str]]":
+        """Rebuild changed (or, with `force`, all) datasets in the background; the future gives those rebuilt."""
+        return self._worker.submit(lambda: self._refresh(list(DATASETS) if force else self.changed()))
+
+    def watch(self, interval_seconds: float) -> None:
+        """Poll file mtimes every `interval_seconds` and reload what changed (0 disables)."""
+        if interval_seconds <= 0 or self._watcher is not None:
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval_seconds):
+                try:
+                    if self.changed():
+                        self.reload().result()
+                except Exception as e:
+                    print(f"⚠️ Catalog watcher error: {e}")
+
+        self._watcher = Thread(target=run, name="catalog-watch", daemon=True)
+        self._watcher.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    def status(self) -> dict:
+        snapshot = self.current()
+        return {
+            "loaded_at": snapshot.loaded_at,
+            "reloads": self.reloads,
+            "watching": self._watcher is not None,
+            "datasets": len(snapshot.values),
+            "errors": dict(snapshot.errors),
+        }
+
+catalog_store = CatalogStore()
+
+def current() -> Snapshot:
+    """The catalog snapshot to serve a request from; take it once per request."""
+    return catalog_store.current()
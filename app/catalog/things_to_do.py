@@ -0,0 +1,211 @@
+import json
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.catalog.trigram import TrigramIndex
+from app.core.errors import InvalidParameter
+from app.core.pagination import decode_cursor, encode_cursor
+
+# Unsplash images for the featured activities; everything else gets the generic travel photo
+ACTIVITY_IMAGES = {
+    "ttd-1": "https://images.unsplash.com/photo-1566576912321-d58ddd7a6088?w=800&h=600&fit=crop",  # Universal Studios
+    "ttd-2": "https://images.unsplash.com/photo-1541961017774-22349e4a1262?w=800&h=600&fit=crop",  # Louvre Museum
+    "ttd-3": "https://images.unsplash.com/photo-1559339352-11d035aa65de?w=800&h=600&fit=crop",  # Food Tour
+    "ttd-4": "https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=800&h=600&fit=crop",  # Grand Canyon
+    "ttd-5": "https://images.unsplash.com/photo-1566576912321-d58ddd7a6088?w=800&h=600&fit=crop",  # Disney World
+}
+DEFAULT_IMAGE = "https://images.unsplash.com/photo-1488646953014-85cb44e25828?w=800&h=600&fit=crop"
+
+def activity_image(activity_id: str) -> str:
+    return ACTIVITY_IMAGES.get(activity_id, DEFAULT_IMAGE)
+
+def _dumps(value) -> bytes:
+    # Same encoding as FastAPI's JSONResponse
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+def _card(activity: dict) -> dict:
+    """The landing-page card for one activity."""
+    try:
+        card_id = int(str(activity["id"]).split("-")[1])  # ttd-1 -> 1
+    except (IndexError, ValueError):
+        card_id = activity["id"]
+    return {
+        "id": card_id,
+        "title": activity["name"],
+        "rating": activity["rating"],
+        "reviewsCount": activity["reviews_count"],
+        "duration": activity["duration"],
+        "price": activity["price"],
+        "originalPrice": None,  # Not available in current data
+        "currency": "USD",
+        "imageUrl": activity_image(activity["id"]),
+        "tags": ["Free cancellation"],  # Default tag
+        "memberPrice": False  # Default value
+    }
+
+class CategoryView:
+    """
+    Activities grouped by category, already serialized.
+
+    Built once per catalog: every activity card is encoded to JSON bytes a
+    single time, grouped under its category (in first-seen order), and the
+    full response plus the response for each category filter are joined up
+    front. A request is then a dict lookup returning bytes; a page of one
+    category joins a slice of the stored card bytes.
+    """
+
+    def __init__(self, items: List[dict]):
+        groups: Dict[str, List[bytes]] = {}
+        for activity in items:
+            groups.setdefault(activity["category"], []).append(_dumps(_card(activity)))
+        self.groups = groups
+        self.names = list(groups)
+
+        by_filter: Dict[str, List[str]] = {}
+        for name in self.names:
+            by_filter.setdefault(name.lower(), []).append(name)
+        self.by_filter = by_filter
+        self._full = self._render(self.names)
+        self._filtered = {key: self._render(names) for key, names in by_filter.items()}
+
+    def _block(self, name: str, cards: List[bytes], extra: bytes = b"") -> bytes:
+        return b'{"category":' + _dumps(name) + b',"items":[' + b",".join(cards) + b"]" + extra + b"}"
+
+    def _render(self, names: List[str]) -> bytes:
+        return b"[" + b",".join(self._block(name, self.groups[name]) for name in names) + b"]"
+
+    def render(self, category: Optional[str] = None, limit: Optional[int] = None,
+               cursor: Optional[str] = None) -> Optional[bytes]:
+        """
+        JSON bytes of the category groups, or None when no category matches.
+
+        With `limit` every group is cut to a page and carries "count" and
+        "next_cursor"; a cursor continues the one category it was issued for.
+        """
+        key = category.lower() if category else None
+        names = self.by_filter.get(key) if key else self.names
+        if not names:
+            return None
+        if limit is None and cursor is None:
+            return self._filtered[key] if key else self._full
+
+        start, names = 0, list(names)
+        if cursor:
+            after = decode_cursor(cursor, key)
+            if after.get("c") not in self.groups or (key and after["c"] not in names):
+                raise InvalidParameter("Invalid cursor")
+            names, start = [after["c"]], after["p"] + 1
+        blocks = []
+        for name in names:
+            cards = self.groups[name]
+            end = len(cards) if limit is None else min(start + limit, len(cards))
+            next_cursor = None
+            if end < len(cards) and end > start:
+                next_cursor = encode_cursor({"s": key, "c": name, "k": 0, "p": end - 1})
+            extra = b',"count":' + str(len(cards)).encode() + b',"next_cursor":' + _dumps(next_cursor)
+            blocks.append(self._block(name, cards[start:end], extra))
+        return b"[" + b",".join(blocks) + b"]"
+
+def _codes(values: List[str]) -> Dict[str, int]:
+    codes: Dict[str, int] = {}
+    for value in values:
+        codes.setdefault(value.lower(), len(codes))
+    return codes
+
+class ThingsToDoCatalog:
+    """
+    Activities with the indexes things-to-do search runs on.
+
+    Every available date maps to the sorted rows offering it, and the dates
+    themselves are kept sorted, so one day is a dict lookup and a date range
+    is a bisect over the dates plus a scatter of their postings into one
+    mask. Locations go through a trigram index over the distinct location
+    strings (a few per city) whose postings are then merged. Date and
+    location are intersected first; category, duration, rating and price
+    are checked on that set from NumPy columns.
+    """
+
+    def __init__(self, items: List[dict]):
+        self.items = items
+        n = len(items)
+
+        by_date: Dict[str, List[int]] = {}
+        for row, item in enumerate(items):
+            for day in set(item.get("available_dates") or []):
+                by_date.setdefault(day, []).append(row)
+        self.days = sorted(by_date)
+        self.by_date = {day: np.array(by_date[day], dtype=np.int64) for day in self.days}
+
+        by_location: Dict[str, List[int]] = {}
+        for row, item in enumerate(items):
+            by_location.setdefault(item.get("location") or "", []).append(row)
+        self.location_names = list(by_location)
+        self.location_rows = [np.array(r, dtype=np.int64) for r in by_location.values()]
+        self.locations = TrigramIndex(self.location_names)
+
+        self.category_codes = _codes([i.get("category") or "" for i in items])
+        self.category = np.fromiter(
+            (self.category_codes[(i.get("category") or "").lower()] for i in items), dtype=np.int32, count=n)
+        self.duration_codes = _codes([i.get("duration") or "" for i in items])
+        self.duration = np.fromiter(
+            (self.duration_codes[(i.get("duration") or "").lower()] for i in items), dtype=np.int32, count=n)
+        self.rating = np.fromiter((i.get("rating", np.nan) for i in items), dtype=np.float64, count=n)
+        self.price = np.fromiter((i.get("price", np.nan) for i in items), dtype=np.float64, count=n)
+        self.categories = CategoryView(items)
+
+    @classmethod
+    def from_document(cls, search) -> "ThingsToDoCatalog":
+        return cls(search["things_to_do"])
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def available(self, date_from: str, date_to: Optional[str] = None) -> np.ndarray:
+        """Sorted rows bookable on `date_from`, or on any day from `date_from` to `date_to` inclusive."""
+        if not date_to:
+            return self.by_date.get(date_from, np.empty(0, dtype=np.int64))
+        if date_to < date_from:
+            raise InvalidParameter("date_to must not be before date")
+        days = self.days[bisect_left(self.days, date_from):bisect_right(self.days, date_to)]
+        if len(days) == 1:
+            return self.by_date[days[0]]
+        mask = np.zeros(len(self.items), dtype=bool)
+        for day in days:
+            mask[self.by_date[day]] = True
+        return np.flatnonzero(mask)
+
+    def at_location(self, location: str) -> np.ndarray:
+        """Sorted rows whose location contains `location` (case-insensitive)."""
+        matches = self.locations.search(location)
+        if len(matches) == 1:
+            return self.location_rows[matches[0]]
+        return np.sort(np.concatenate([np.empty(0, dtype=np.int64)] + [self.location_rows[m] for m in matches]))
+
+    def select(self, location: Optional[str], date_from: str, date_to: Optional[str] = None,
+               category: Optional[str] = None, price_min: Optional[float] = None,
+               price_max: Optional[float] = None, duration: Optional[str] = None,
+               min_rating: Optional[float] = None) -> np.ndarray:
+        """Matching rows in file order."""
+        rows = self.available(date_from, date_to)
+        if location and len(rows):
+            here = self.at_location(location)
+            rows = here[np.isin(here, rows, assume_unique=True)] if len(here) < len(rows) \
+                else rows[np.isin(rows, here, assume_unique=True)]
+
+        mask = np.ones(len(rows), dtype=bool)
+        if category:
+            mask &= self.category[rows] == self.category_codes.get(category.lower(), -1)
+        if duration:
+            mask &= self.duration[rows] == self.duration_codes.get(duration.lower(), -1)
+        if min_rating is not None:
+            mask &= self.rating[rows] >= min_rating
+        if price_min is not None:
+            mask &= self.price[rows] >= price_min
+        if price_max is not None:
+            mask &= self.price[rows] <= price_max
+        return rows[mask]
+
+    def take(self, rows: np.ndarray) -> List[dict]:
+        return [self.items[i] for i in rows]
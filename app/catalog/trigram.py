@@ -0,0 +1,67 @@
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+# Marks the start of every indexed text so prefix queries get their own trigrams
+START = "\x02"
+
+def _trigrams(text: str) -> List[str]:
+    return [text[i:i + 3] for i in range(len(text) - 2)]
+
+class TrigramIndex:
+    """
+    Case-insensitive substring index over a list of texts.
+
+    Each text is lower-cased, prefixed with START and split into overlapping
+    trigrams; every trigram maps to the sorted row numbers containing it. A
+    query of three or more characters intersects the posting lists of its own
+    trigrams, shortest first, and only the surviving candidates are checked
+    with a real substring test. Shorter queries take the union of the postings
+    of every trigram that contains them. Either way the work follows the
+    posting-list sizes, not the number of texts.
+    """
+
+    def __init__(self, texts: Sequence[str]):
+        self.texts = [START + (t or "").lower() for t in texts]
+        postings: Dict[str, List[int]] = {}
+        short: List[int] = []
+        for row, text in enumerate(self.texts):
+            if len(text) < 3:
+                short.append(row)
+            for gram in set(_trigrams(text)):
+                postings.setdefault(gram, []).append(row)
+        # Rows are appended in order, so every posting list is already sorted
+        self._postings = {g: np.array(rows, dtype=np.int64) for g, rows in postings.items()}
+        self._short = np.array(short, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def _candidates(self, query: str) -> np.ndarray:
+        if len(query) >= 3:
+            lists = [self._postings.get(g) for g in set(_trigrams(query))]
+            if any(p is None for p in lists):
+                return np.empty(0, dtype=np.int64)
+            lists.sort(key=len)
+            rows = lists[0]
+            for p in lists[1:]:
+                if len(rows) == 0:
+                    break
+                # Probe the longer list by binary search so common trigrams cost O(r log p)
+                hits = np.searchsorted(p, rows)
+                rows = rows[p[np.minimum(hits, len(p) - 1)] == rows]
+            return rows
+        lists = [p for g, p in self._postings.items() if query in g]
+        lists.append(self._short)
+        return np.unique(np.concatenate(lists))
+
+    def search(self, query: str, prefix: bool = False) -> np.ndarray:
+        """Sorted rows whose text contains `query` (or starts with it, if `prefix`)."""
+        query = query.lower()
+        if not query:
+            return np.arange(len(self.texts))
+        if prefix:
+            query = START + query
+        rows = self._candidates(query)
+        # Trigrams only prove the pieces are present; confirm the whole string
+        return np.array([r for r in rows if query in self.texts[r]], dtype=np.int64)
@@ -0,0 +1,183 @@
+import functools
+import inspect
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from app.core.config import settings
+
+class SearchCache:
+    """
+    LRU + TTL cache for search results.
+
+    Memory is bounded by entry count and by the total number of result items
+    held (a list of 5,000 itineraries weighs far more than an empty page).
+    Least recently used entries are evicted first; expired entries are dropped
+    when they are next looked up. Hit/miss counters are kept per namespace.
+
+    Every invalidation bumps the namespace's generation. A caller reads the
+    generation before computing a result and hands it to `put`, which drops
+    the result if an invalidation happened in between, so a search that
+    started on the old catalog cannot repopulate the cache after a reload.
+    """
+
+    def __init__(self, max_entries: int, max_items: int, ttl_seconds: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple, Tuple[float, int, Any]]" = OrderedDict()
+        self._items = 0
+        self._lock = Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0  # bumped by invalidating every namespace at once
+        self._evictions = 0
+        self._expirations = 0
+
+    def _count(self, namespace: str, name: str) -> None:
+        counters = self._counters.setdefault(namespace, {"hits": 0, "misses": 0})
+        counters[name] += 1
+
+    def _drop(self, key: Tuple) -> None:
+        _, weight, _ = self._entries.pop(key)
+        self._items -= weight
+
+    def get(self, key: Tuple) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                self._drop(key)
+                self._expirations += 1
+                entry = None
+            if entry is None:
+                self._count(key[0], "misses")
+                return False, None
+            self._entries.move_to_end(key)
+            self._count(key[0], "hits")
+            return True, entry[2]
+
+    def generation(self, namespace: str) -> Tuple[int, int]:
+        """Token that changes whenever `namespace` is invalidated; pass it to `put`."""
+        with self._lock:
+            return self._epoch, self._generations.get(namespace, 0)
+
+    def put(self, key: Tuple, value: Any, weight: int = 1, generation: Optional[Tuple[int, int]] = None) -> None:
+        """Store `value`, unless `generation` (read before computing it) is no longer current."""
+        if weight > self.max_items:
+            return
+        with self._lock:
+            if generation is not None and generation != (self._epoch, self._generations.get(key[0], 0)):
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (self._clock() + self.ttl_seconds, weight, value)
+            self._items += weight
+            while len(self._entries) > self.max_entries or self._items > self.max_items:
+                self._drop(next(iter(self._entries)))
+                self._evictions += 1
+
+    def invalidate(self, namespace: Optional[str] = None, match: Optional[Callable[[Tuple], bool]] = None) -> None:
+        """
+        Drop every entry, or only those of one namespace (e.g. after a catalog
+        reload); with `match`, only that namespace's keys it returns True for.
+        """
+        with self._lock:
+            if namespace is None:
+                self._epoch += 1
+            else:
+                self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            for key in [k for k in self._entries
+                        if namespace is None or (k[0] == namespace and (match is None or match(k)))]:
+                self._drop(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            namespaces = {}
+            for namespace, counters in self._counters.items():
+                lookups = counters["hits"] + counters["misses"]
+                namespaces[namespace] = {
+                    **counters,
+                    "hit_rate": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+                }
+            return {
+                "entries": len(self._entries),
+                "items": self._items,
+                "max_entries": self.max_entries,
+                "max_items": self.max_items,
+                "ttl_seconds": self.ttl_seconds,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "namespaces": namespaces,
+            }
+
+search_cache = SearchCache(
+    settings.SEARCH_CACHE_MAX_ENTRIES, settings.SEARCH_CACHE_MAX_ITEMS, settings.SEARCH_CACHE_TTL_SECONDS
+)
+
+def _normalize(value: Any, case: Optional[str], ordered: bool) -> Any:
+    if isinstance(value, str):
+        if case == "upper":
+            return value.upper()
+        if case == "lower":
+            return value.lower()
+        return value
+    if isinstance(value, (list, tuple, set)):
+        values = [_normalize(v, case, ordered) for v in value]
+        # Filters treat these as sets, so [a, b] and [b, a] are the same query
+        return tuple(values) if ordered else tuple(sorted(values, key=repr))
+    return value
+
+def _weight(result: Any) -> int:
+    if isinstance(result, dict) and isinstance(result.get("items"), list):
+        return len(result["items"]) + 1
+    if isinstance(result, list):
+        return len(result) + 1
+    return 1
+
+def cached_search(namespace: str, upper: Iterable[str] = (), lower: Iterable[str] = (),
+                  ordered: Iterable[str] = (), ignore: Iterable[str] = ()):
+    """
+    Serve a search function from `search_cache`, keyed by its normalized arguments.
+
+    `upper`/`lower` name the parameters whose strings are case-insensitive
+    (IATA codes, free-text locations), list parameters are compared as sets
+    unless named in `ordered`, and `ignore` drops parameters that do not
+    affect the result. Error responses are never cached.
+    """
+    upper, lower, ordered, ignore = set(upper), set(lower), set(ordered), set(ignore)
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not settings.SEARCH_CACHE_ENABLED:
+                return fn(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (namespace, fn.__name__) + tuple(
+                (name, _normalize(value, "upper" if name in upper else "lower" if name in lower else None,
+                                  name in ordered))
+                for name, value in bound.arguments.items() if name not in ignore
+            )
+            try:
+                hash(key)
+            except TypeError:
+                return fn(*args, **kwargs)
+
+            hit, result = search_cache.get(key)
+            if hit:
+                return result
+            # Read before computing: a reload finishing meanwhile must not leave this result cached
+            generation = search_cache.generation(namespace)
+            result = fn(*args, **kwargs)
+            if not (isinstance(result, dict) and "error" in result):
+                search_cache.put(key, result, _weight(result), generation)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -27,6 +27,19 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str = ""
     FROM_EMAIL: str = "noreply@expedia-inspired.com"
 
+    # Search Result Cache
+    SEARCH_CACHE_ENABLED: bool = True
+    SEARCH_CACHE_TTL_SECONDS: int = 300
+    SEARCH_CACHE_MAX_ENTRIES: int = 2048
+    SEARCH_CACHE_MAX_ITEMS: int = 500000  # total result items held across entries
+
+    # Cruise detail documents kept parsed in memory (the rest are read from disk per request)
+    CRUISE_DETAILS_CACHE_SIZE: int = 512
+
+    # Data refresh: poll app/data mtimes this often (0 = only on POST /catalog/reload)
+    CATALOG_WATCH_SECONDS: float = 10.0
+    CATALOG_RELOAD_TOKEN: str = ""  # POST /catalog/reload requires it in X-Admin-Token; empty disables the endpoint
+
     class Config:
         env_file = ".env"
 
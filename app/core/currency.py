@@ -0,0 +1,28 @@
+from typing import Iterable, Optional
+
+import numpy as np
+
+# Currency every cross-vertical total (package bundles) is quoted in
+BASE_CURRENCY = "USD"
+
+# Units of each currency per US dollar; a static table, like the one the data generators price with
+USD_RATES = {
+    "USD": 1.0,
+    "EUR": 0.85,
+    "GBP": 0.75,
+    "JPY": 110.0,
+    "AED": 3.67,
+    "SGD": 1.35,
+    "AUD": 1.5,
+    "CAD": 1.35,
+}
+
+def usd_factor(currency: Optional[str]) -> float:
+    """Multiplier taking an amount in `currency` to US dollars; NaN for an unknown currency."""
+    rate = USD_RATES.get(str(currency or BASE_CURRENCY).upper())
+    return 1.0 / rate if rate else np.nan
+
+def to_usd(amounts: np.ndarray, currencies: Iterable[Optional[str]]) -> np.ndarray:
+    """`amounts` converted to US dollars, element by element; NaN where the currency is unknown."""
+    factors = np.fromiter((usd_factor(c) for c in currencies), dtype=np.float64, count=len(amounts))
+    return np.asarray(amounts, dtype=np.float64) * factors
@@ -0,0 +1,7 @@
+class InvalidParameter(ValueError):
+    """
+    A request parameter is malformed or inconsistent with the others.
+
+    Routers turn it into a 400 with its message. Every other exception
+    raised while serving a request (bad data files, bugs) is a server error.
+    """
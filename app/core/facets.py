@@ -0,0 +1,68 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.core.errors import InvalidParameter
+
+# Number of equal-width buckets in the price facet
+PRICE_BUCKETS = 10
+
+def parse_facets(value: Optional[str], allowed: Iterable[str]) -> List[str]:
+    """Split a comma-separated facets= value, rejecting names the endpoint cannot count."""
+    if not value:
+        return []
+    allowed = list(allowed)
+    names = [v.strip() for v in value.split(",") if v.strip()]
+    unknown = [n for n in names if n not in allowed]
+    if unknown:
+        raise InvalidParameter(f"Unknown facet(s) {', '.join(unknown)}; expected any of {', '.join(allowed)}")
+    return list(dict.fromkeys(names))
+
+def disjunctive_counts(masks: Dict[str, np.ndarray], size: int, facets: List[str],
+                       count: Callable[[str, np.ndarray], Any]) -> Dict[str, Any]:
+    """
+    Facet counts where each facet ignores its own filter.
+
+    `masks` holds one boolean mask per active filter, keyed by the facet it
+    belongs to (filters with no facet use any other key). Every facet is
+    counted over the rows passing all the other filters, so selecting
+    "4 stars" still shows how many 3- and 5-star results there are.
+    """
+    out = {}
+    for facet in facets:
+        keep = np.ones(size, dtype=bool)
+        for name, mask in masks.items():
+            if name != facet:
+                keep &= mask
+        out[facet] = count(facet, keep)
+    return out
+
+def value_counts(codes: np.ndarray, labels: List[Any]) -> Dict[str, int]:
+    """Counts per label for integer-coded values (-1 = missing)."""
+    counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+    return {str(label): int(c) for label, c in zip(labels, counts)}
+
+def bit_counts(bits: np.ndarray, labels: List[Any]) -> Dict[str, int]:
+    """Counts per label for multi-valued fields stored as little-endian bitmasks (one row per item)."""
+    if len(bits) == 0:
+        return {str(label): 0 for label in labels}
+    bits = np.ascontiguousarray(bits, dtype=bits.dtype.newbyteorder("<"))
+    as_bytes = bits.view(np.uint8).reshape(len(bits), -1)
+    counts = np.unpackbits(as_bytes, axis=1, bitorder="little").sum(axis=0, dtype=np.int64)
+    return {str(label): int(counts[i]) for i, label in enumerate(labels)}
+
+def price_histogram(prices: np.ndarray, buckets: int = PRICE_BUCKETS) -> dict:
+    """Equal-width histogram over the non-missing prices."""
+    prices = prices[~np.isnan(prices)]
+    if len(prices) == 0:
+        return {"min": None, "max": None, "buckets": []}
+    low, high = float(prices.min()), float(prices.max())
+    counts, edges = np.histogram(prices, bins=buckets if high > low else 1, range=(low, high))
+    return {
+        "min": low,
+        "max": high,
+        "buckets": [
+            {"from": round(float(a), 2), "to": round(float(b), 2), "count": int(c)}
+            for a, b, c in zip(edges[:-1], edges[1:], counts)
+        ],
+    }
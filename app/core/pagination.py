@@ -0,0 +1,62 @@
+import base64
+import heapq
+import json
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from app.core.errors import InvalidParameter
+
+# (key function, reverse) as used by the services' sort tables
+SortSpec = Tuple[Callable[[Any], float], bool]
+
+def encode_cursor(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, sort_by: Optional[str] = None) -> dict:
+    """Decode an opaque cursor, rejecting garbage and cursors issued for a different sort."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise InvalidParameter("Invalid cursor")
+    if not isinstance(payload, dict) or "k" not in payload or "p" not in payload:
+        raise InvalidParameter("Invalid cursor")
+    if payload.get("s") != sort_by:
+        raise InvalidParameter("Cursor was issued for a different sort order")
+    return payload
+
+def top_k(items: Iterable[Any], sort: Optional[SortSpec], sort_by: Optional[str],
+          limit: Optional[int], cursor: Optional[str]) -> Tuple[List[Any], int, Optional[str]]:
+    """
+    Return (page, total, next_cursor) for already-filtered items.
+
+    Items are ranked by (sort key, input position), which is exactly the order a
+    stable sort produces. Only the best `limit` entries past the cursor are kept
+    on a heap, so a page costs O(n log k) instead of a full sort, and the cursor
+    (the last key/position handed out) lets the next page resume from there.
+    """
+    key, reverse = sort if sort else (None, False)
+    after = decode_cursor(cursor, sort_by) if cursor else None
+
+    ranked = []
+    total = 0
+    for position, item in enumerate(items):
+        total += 1
+        k = 0 if key is None else key(item)
+        if reverse:
+            k = -k
+        if after is not None and (k, position) <= (after["k"], after["p"]):
+            continue
+        ranked.append((k, position, item))
+
+    if limit is None:
+        ranked.sort(key=lambda r: (r[0], r[1]))
+        return [item for _, _, item in ranked], total, None
+
+    best = heapq.nsmallest(limit + 1, ranked, key=lambda r: (r[0], r[1]))
+    page = best[:limit]
+    next_cursor = None
+    if len(best) > limit and page:
+        last_k, last_p, _ = page[-1]
+        next_cursor = encode_cursor({"s": sort_by, "k": last_k, "p": last_p})
+    return [item for _, _, item in page], total, next_cursor
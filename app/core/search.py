@@ -0,0 +1,130 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.core.pagination import SortSpec, top_k
+
+# (field name, operator, value); conditions whose value is None (or empty, for
+# the set/text operators) are inactive, like the `if x is not None` chains they replace
+Condition = Tuple[str, str, Any]
+
+# Operators a condition can use -> (prior selectivity, relative cost per item)
+OPERATORS = {
+    "==": (0.1, 1.0),
+    ">=": (0.5, 1.0),
+    "<=": (0.5, 1.0),
+    "in": (0.2, 1.5),        # case-insensitive: field value is one of the given strings
+    "has": (0.3, 1.5),       # list field contains the value
+    "contains": (0.2, 2.0),  # case-insensitive substring of the field
+}
+_TEXT = {"in", "has", "contains"}
+
+# Sample size for measuring selectivity, and the input size from which it is worth it
+SAMPLE_SIZE = 64
+SAMPLE_FROM = 512
+
+class Field(NamedTuple):
+    """Where a filterable value lives in an item: a key path and the default for missing keys."""
+    path: Tuple[str, ...]
+    default: Any = None
+
+def field(*path: str, default: Any = None) -> Field:
+    return Field(tuple(path), default)
+
+def _access(path: Tuple[str, ...], default_name: str) -> str:
+    expr = "item"
+    for key in path[:-1]:
+        expr += f".get({key!r}, _EMPTY)"
+    return expr + f".get({path[-1]!r}, {default_name})"
+
+def _test(op: str, value: str, const: str) -> str:
+    if op == "==":
+        return f"{value} == {const}"
+    if op in (">=", "<="):
+        return f"{value} is not None and {value} {op} {const}"
+    if op == "in":
+        return f"{value}.lower() in {const}"
+    if op == "has":
+        return f"{const} in {value}"
+    return f"{const} in {value}.lower()"
+
+@lru_cache(maxsize=256)
+def _factory(shape: Tuple[Tuple[Tuple[str, ...], str], ...]) -> Callable[..., Callable[[Any], bool]]:
+    """
+    Build (once per query shape) a function that binds constants into a fused predicate.
+
+    The generated predicate reads each field and tests it in sequence,
+    returning at the first failure; field paths come from the vertical's
+    declarations and every query value is passed in as an argument, never
+    formatted into the source.
+    """
+    args = [f"c{i}" for i in range(len(shape))] + [f"d{i}" for i in range(len(shape))]
+    lines = [f"def make({', '.join(args)}):", "    def predicate(item):"]
+    for i, (path, op) in enumerate(shape):
+        lines.append(f"        v = {_access(path, f'd{i}')}")
+        lines.append(f"        if not ({_test(op, 'v', f'c{i}')}):")
+        lines.append("            return False")
+    lines += ["        return True", "    return predicate"]
+    namespace = {"_EMPTY": {}}
+    exec(compile("\n".join(lines), "<search predicate>", "exec"), namespace)
+    return namespace["make"]
+
+class SearchSpec:
+    """
+    A vertical's searchable fields and sort keys.
+
+    `predicate` turns a list of conditions into one compiled function that
+    checks them all for an item in a single call, so a search is one pass
+    over the data with no intermediate lists. Conditions are ordered by
+    estimated cost / (1 - selectivity): on large inputs the selectivity is
+    measured on a strided sample, otherwise the operator's prior is used,
+    so the filters most likely to reject an item run first.
+    """
+
+    def __init__(self, fields: Dict[str, Field], sorts: Dict[str, SortSpec]):
+        self.fields = fields
+        self.sorts = sorts
+
+    def _active(self, conditions: Iterable[Condition]) -> List[Tuple[Field, str, Any]]:
+        active = []
+        for name, op, value in conditions:
+            if op not in OPERATORS:
+                raise ValueError(f"Unknown search operator '{op}'")
+            if value is None or (op in _TEXT and not value):
+                continue
+            if op == "in":
+                value = frozenset(str(v).lower() for v in value)
+            elif op == "contains":
+                value = str(value).lower()
+            active.append((self.fields[name], op, value))
+        return active
+
+    @staticmethod
+    def _build(active: List[Tuple[Field, str, Any]]) -> Callable[[Any], bool]:
+        make = _factory(tuple((f.path, op) for f, op, _ in active))
+        return make(*[value for _, _, value in active], *[f.default for f, _, _ in active])
+
+    def predicate(self, conditions: Iterable[Condition],
+                  sample: Optional[Sequence[dict]] = None) -> Optional[Callable[[Any], bool]]:
+        """The fused predicate for `conditions`, or None when none of them is active."""
+        active = self._active(conditions)
+        if not active:
+            return None
+        if len(active) > 1:
+            if sample is not None and len(sample) >= SAMPLE_FROM:
+                probe = sample[::len(sample) // SAMPLE_SIZE][:SAMPLE_SIZE]
+                selectivity = [sum(map(self._build([c]), probe)) / len(probe) for c in active]
+            else:
+                selectivity = [OPERATORS[op][0] for _, op, _ in active]
+            rank = [OPERATORS[op][1] / max(1.0 - s, 1e-3) for (_, op, _), s in zip(active, selectivity)]
+            active = [c for _, _, c in sorted(zip(rank, range(len(active)), active), key=lambda r: r[:2])]
+        return self._build(active)
+
+    def filter(self, items: Sequence[dict], conditions: Iterable[Condition]) -> Iterable[dict]:
+        """Items matching every condition, lazily and in input order."""
+        predicate = self.predicate(conditions, items)
+        return iter(items) if predicate is None else filter(predicate, items)
+
+    def search(self, items: Sequence[dict], conditions: Iterable[Condition], sort_by: Optional[str],
+               limit: Optional[int] = None, cursor: Optional[str] = None) -> Tuple[List[dict], int, Optional[str]]:
+        """(page, total matches, next cursor): one filtering pass feeding the top-k ranking."""
+        return top_k(self.filter(items, conditions), self.sorts.get(sort_by), sort_by, limit, cursor)
@@ -0,0 +1,32 @@
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from fastapi.responses import StreamingResponse
+
+NDJSON = "application/x-ndjson"
+
+def wants_ndjson(accept: Optional[str]) -> bool:
+    """True when the Accept header asks for newline-delimited JSON."""
+    if not accept:
+        return False
+    return any(part.split(";")[0].strip().lower() == NDJSON for part in accept.split(","))
+
+def ndjson_lines(items: Iterable[Any]) -> Iterator[bytes]:
+    """Serialize one item per line, as the items are produced."""
+    for item in items:
+        yield json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+def ndjson_response(items: Iterable[Any], total: Optional[int] = None,
+                    next_cursor: Optional[str] = None) -> StreamingResponse:
+    """
+    Stream items as NDJSON.
+
+    Counts and cursors have no place in a line-per-item body, so they travel
+    in X-Total-Count / X-Next-Cursor headers when they are known up front.
+    """
+    headers: Dict[str, str] = {}
+    if total is not None:
+        headers["X-Total-Count"] = str(total)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return StreamingResponse(ndjson_lines(items), media_type=NDJSON, headers=headers)
@@ -3,14 +3,21 @@
 # and recreates it with the latest schema and seed data. This ensures all new fields (like 'csc' in PaymentMethod)
 # are present and prevents crashes due to missing columns or stale data.
 import os
+import secrets
 
-from fastapi import FastAPI
+from typing import Optional
+
+from fastapi import FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import stays, flights, cars, activities, trips, checkout, auth, packages, meta_ui, cruises, things_to_do, bookings
 from app.db.database import Base, engine
 from app.db.migrations import ensure_sqlite_columns
 from app.core.config import settings, print_startup_config
 from app.seed import seed_data  # move seeding into separate file ideally
+from app.catalog.store import catalog_store
+from app.core.cache import search_cache
+from app.db.database import SessionLocal
+from app.services.bookings_service import restore_car_reservations
 
 app = FastAPI(title=settings.APP_NAME, version=settings.VERSION)
 # Delete the database file before any DB operations
@@ -64,8 +71,44 @@ async def root():
 async def health():
     return {"status": "healthy"}
 
+# Search cache counters, for sizing SEARCH_CACHE_* settings
+@app.get("/cache/stats")
+async def cache_stats():
+    return search_cache.stats()
+
+# Loaded datasets, last refresh and any file that failed to load
+@app.get("/catalog/status")
+async def catalog_status():
+    return catalog_store.status()
+
+# Re-read changed (or with force, all) data files in the background and swap them in
+@app.post("/catalog/reload")
+def catalog_reload(
+    force: bool = Query(False, description="Rebuild every dataset, not only those whose files changed"),
+    wait: bool = Query(False, description="Respond once the rebuild has finished"),
+    x_admin_token: Optional[str] = Header(None)
+):
+    # Fails closed: without a configured token the endpoint is disabled
+    if not settings.CATALOG_RELOAD_TOKEN:
+        raise HTTPException(status_code=403, detail="Catalog reload is disabled; set CATALOG_RELOAD_TOKEN")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.CATALOG_RELOAD_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    job = catalog_store.reload(force)
+    if not wait:
+        return {"scheduled": True}
+    return {"reloaded": job.result(), **catalog_store.status()}
+
 # Startup tasks
 @app.on_event("startup")
 def startup_event():
     seed_data()
+    # Parse every data file and build the search indexes once, not per request
+    catalog_store.load()
+    with SessionLocal() as db:
+        restore_car_reservations(db)  # rental windows of stored car bookings
+    catalog_store.watch(settings.CATALOG_WATCH_SECONDS)
     print("✅ Startup tasks complete")
+
+@app.on_event("shutdown")
+def shutdown_event():
+    catalog_store.stop()
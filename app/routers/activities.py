@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
 from typing import Optional, List
+from app.catalog.store import DatasetUnavailable
+from app.core.errors import InvalidParameter
 from app.services import activities_service
 
 router = APIRouter(prefix="/activities", tags=["Activities"])
@@ -16,12 +18,22 @@ async def search_activities(
     rating_min: Optional[float] = Query(None),
 
     # Sorting
-    sort_by: Optional[str] = Query(None, description="price_asc|price_desc|rating|popularity")
+    sort_by: Optional[str] = Query(None, description="price_asc|price_desc|rating|popularity"),
+
+    # Paging
+    limit: Optional[int] = Query(None, ge=1, description="Page size; omit to return every match"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
 ):
-    return activities_service.search_activities(
-        location, date, category, price_min, price_max, rating_min, sort_by
-    )
+    try:
+        return activities_service.search_activities(
+            location, date, category, price_min, price_max, rating_min, sort_by, limit, cursor
+        )
+    except InvalidParameter as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/details/{activity_id}")
 async def activity_details(activity_id: int):
-    return activities_service.get_activity_details(activity_id)
+    try:
+        return activities_service.get_activity_details(activity_id)
+    except DatasetUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
@@ -1,6 +1,9 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from app.catalog.rentals import RentalUnavailable
+from app.catalog.store import DatasetUnavailable
+from app.core.errors import InvalidParameter
 from app.db.database import get_db
 from app.db import schemas
 from app.services import bookings_service
@@ -24,8 +27,20 @@ def create_booking(booking: schemas.BookingCreate, db: Session = Depends(get_db)
         "price": 299.99,
         "session_id": "guest-12345-abcde"  // Frontend generates this
     }
+
+    Car bookings reserve the rental for the offer's pickup/dropoff times, or
+    for "pickup_datetime"/"dropoff_datetime" when details is a JSON object
+    carrying them; a window that overlaps an existing booking returns 409,
+    and 503 if the cars could not be loaded to look up the offer's window.
     """
-    return bookings_service.create_booking(db, booking)
+    try:
+        return bookings_service.create_booking(db, booking)
+    except RentalUnavailable as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except InvalidParameter as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except DatasetUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
 @router.get("/list", response_model=List[schemas.BookingResponse])
 def list_bookings(
@@ -1,5 +1,8 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, HTTPException, Query
 from typing import Optional, List
+from app.catalog.store import DatasetUnavailable
+from app.core.errors import InvalidParameter
+from app.core.streaming import ndjson_response, wants_ndjson
 from app.services import cars_service
 
 router = APIRouter(prefix="/cars", tags=["Cars"])
@@ -8,7 +11,7 @@ router = APIRouter(prefix="/cars", tags=["Cars"])
 async def search_cars(
     pickup_location: Optional[str] = Query(None, description="city or airport code (e.g., LAX)"),
     dropoff_location: Optional[str] = Query(None),
-    pickup_datetime: Optional[str] = Query(None, description="YYYY-MM-DDTHH:MM"),
+    pickup_datetime: Optional[str] = Query(None, description="YYYY-MM-DDTHH:MM; with dropoff_datetime, only cars free for the whole window"),
     dropoff_datetime: Optional[str] = Query(None, description="YYYY-MM-DDTHH:MM"),
     airport_hotel_transfer: Optional[bool] = Query(None, description="true if airport↔hotel transfer"),
 
@@ -23,14 +26,32 @@ async def search_cars(
     free_cancellation: Optional[bool] = Query(None),
 
     # Sorting
-    sort_by: Optional[str] = Query(None, description="price_asc|price_desc|rating|popularity")
+    sort_by: Optional[str] = Query(None, description="price_asc|price_desc|rating|popularity"),
+
+    # Paging
+    limit: Optional[int] = Query(None, ge=1, description="Page size; omit to return every match"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    facets: Optional[str] = Query(None, description="Comma-separated car_type,company,transmission,fuel_policy,price; adds counts per value"),
+    accept: Optional[str] = Header(None, description="application/x-ndjson streams one result per line")
 ):
-    return cars_service.search_cars(
-        pickup_location, dropoff_location, pickup_datetime, dropoff_datetime, airport_hotel_transfer,
-        car_type, company, price_min, price_max, seats_min, transmission, fuel_policy, free_cancellation,
-        sort_by
-    )
+    try:
+        if wants_ndjson(accept):
+            return ndjson_response(*cars_service.stream_cars(
+                pickup_location, dropoff_location, pickup_datetime, dropoff_datetime, airport_hotel_transfer,
+                car_type, company, price_min, price_max, seats_min, transmission, fuel_policy, free_cancellation,
+                sort_by, limit, cursor
+            ))
+        return cars_service.search_cars(
+            pickup_location, dropoff_location, pickup_datetime, dropoff_datetime, airport_hotel_transfer,
+            car_type, company, price_min, price_max, seats_min, transmission, fuel_policy, free_cancellation,
+            sort_by, limit, cursor, facets
+        )
+    except InvalidParameter as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/details/{rental_id}")
 async def car_details(rental_id: int):
-    return cars_service.get_car_details(rental_id)
+    try:
+        return cars_service.get_car_details(rental_id)
+    except DatasetUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
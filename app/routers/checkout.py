@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from app.services.checkout_service import CheckoutService
 
 router = APIRouter(prefix="/checkout", tags=["Checkout"])
 
 @router.get("/")
 async def get_checkout(service: CheckoutService = Depends()):
-    return service.get_checkout()
+    checkout = service.get_checkout()
+    if checkout is None:
+        raise HTTPException(status_code=404, detail="No checkout data available")
+    return checkout
@@ -1,35 +1,53 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
+from app.catalog.store import DatasetUnavailable
+from app.core.errors import InvalidParameter
 from app.services import cruises_service
 
 router = APIRouter(prefix="/cruises", tags=["Cruises"])
 
 @router.get("/search")
 async def search_cruises(
-    departure_date: str = Query(..., description="YYYY-MM-DD"),
+    departure_date: str = Query(..., description="YYYY-MM-DD; earliest departure"),
+    departure_date_to: Optional[str] = Query(None, description="YYYY-MM-DD; latest departure (inclusive)"),
     cruise_line: Optional[str] = Query(None, description="e.g., Royal Caribbean, Carnival"),
     nights: Optional[int] = Query(None, description="Duration in nights"),
+    nights_min: Optional[int] = Query(None, ge=0, description="Shortest duration in nights"),
+    nights_max: Optional[int] = Query(None, ge=0, description="Longest duration in nights"),
     destination: Optional[str] = Query(None, description="e.g., Caribbean, Mediterranean"),
     departure_port: Optional[str] = Query(None, description="e.g., Miami, Barcelona"),
     price_min: Optional[float] = Query(None, description="Minimum price"),
-    price_max: Optional[float] = Query(None, description="Maximum price")
+    price_max: Optional[float] = Query(None, description="Maximum price"),
+    limit: Optional[int] = Query(None, ge=1, description="Page size; when set the response is {count, items, next_cursor}"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
 ):
     """
     Search for available cruises based on various criteria
     """
-    return cruises_service.search_cruises(
-        departure_date=departure_date,
-        cruise_line=cruise_line,
-        nights=nights,
-        destination=destination,
-        departure_port=departure_port,
-        price_min=price_min,
-        price_max=price_max
-    )
+    try:
+        return cruises_service.search_cruises(
+            departure_date=departure_date,
+            cruise_line=cruise_line,
+            nights=nights,
+            destination=destination,
+            departure_port=departure_port,
+            price_min=price_min,
+            price_max=price_max,
+            departure_date_to=departure_date_to,
+            nights_min=nights_min,
+            nights_max=nights_max,
+            limit=limit,
+            cursor=cursor
+        )
+    except InvalidParameter as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{cruise_id}")
 async def get_cruise_details(cruise_id: str):
     """
     Get detailed information about a specific cruise
     """
-    return cruises_service.get_cruise_details(cruise_id)
+    try:
+        return cruises_service.get_cruise_details(cruise_id)
+    except DatasetUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
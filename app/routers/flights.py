@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, HTTPException, Query
 from typing import Optional, List
+from app.catalog.store import DatasetUnavailable
+from app.core.errors import InvalidParameter
+from app.core.streaming import ndjson_response, wants_ndjson
 from app.services import flights_service
 
 router = APIRouter(prefix="/flights", tags=["Flights"])
 
 @router.get("/search/round-trip")
 async def search_round_trip(
-    origin: str = Query(..., description="IATA code, e.g., LHE"),
+    origin: str = Query(..., description="IATA or metro code, e.g., LHE or NYC"),
     destination: str = Query(..., description="IATA code, e.g., LAX"),
     depart: str = Query(..., description="YYYY-MM-DD"),
     returnd: str = Query(..., description="YYYY-MM-DD"),
@@ -20,12 +23,30 @@ async def search_round_trip(
     price_max: Optional[float] = Query(None),
 
     
-    sort_by: Optional[str] = Query(None, description="price_asc|price_desc|duration|departure_time")
+    sort_by: Optional[str] = Query(None, description="price_asc|price_desc|duration|departure_time"),
+
+    limit: Optional[int] = Query(None, ge=1, description="Page size; omit to return every match"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    expand_nearby: bool = Query(False, description="Also search metro/city siblings and airports within radius_km"),
+    radius_km: Optional[float] = Query(None, gt=0, le=500, description="Nearby radius in km (default 100)"),
+    facets: Optional[str] = Query(None, description="Comma-separated airline,stops,seat_class,price; adds counts per value"),
+    accept: Optional[str] = Header(None, description="application/x-ndjson streams one result per line")
 ):
-    return flights_service.search_round_trip(
-        origin, destination, depart, returnd, passengers, seat_class,
-        stops, airline, price_min, price_max, sort_by
-    )
+    try:
+        if wants_ndjson(accept):
+            return ndjson_response(*flights_service.stream_round_trip(
+                origin, destination, depart, returnd, seat_class, stops, airline,
+                price_min, price_max, sort_by, limit, cursor, expand_nearby, radius_km
+            ))
+        return flights_service.search_round_trip(
+            origin, destination, depart, returnd, passengers, seat_class,
+            stops, airline, price_min, price_max, sort_by, limit, cursor,
+            expand_nearby, radius_km, facets
+        )
+    except InvalidParameter as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except DatasetUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
 
 @router.get("/search/one-way")
@@ -40,16 +61,37 @@ async def search_one_way(
     airline: Optional[str] = None,
     price_min: Optional[float] = None,
     price_max: Optional[float] = None,
-    sort_by: Optional[str] = None
+    sort_by: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, description="Page size; omit to return every match"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    expand_nearby: bool = Query(False, description="Also search metro/city siblings and airports within radius_km"),
+    radius_km: Optional[float] = Query(None, gt=0, le=500, description="Nearby radius in km (default 100)"),
+    facets: Optional[str] = Query(None, description="Comma-separated airline,stops,seat_class,price; adds counts per value"),
+    accept: Optional[str] = Header(None, description="application/x-ndjson streams one result per line")
 ):
-    return flights_service.search_one_way(
-        origin, destination, depart, passengers, seat_class,
-        stops, airline, price_min, price_max, sort_by
-    )
+    try:
+        if wants_ndjson(accept):
+            return ndjson_response(*flights_service.stream_one_way(
+                origin, destination, depart, seat_class, stops, airline,
+                price_min, price_max, sort_by, limit, cursor, expand_nearby, radius_km
+            ))
+        return flights_service.search_one_way(
+            origin, destination, depart, passengers, seat_class,
+            stops, airline, price_min, price_max, sort_by, limit, cursor,
+            expand_nearby, radius_km, facets
+        )
+    except InvalidParameter as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except DatasetUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
 
 @router.get("/search/multi-city")
 async def search_multi_city(
+    legs: Optional[List[str]] = Query(
+        None, description="ORIGIN-DESTINATION-YYYY-MM-DD, repeated in travel order (e.g. JFK-LAX-2025-09-01)"
+    ),
+    max_results: int = Query(20, ge=1, le=200, description="Number of best combinations to build"),
     passengers: int = Query(1, ge=1),
     seat_class: Optional[str] = None,
 
@@ -57,16 +99,74 @@ async def search_multi_city(
     airline: Optional[str] = None,
     price_min: Optional[float] = None,
     price_max: Optional[float] = None,
-    sort_by: Optional[str] = None
+    sort_by: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, description="Page size; omit to return every match"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
+    try:
+        return flights_service.search_multi_city(
+            passengers, seat_class, stops, airline, price_min, price_max, sort_by, limit, cursor,
+            legs, max_results
+        )
+    except InvalidParameter as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except DatasetUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.get("/search/connections")
+async def search_connections(
+    origin: str = Query(..., description="IATA code, e.g., JFK"),
+    destination: str = Query(..., description="IATA code, e.g., SIN"),
+    depart: str = Query(..., description="YYYY-MM-DD (UTC departure day of the first flight)"),
+    seat_class: Optional[str] = Query(None, description="economy|premium_economy|business|first"),
+    airline: Optional[str] = Query(None, description="Only use flights of this airline"),
+    max_stops: int = Query(2, ge=0, le=4, description="Maximum number of connections"),
+    min_connection_minutes: int = Query(60, ge=0, description="Minimum time between landing and the next departure"),
+    max_layover_minutes: int = Query(1440, ge=0, description="Maximum time between landing and the next departure"),
+    sort_by: Optional[str] = Query(None, description="price_asc|duration"),
+    max_results: int = Query(10, ge=1, le=50, description="Number of itineraries (k shortest paths)")
+):
+    try:
+        return flights_service.search_connections(
+            origin, destination, depart, seat_class, airline, max_stops,
+            min_connection_minutes, max_layover_minutes, sort_by, max_results
+        )
+    except InvalidParameter as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except DatasetUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.get("/calendar")
+async def fare_calendar(
+    origin: str = Query(..., description="IATA code, e.g., JFK"),
+    destination: str = Query(..., description="IATA code, e.g., LAX"),
+    depart_start: str = Query(..., description="First departure date, YYYY-MM-DD"),
+    depart_end: str = Query(..., description="Last departure date, YYYY-MM-DD"),
+    return_start: Optional[str] = Query(None, description="First return date; set a return window for a round-trip grid"),
+    return_end: Optional[str] = Query(None, description="Last return date, YYYY-MM-DD"),
+    seat_class: Optional[str] = Query(None, description="economy|premium_economy|business|first"),
+    stops: Optional[int] = Query(None, description="0,1,2; 2 means 2+"),
+    airline: Optional[str] = Query(None, description="Airline code like AA, QR")
 ):
-    return flights_service.search_multi_city(
-        passengers, seat_class, stops, airline, price_min, price_max, sort_by
-    )
+    try:
+        return flights_service.get_fare_calendar(
+            origin, destination, depart_start, depart_end, return_start, return_end,
+            seat_class, stops, airline
+        )
+    except InvalidParameter as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except DatasetUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
 
 @router.get("/details/{flight_id}")
 async def flight_details(flight_id: str):
-    return flights_service.get_flight_details(flight_id)
+    try:
+        return flights_service.get_flight_details(flight_id)
+    except DatasetUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
 @router.get("/status/{flight_number}")
 async def flight_status(flight_number: str):
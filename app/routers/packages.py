@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
 from typing import Optional, List
+from app.catalog.store import DatasetUnavailable
+from app.core.errors import InvalidParameter
 from app.services import packages_service
 
 router = APIRouter(prefix="/packages", tags=["Packages"])
@@ -17,12 +19,49 @@ async def search_packages(
     rating_min: Optional[float] = Query(None),
 
     # Sorting
-    sort_by: Optional[str] = Query(None, description="price_asc|price_desc|rating|popularity")
+    sort_by: Optional[str] = Query(None, description="price_asc|price_desc|rating|popularity"),
+
+    # Paging
+    limit: Optional[int] = Query(None, ge=1, description="Page size; omit to return every match"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
 ):
-    return packages_service.search_packages(
-        destination, start_date, end_date, package_type, price_min, price_max, rating_min, sort_by
-    )
+    try:
+        return packages_service.search_packages(
+            destination, start_date, end_date, package_type, price_min, price_max, rating_min, sort_by, limit, cursor
+        )
+    except InvalidParameter as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/details/{package_id}")
 async def package_details(package_id: int):
-    return packages_service.get_package_details(package_id)
+    try:
+        return packages_service.get_package_details(package_id)
+    except DatasetUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+@router.get("/bundles")
+async def build_packages(
+    origin: str = Query(..., description="Departure airport or metro code"),
+    destination: str = Query(..., description="Destination city (e.g. Paris, France) or airport code"),
+    start_date: str = Query(..., description="YYYY-MM-DD outbound flight and check-in"),
+    end_date: str = Query(..., description="YYYY-MM-DD return flight and check-out"),
+    include_car: bool = Query(False, description="Add a rental car picked up and returned at the destination"),
+
+    # Filters
+    price_max: Optional[float] = Query(None, description="Budget for the whole bundle"),
+    stay_rating_min: Optional[float] = Query(None),
+    stars: Optional[int] = Query(None),
+    car_rating_min: Optional[float] = Query(None),
+    seat_class: Optional[str] = Query(None, description="economy|premium_economy|business|first"),
+
+    # Paging (cheapest first)
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
+    try:
+        return packages_service.build_packages(
+            origin, destination, start_date, end_date, include_car, price_max, stay_rating_min, stars,
+            car_rating_min, seat_class, limit, cursor
+        )
+    except InvalidParameter as e:
+        raise HTTPException(status_code=400, detail=str(e))
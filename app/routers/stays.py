@@ -1,5 +1,8 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, HTTPException, Query
 from typing import Optional, List
+from app.catalog.store import DatasetUnavailable
+from app.core.errors import InvalidParameter
+from app.core.streaming import ndjson_response, wants_ndjson
 from app.services import stays_service
 
 router = APIRouter(prefix="/stays", tags=["Stays"])
@@ -12,22 +15,70 @@ async def search_stays(
     rating: Optional[float] = Query(None),
     stars: Optional[int] = Query(None),
     amenities: Optional[List[str]] = Query(None),
-    sort_by: Optional[str] = Query(None)
+    sort_by: Optional[str] = Query(None, description="price_asc|price_desc|rating|popularity|distance"),
+    limit: Optional[int] = Query(None, ge=1, description="Page size; when set the response is {count, items, next_cursor}"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    lat: Optional[float] = Query(None, ge=-90, le=90, description="Point latitude for radius search / distance sort"),
+    lng: Optional[float] = Query(None, ge=-180, le=180, description="Point longitude"),
+    radius_km: Optional[float] = Query(None, gt=0, le=20000, description="Only stays within this distance of lat/lng"),
+    bbox: Optional[str] = Query(None, description="Map bounds: south,west,north,east"),
+    check_in: Optional[str] = Query(None, description="YYYY-MM-DD; only stays bookable for every night until check_out"),
+    check_out: Optional[str] = Query(None, description="YYYY-MM-DD"),
+    rooms: int = Query(1, ge=1, le=9, description="Rooms of one type needed for the whole stay"),
+    facets: Optional[str] = Query(None, description="Comma-separated stars,amenities,price; adds counts per value to a {count, items, next_cursor, facets} response"),
+    accept: Optional[str] = Header(None, description="application/x-ndjson streams one result per line")
 ):
-    return stays_service.search_stays(location, price_min, price_max, rating, stars, amenities, sort_by)
+    try:
+        if wants_ndjson(accept):
+            return ndjson_response(*stays_service.stream_stays(
+                location, price_min, price_max, rating, stars, amenities, sort_by, limit, cursor,
+                lat, lng, radius_km, bbox, check_in, check_out, rooms
+            ))
+        return stays_service.search_stays(
+            location, price_min, price_max, rating, stars, amenities, sort_by, limit, cursor,
+            lat, lng, radius_km, bbox, check_in, check_out, rooms, facets
+        )
+    except InvalidParameter as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/locations/suggest")
+async def suggest_locations(
+    q: str = Query(..., min_length=1, description="Start of a stay location, e.g. 'par' for Paris"),
+    limit: int = Query(10, ge=1, le=50)
+):
+    return stays_service.suggest_locations(q, limit)
 
 @router.get("/details/{stay_id}")
 async def stay_details(stay_id: str):
-    return stays_service.get_stay_details(stay_id)
+    try:
+        return stays_service.get_stay_details(stay_id)
+    except DatasetUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
 @router.get("/reviews/{stay_id}")
-async def stay_reviews(stay_id: str):
-    return stays_service.get_stay_reviews(stay_id)
+async def stay_reviews(
+    stay_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Page size (default 20 when paging)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    sort: Optional[str] = Query(None, description="newest|oldest|rating_desc|rating_asc|helpful"),
+    aggregates_only: bool = Query(False, description="Only the review count, average rating and histogram")
+):
+    try:
+        return stays_service.get_stay_reviews(stay_id, limit, cursor, sort, aggregates_only)
+    except InvalidParameter as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/nearby/{stay_id}")
 async def nearby_places(stay_id: str):
     return stays_service.get_nearby_places(stay_id)
 
 @router.get("/availability/{stay_id}")
-async def stay_availability(stay_id: str):
-    return stays_service.get_stay_availability(stay_id)
+async def stay_availability(
+    stay_id: str,
+    check_in: Optional[str] = Query(None, description="YYYY-MM-DD; with check_out, rooms free for the whole stay"),
+    check_out: Optional[str] = Query(None, description="YYYY-MM-DD")
+):
+    try:
+        return stays_service.get_stay_availability(stay_id, check_in, check_out)
+    except InvalidParameter as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Query, Path, HTTPException
+from fastapi import APIRouter, Query, Path, HTTPException, Response
 from typing import Optional, List
+from app.catalog.store import DatasetUnavailable
+from app.core.errors import InvalidParameter
 from app.services import things_to_do_service
 
 router = APIRouter(prefix="/things-to-do", tags=["Things To Do"])
@@ -19,6 +21,7 @@ router = APIRouter(prefix="/things-to-do", tags=["Things To Do"])
     **Example Usage:**
     - Search for theme parks in Los Angeles: `/search?location=Los Angeles&date=2025-08-15&category=Theme Parks`
     - Find free activities: `/search?location=New York&date=2025-08-15&price_max=0`
+    - Anything open over a long weekend: `/search?location=Paris&date=2025-08-15&date_to=2025-08-18`
     - High-rated tours: `/search?location=Paris&date=2025-08-15&category=Tours&min_rating=4.5`
     """,
     response_description="List of available activities matching the search criteria",
@@ -64,6 +67,12 @@ async def search_things_to_do(
         example="2025-08-15",
         regex=r"^\d{4}-\d{2}-\d{2}$"
     ),
+    date_to: Optional[str] = Query(
+        None,
+        description="End of a date range (YYYY-MM-DD, inclusive); matches activities available on any day from date to date_to",
+        example="2025-08-18",
+        regex=r"^\d{4}-\d{2}-\d{2}$"
+    ),
     category: Optional[str] = Query(
         None, 
         description="Filter by activity category",
@@ -102,6 +111,7 @@ async def search_things_to_do(
     **Required Parameters:**
     - `location`: The city, state, or area where you want to find activities
     - `date`: The date you want to check availability (YYYY-MM-DD format)
+    - `date_to` (optional): With `date`, find activities available on any day in that range
     
     **Optional Filters:**
     - `category`: Filter by specific activity type (e.g., Theme Parks, Museums)
@@ -126,6 +136,7 @@ async def search_things_to_do(
         results = things_to_do_service.search_things_to_do(
             location=location,
             date=date,
+            date_to=date_to,
             category=category,
             duration=duration,
             min_rating=min_rating,
@@ -133,12 +144,6 @@ async def search_things_to_do(
             price_max=price_max
         )
         
-        # Add imageUrl to each result
-        for result in results:
-            result["imageUrl"] = things_to_do_service._get_activity_image(
-                result["id"], result["name"], result["category"]
-            )
-        
         if not results:
             raise HTTPException(
                 status_code=404, 
@@ -146,7 +151,7 @@ async def search_things_to_do(
             )
         
         return results
-    except ValueError as e:
+    except InvalidParameter as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/by-category",
@@ -206,6 +211,16 @@ async def get_things_to_do_by_category(
         description="Filter by specific category. If not provided, returns all categories.",
         example="Theme Parks",
         enum=["Theme Parks", "Museums", "Tours", "Outdoor Activities", "Cultural Experiences", "Adventure Sports", "Food & Dining", "Entertainment", "Shopping", "Wellness & Spa"]
+    ),
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=100,
+        description="Items per category; each category block then carries count and next_cursor"
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="next_cursor of a category block, to fetch that category's next page"
     )
 ):
     """
@@ -213,6 +228,8 @@ async def get_things_to_do_by_category(
     
     **Parameters:**
     - `category` (optional): Filter by specific category. If not provided, returns all categories.
+    - `limit` (optional): Page size per category
+    - `cursor` (optional): Continue one category from its `next_cursor`
     
     **Response Structure:**
     - Returns an array of category objects
@@ -239,7 +256,8 @@ async def get_things_to_do_by_category(
     - Discover new activity types in a destination
     """
     try:
-        results = things_to_do_service.get_things_to_do_by_category(category)
+        # Served from the pre-serialized category view built at catalog load
+        results = things_to_do_service.get_things_to_do_by_category(category, limit, cursor)
         
         if not results:
             if category:
@@ -253,8 +271,8 @@ async def get_things_to_do_by_category(
                     detail="No activities found."
                 )
         
-        return results
-    except ValueError as e:
+        return Response(content=results, media_type="application/json")
+    except InvalidParameter as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{thing_id}",
@@ -340,6 +358,7 @@ async def get_thing_details(
     **Error Handling:**
     - Returns 404 if the activity ID doesn't exist
     - Returns 400 if the ID format is invalid
+    - Returns 503 if the activity data could not be loaded
     """
     try:
         details = things_to_do_service.get_thing_details(thing_id)
@@ -350,11 +369,8 @@ async def get_thing_details(
                 detail=f"Activity with ID '{thing_id}' not found. Please check the ID and try again."
             )
         
-        # Add imageUrl to the details
-        details["imageUrl"] = things_to_do_service._get_activity_image(
-            details["id"], details["name"], details["category"]
-        )
-        
         return details
-    except ValueError as e:
+    except InvalidParameter as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except DatasetUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
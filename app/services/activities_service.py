@@ -1,44 +1,40 @@
-import json
-from pathlib import Path
 from typing import Optional, List
-
-BASE = Path(__file__).resolve().parents[1] / "data" / "activities"
+from app.catalog.store import current
+from app.core.cache import cached_search
+from app.core.search import SearchSpec, field
 
 def _load(name: str):
-    with open(BASE / name, encoding="utf-8") as f:
-        return json.load(f)
-
-def _apply_filters(items, category, price_min, price_max, rating_min):
-    if category:
-        items = [i for i in items if i.get("category", "").lower() in {c.lower() for c in category}]
-    if price_min is not None:
-        items = [i for i in items if i.get("price", {}).get("amount", 0) >= price_min]
-    if price_max is not None:
-        items = [i for i in items if i.get("price", {}).get("amount", 0) <= price_max]
-    if rating_min is not None:
-        items = [i for i in items if i.get("rating", 0) >= rating_min]
-    return items
+    return current().document(f"activities/{name}")
 
-def _apply_sort(items, sort_by):
-    if sort_by == "price_asc":
-        return sorted(items, key=lambda x: x["price"]["amount"])
-    if sort_by == "price_desc":
-        return sorted(items, key=lambda x: x["price"]["amount"], reverse=True)
-    if sort_by == "rating":
-        return sorted(items, key=lambda x: x.get("rating", 0), reverse=True)
-    if sort_by == "popularity":
-        return sorted(items, key=lambda x: x.get("popularity", 0), reverse=True)
-    return items
+ACTIVITY_SEARCH = SearchSpec(
+    fields={
+        "location": field("location", default=""),
+        "category": field("category", default=""),
+        "price": field("price", "amount", default=0),
+        "rating": field("rating", default=0),
+    },
+    sorts={
+        "price_asc": (lambda x: x["price"]["amount"], False),
+        "price_desc": (lambda x: x["price"]["amount"], True),
+        "rating": (lambda x: x.get("rating", 0), True),
+        "popularity": (lambda x: x.get("popularity", 0), True),
+    },
+)
 
-def search_activities(location, date, category, price_min, price_max, rating_min, sort_by):
-    data = _load("activities_search.json")
-    if location:
-        location_lower = location.lower()
-        data = [d for d in data if location_lower in d["location"].lower()]
-    data = _apply_filters(data, category, price_min, price_max, rating_min)
-    data = _apply_sort(data, sort_by)
-    return {"count": len(data), "items": data}
+@cached_search("activities", lower=("location", "category"))
+def search_activities(location, date, category, price_min, price_max, rating_min, sort_by,
+                      limit=None, cursor=None):
+    conditions = [
+        ("location", "contains", location),
+        ("category", "in", category),
+        ("price", ">=", price_min),
+        ("price", "<=", price_max),
+        ("rating", ">=", rating_min),
+    ]
+    items, total, next_cursor = ACTIVITY_SEARCH.search(
+        _load("activities_search.json"), conditions, sort_by, limit, cursor
+    )
+    return {"count": total, "items": items, "next_cursor": next_cursor}
 
 def get_activity_details(activity_id: int):
-    details = _load("activity_details.json")
-    return next((d for d in details if d["id"] == activity_id), {})
+    return current().detail("activities", activity_id) or {}
@@ -1,7 +1,60 @@
+import json
+from typing import Callable, Optional, Tuple
+
 from sqlalchemy.orm import Session
+from app.catalog.rentals import parse_window, rental_availability
+from app.catalog.store import DatasetUnavailable, current
+from app.core.cache import search_cache
 from app.db import models, schemas
 
+def _car_window(item_id: int, details: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Rental window of a car booking: pickup/dropoff_datetime from the JSON details, else the offer's own."""
+    try:
+        info = json.loads(details) if details else {}
+    except ValueError:
+        info = {}
+    if isinstance(info, dict) and (info.get("pickup_datetime") or info.get("dropoff_datetime")):
+        return parse_window(info.get("pickup_datetime"), info.get("dropoff_datetime"))
+    offer = current().cars.window(item_id)
+    if offer is None or not all(offer):
+        return None
+    return parse_window(*offer)
+
+def _overlapping_searches(start: int, end: int) -> Callable[[Tuple], bool]:
+    """Search cache key test: True for car searches whose pickup/dropoff window overlaps [start, end)."""
+    def match(key: Tuple) -> bool:
+        arguments = dict(key[2:])
+        try:
+            window = parse_window(arguments.get("pickup_datetime"), arguments.get("dropoff_datetime"))
+        except ValueError:
+            return False
+        # Searches without a window do not filter on reservations, so the booking cannot change them
+        return window is not None and window[0] < end and start < window[1]
+    return match
+
+def restore_car_reservations(db: Session):
+    """Rebuild rental availability from the car bookings already stored; skipped if the cars failed to load."""
+    reservations = []
+    for booking in db.query(models.Booking).filter(models.Booking.booking_type == "car").all():
+        try:
+            window = _car_window(booking.item_id, booking.details)
+        except ValueError:
+            continue
+        except DatasetUnavailable as e:
+            print(f"⚠️ Car reservations not restored, the cars dataset is unavailable: {e}")
+            return
+        if window is not None:
+            reservations.append((booking.item_id, *window))
+    rental_availability.load(reservations)
+
 def create_booking(db: Session, booking: schemas.BookingCreate):
+    # Car bookings claim their rental window first; a clash raises RentalUnavailable
+    window = None
+    if booking.booking_type == "car":
+        window = _car_window(booking.item_id, booking.details)
+        if window is not None:
+            rental_availability.reserve(booking.item_id, *window)
+
     # Simple booking creation - frontend manages session_id
     new_booking = models.Booking(
         booking_type=booking.booking_type,
@@ -11,9 +64,17 @@ def create_booking(db: Session, booking: schemas.BookingCreate):
         user_id=booking.user_id,
         session_id=booking.session_id  # Frontend sends this for guest bookings
     )
-    db.add(new_booking)
-    db.commit()
+    try:
+        db.add(new_booking)
+        db.commit()
+    except Exception:
+        if window is not None:
+            rental_availability.release(booking.item_id, *window)
+        raise
     db.refresh(new_booking)
+    if window is not None:
+        # Only cached searches over an overlapping window may still list the rental as free
+        search_cache.invalidate("cars", _overlapping_searches(*window))
     return new_booking
 
 def list_bookings(db: Session, user_id: int = None, session_id: str = None):
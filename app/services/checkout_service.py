@@ -1,13 +1,6 @@
-import json
-from pathlib import Path
-
-BASE_DIR = Path(__file__).resolve().parents[1]
-DATA_DIR = BASE_DIR / "data"
+from typing import Optional
 
 class CheckoutService:
-    def _load(self, name: str):
-        with open(DATA_DIR / f"{name}.json", encoding="utf-8") as f:
-            return json.load(f)
-
-    def get_checkout(self):
-        return self._load("checkout_data")
\ No newline at end of file
+    def get_checkout(self) -> Optional[dict]:
+        # No checkout_data.json ships under app/data, so there is no checkout document to serve
+        return None
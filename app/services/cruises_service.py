@@ -1,54 +1,27 @@
-import json
-from pathlib import Path
 from typing import Optional
-from datetime import datetime
-
-BASE = Path(__file__).resolve().parents[1] / "data" / "cruises"
-
-def _load(name: str):
-    with open(BASE / name, encoding="utf-8") as f:
-        return json.load(f)
-
-def _apply_filters(results, cruise_line: Optional[str], nights: Optional[int],
-                  destination: Optional[str], price_min: Optional[float],
-                  price_max: Optional[float], departure_port: Optional[str]):
-    out = results
-
-    if cruise_line:
-        out = [r for r in out if r["cruise_line"].lower() == cruise_line.lower()]
-    
-    if nights:
-        out = [r for r in out if r["nights"] == nights]
-    
-    if destination:
-        out = [r for r in out if destination.lower() in r["destination"].lower()]
-    
-    if departure_port:
-        out = [r for r in out if departure_port.lower() in r["departure_port"].lower()]
-    
-    if price_min is not None:
-        out = [r for r in out if r["price"] >= price_min]
-    
-    if price_max is not None:
-        out = [r for r in out if r["price"] <= price_max]
-    
-    return out
+from app.catalog.store import current
+from app.core.cache import cached_search
 
+@cached_search("cruises", lower=("cruise_line", "destination", "departure_port"))
 def search_cruises(departure_date: str, cruise_line: Optional[str] = None,
                   nights: Optional[int] = None, destination: Optional[str] = None,
                   price_min: Optional[float] = None, price_max: Optional[float] = None,
-                  departure_port: Optional[str] = None):
-    data = _load("cruises_search.json")
-    results = data["cruises"]
-    
-    # Filter by departure date
-    results = [r for r in results if r["departure_date"] >= departure_date]
-    
-    return _apply_filters(
-        results, cruise_line, nights, destination,
-        price_min, price_max, departure_port
+                  departure_port: Optional[str] = None, departure_date_to: Optional[str] = None,
+                  nights_min: Optional[int] = None, nights_max: Optional[int] = None,
+                  limit: Optional[int] = None, cursor: Optional[str] = None):
+    catalog = current().cruises
+
+    # Date and nights ranges are bisects, line and port are index lookups; results keep file order
+    rows = catalog.select(
+        departure_date, departure_date_to, cruise_line, nights, nights_min, nights_max,
+        destination, departure_port, price_min, price_max
     )
 
+    # Unpaged requests keep the original bare-list response
+    if limit is None and cursor is None:
+        return catalog.take(rows)
+    page, next_cursor = catalog.page(rows, limit, cursor)
+    return {"count": len(rows), "items": catalog.take(page), "next_cursor": next_cursor}
+
 def get_cruise_details(cruise_id: str):
-    data = _load("cruise_details.json")
-    return data["cruise_details"] if data["cruise_details"]["id"] == cruise_id else None
+    return current().cruise_details.get(cruise_id)
@@ -1,126 +1,180 @@
-import json
-from pathlib import Path
 from typing import Optional
 
-BASE = Path(__file__).resolve().parents[1] / "data" / "flights"
+import numpy as np
 
-def _load(name: str):
-    with open(BASE / name, encoding="utf-8") as f:
-        return json.load(f)
-
-def _apply_filters(results, seat_class: Optional[str], stops: Optional[int],
-                   airline: Optional[str], price_min: Optional[float],
-                   price_max: Optional[float]):
-    out = results
-
-    if seat_class:
-        out = [r for r in out if seat_class in r.get("seat_classes", [])]
-
-    if stops is not None:
-        if stops in (0, 1):
-            out = [r for r in out if r.get("stops") == stops]
-        else:
-            out = [r for r in out if r.get("stops", 0) >= 2]
-
-    if airline:
-        out = [r for r in out if r.get("airline", {}).get("code") == airline.upper()]
-
-    if price_min is not None:
-        out = [r for r in out if r.get("price", {}).get("total", 0) >= price_min]
-
-    if price_max is not None:
-        out = [r for r in out if r.get("price", {}).get("total", 0) <= price_max]
-
-    return out
-
-def _apply_sort(results, sort_by: Optional[str]):
-    if not sort_by:
-        return results
-    if sort_by == "price_asc":
-        return sorted(results, key=lambda r: r["price"]["total"])
-    if sort_by == "price_desc":
-        return sorted(results, key=lambda r: r["price"]["total"], reverse=True)
-    if sort_by == "duration":
-        return sorted(results, key=lambda r: r["duration_total_minutes"])
-    if sort_by == "departure_time":
-        return sorted(results, key=lambda r: r["legs"][0]["segments"][0]["depart_utc"])
-    return results
+from app.catalog.airports import METRO_AREAS
+from app.catalog.calendar import parse_date
+from app.catalog.flights import FLIGHT_FACETS
+from app.catalog.multi_city import build_itineraries, parse_legs
+from app.catalog.store import current
+from app.core.cache import cached_search
+from app.core.facets import parse_facets
+from app.core.pagination import top_k
+from app.core.search import SearchSpec, field
 
+def _load(name: str):
+    return current().document(f"flights/{name}")
+
+# The static multi-city sample itineraries are searched as plain dicts
+MULTI_CITY_SEARCH = SearchSpec(
+    fields={
+        "seat_classes": field("seat_classes", default=()),
+        "stops": field("stops"),
+        "airline": field("airline", "code"),
+        "price": field("price", "total", default=0),
+    },
+    sorts={
+        "price_asc": (lambda r: r["price"]["total"], False),
+        "price_desc": (lambda r: r["price"]["total"], True),
+        "duration": (lambda r: r["duration_total_minutes"], False),
+        "departure_time": (lambda r: r["legs"][0]["segments"][0]["depart_utc"], False),
+    },
+)
+
+def _conditions(seat_class: Optional[str], stops: Optional[int], airline: Optional[str],
+                price_min: Optional[float], price_max: Optional[float]):
+    return [
+        ("seat_classes", "has", seat_class),
+        ("stops", "==" if stops in (0, 1) else ">=", None if stops is None else stops if stops in (0, 1) else 2),
+        ("airline", "==", airline.upper() if airline else None),
+        ("price", ">=", price_min),
+        ("price", "<=", price_max),
+    ]
+
+def _airports(snapshot, code, expand_nearby, radius_km):
+    """A single code, or the airports a metro code / nearby search covers."""
+    if not expand_nearby and code.upper() not in METRO_AREAS:
+        return code
+    return snapshot.airports.expand(code, expand_nearby, radius_km)
+
+def _with_airports(result, origins, destinations):
+    if not isinstance(origins, str) or not isinstance(destinations, str):
+        result["airports"] = {
+            "origin": [origins] if isinstance(origins, str) else origins,
+            "destination": [destinations] if isinstance(destinations, str) else destinations,
+        }
+    return result
+
+@cached_search("flights", upper=("origin", "destination", "airline"), ignore=("passengers",))
 def search_round_trip(origin, destination, depart, returnd, passengers, seat_class,
-                      stops, airline, price_min, price_max, sort_by):
-    try:
-        data = _load("round_trip.json")
-
-        # Filter by origin and destination
-        filtered = [
-            r for r in data
-            if r["legs"][0]["segments"][0]["from"]["code"] == origin.upper()
-            and r["legs"][0]["segments"][-1]["to"]["code"] == destination.upper()
-        ]
-
-        # Filter by departure and return dates
-        if depart:
-            filtered = [
-                r for r in filtered
-                if r["legs"][0]["segments"][0]["depart_utc"].startswith(depart)
-            ]
-        
-        if returnd:
-            filtered = [
-                r for r in filtered
-                if r["legs"][1]["segments"][0]["depart_utc"].startswith(returnd)
-            ]
-
-        # Apply additional filters
-        filtered = _apply_filters(filtered, seat_class, stops, airline, price_min, price_max)
-
-        # Apply sorting
-        filtered = _apply_sort(filtered, sort_by)
-        return {"trip_type": "round_trip", "count": len(filtered), "items": filtered}
-
-    except Exception as e:
-        return {"error": str(e), "trip_type": "round_trip", "count": 0, "items": []}
-
+                      stops, airline, price_min, price_max, sort_by, limit=None, cursor=None,
+                      expand_nearby=False, radius_km=None, facets=None):
+    snapshot = current()
+    origins = _airports(snapshot, origin, expand_nearby, radius_km)
+    destinations = _airports(snapshot, destination, expand_nearby, radius_km)
+    # Route/date bucket lookup, then one vectorized pass for every other filter
+    names = parse_facets(facets, FLIGHT_FACETS)
+    index = snapshot.flights.round_trip
+    items, total, next_cursor = index.search(
+        origins, destinations, depart, returnd, seat_class,
+        stops, airline, price_min, price_max, sort_by, limit, cursor
+    )
+    result = {"trip_type": "round_trip", "count": total, "items": items, "next_cursor": next_cursor}
+    if names:
+        result["facets"] = index.facets(
+            origins, destinations, names, depart, returnd, seat_class, stops, airline, price_min, price_max
+        )
+    return _with_airports(result, origins, destinations)
+
+@cached_search("flights", upper=("origin", "destination", "airline"), ignore=("passengers",))
 def search_one_way(origin, destination, depart, passengers, seat_class,
-                   stops, airline, price_min, price_max, sort_by):
-    try:
-        data = _load("one_way.json")
-        
-        # Filter by origin and destination
-        filtered = [
-            r for r in data
-            if r["legs"][0]["segments"][0]["from"]["code"] == origin.upper()
-            and r["legs"][0]["segments"][-1]["to"]["code"] == destination.upper()
-        ]
-        
-        # Filter by departure date
-        if depart:
-            filtered = [
-                r for r in filtered
-                if r["legs"][0]["segments"][0]["depart_utc"].startswith(depart)
-            ]
-        
-        # Apply additional filters
-        filtered = _apply_filters(filtered, seat_class, stops, airline, price_min, price_max)
-        filtered = _apply_sort(filtered, sort_by)
-        return {"trip_type": "one_way", "count": len(filtered), "items": filtered}
-    except Exception as e:
-        return {"error": str(e), "trip_type": "one_way", "count": 0, "items": []}
-
-def search_multi_city(passengers, seat_class, stops, airline, price_min, price_max, sort_by):
-    data = _load("multi_city.json")
-    filtered = _apply_filters(data, seat_class, stops, airline, price_min, price_max)
-    filtered = _apply_sort(filtered, sort_by)
-    return {"trip_type": "multi_city", "count": len(filtered), "items": filtered}
-
+                   stops, airline, price_min, price_max, sort_by, limit=None, cursor=None,
+                   expand_nearby=False, radius_km=None, facets=None):
+    snapshot = current()
+    origins = _airports(snapshot, origin, expand_nearby, radius_km)
+    destinations = _airports(snapshot, destination, expand_nearby, radius_km)
+    # Route/date bucket lookup, then one vectorized pass for every other filter
+    names = parse_facets(facets, FLIGHT_FACETS)
+    index = snapshot.flights.one_way
+    items, total, next_cursor = index.search(
+        origins, destinations, depart, None, seat_class,
+        stops, airline, price_min, price_max, sort_by, limit, cursor
+    )
+    result = {"trip_type": "one_way", "count": total, "items": items, "next_cursor": next_cursor}
+    if names:
+        result["facets"] = index.facets(
+            origins, destinations, names, depart, None, seat_class, stops, airline, price_min, price_max
+        )
+    return _with_airports(result, origins, destinations)
+
+def stream_one_way(origin, destination, depart, seat_class, stops, airline, price_min, price_max,
+                   sort_by, limit=None, cursor=None, expand_nearby=False, radius_km=None):
+    """(generator of itineraries, total, next cursor); only the row order is computed up front."""
+    snapshot = current()
+    index = snapshot.flights.one_way
+    rows, total, next_cursor = index.select(
+        _airports(snapshot, origin, expand_nearby, radius_km), _airports(snapshot, destination, expand_nearby, radius_km),
+        depart, None, seat_class, stops, airline, price_min, price_max, sort_by, limit, cursor
+    )
+    return index.iter_rows(rows), total, next_cursor
+
+def stream_round_trip(origin, destination, depart, returnd, seat_class, stops, airline, price_min,
+                      price_max, sort_by, limit=None, cursor=None, expand_nearby=False, radius_km=None):
+    snapshot = current()
+    index = snapshot.flights.round_trip
+    rows, total, next_cursor = index.select(
+        _airports(snapshot, origin, expand_nearby, radius_km), _airports(snapshot, destination, expand_nearby, radius_km),
+        depart, returnd, seat_class, stops, airline, price_min, price_max, sort_by, limit, cursor
+    )
+    return index.iter_rows(rows), total, next_cursor
+
+@cached_search("flights", upper=("airline", "legs"), ordered=("legs",), ignore=("passengers",))
+def search_multi_city(passengers, seat_class, stops, airline, price_min, price_max, sort_by,
+                      limit=None, cursor=None, legs=None, max_results=20):
+    if legs:
+        # Build itineraries for the requested route from the one-way inventory
+        objective = "duration" if sort_by == "duration" else "price"
+        filtered = build_itineraries(
+            current().flights.one_way, parse_legs(legs), objective, max_results,
+            seat_class, stops, airline, price_min, price_max
+        )
+    else:
+        # No route given: fall back to the static sample itineraries
+        filtered = MULTI_CITY_SEARCH.filter(
+            _load("multi_city.json"), _conditions(seat_class, stops, airline, price_min, price_max)
+        )
+    items, total, next_cursor = top_k(filtered, MULTI_CITY_SEARCH.sorts.get(sort_by), sort_by, limit, cursor)
+    return {"trip_type": "multi_city", "count": total, "items": items, "next_cursor": next_cursor}
+
+
+@cached_search("flights", upper=("origin", "destination", "airline"))
+def search_connections(origin, destination, depart, seat_class=None, airline=None, max_stops=2,
+                       min_connection_minutes=60, max_layover_minutes=1440, sort_by=None, max_results=10):
+    catalog = current().flights
+    index = catalog.one_way
+    allowed = None
+    if seat_class or airline:
+        allowed = np.zeros(len(index), dtype=bool)
+        allowed[index.filter(np.arange(len(index)), seat_class=seat_class, airline=airline)] = True
+
+    objective = "duration" if sort_by == "duration" else "price"
+    paths = catalog.connections.search(
+        origin, destination, depart, max_results, objective, max_stops,
+        min_connection_minutes, max_layover_minutes, allowed
+    )
+    items = [catalog.connections.describe(p) for p in paths]
+    return {"trip_type": "connection", "count": len(items), "items": items}
+
+def get_fare_calendar(origin, destination, depart_start, depart_end, return_start=None, return_end=None,
+                      seat_class=None, stops=None, airline=None):
+    calendar = current().flights.calendar
+    if return_start is None and return_end is None:
+        return calendar.one_way(origin, destination, depart_start, depart_end, seat_class, stops, airline)
+
+    # A half-open return window gets the same length as the departure window
+    span = parse_date(depart_end) - parse_date(depart_start)
+    if return_end is None:
+        return_end = (parse_date(return_start) + span).isoformat()
+    elif return_start is None:
+        return_start = (parse_date(return_end) - span).isoformat()
+    return calendar.round_trip(
+        origin, destination, depart_start, depart_end, return_start, return_end,
+        seat_class, stops, airline
+    )
 
 def get_flight_details(flight_id: str):
-    details = _load("flight_details.json")
-    if not isinstance(details, dict) or "flights" not in details:
-        return {"error": "Invalid flight details format"}
-
-    flights = details["flights"]
-    return next((d for d in flights if d["id"] == flight_id), {"error": "Flight ID not found"})
+    details = current().detail("flights", flight_id)
+    return details if details is not None else {"error": "Flight ID not found"}
 
 def get_flight_status(flight_number: str):
     statuses = _load("flight_status.json")
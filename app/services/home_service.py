@@ -1,13 +1,8 @@
-import json
-from pathlib import Path
-
-BASE_DIR = Path(__file__).resolve().parents[1]
-DATA_DIR = BASE_DIR / "data"
+from app.catalog.store import current
 
 class HomeService:
     def _load(self, name: str):
-        with open(DATA_DIR / f"{name}.json", encoding="utf-8") as f:
-            return json.load(f)
+        return current().document(f"{name}.json")
 
     def get_navbar(self):
         return self._load("home_navbar")
\ No newline at end of file
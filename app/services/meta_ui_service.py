@@ -1,11 +1,7 @@
-import json
-from pathlib import Path
-
-BASE = Path(__file__).resolve().parents[1] / "data" / "meta-ui"
+from app.catalog.store import current
 
 def load_json(filename: str):
-    with open(BASE / filename, encoding="utf-8") as f:
-        return json.load(f)
+    return current().document(f"meta-ui/{filename}")
 
 def get_stays_locations():
     return load_json("stays_locations.json")
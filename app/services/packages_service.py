@@ -1,44 +1,182 @@
-import json
-from pathlib import Path
+from datetime import date
 from typing import Optional, List
 
-BASE = Path(__file__).resolve().parents[1] / "data" / "packages"
+import numpy as np
+
+from app.catalog.airports import METRO_AREAS
+from app.catalog.bundles import cheapest_combinations
+from app.catalog.rentals import parse_window, rental_availability
+from app.catalog.store import Snapshot, current
+from app.core.cache import cached_search
+from app.core.currency import BASE_CURRENCY, to_usd
+from app.core.errors import InvalidParameter
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.search import SearchSpec, field
 
 def _load(name: str):
-    with open(BASE / name, encoding="utf-8") as f:
-        return json.load(f)
-
-def _apply_filters(items, package_type, price_min, price_max, rating_min):
-    if package_type:
-        items = [i for i in items if i.get("package_type", "").lower() in {t.lower() for t in package_type}]
-    if price_min is not None:
-        items = [i for i in items if i.get("price", {}).get("amount", 0) >= price_min]
-    if price_max is not None:
-        items = [i for i in items if i.get("price", {}).get("amount", 0) <= price_max]
-    if rating_min is not None:
-        items = [i for i in items if i.get("rating", 0) >= rating_min]
-    return items
-
-def _apply_sort(items, sort_by):
-    if sort_by == "price_asc":
-        return sorted(items, key=lambda x: x["price"]["amount"])
-    if sort_by == "price_desc":
-        return sorted(items, key=lambda x: x["price"]["amount"], reverse=True)
-    if sort_by == "rating":
-        return sorted(items, key=lambda x: x.get("rating", 0), reverse=True)
-    if sort_by == "popularity":
-        return sorted(items, key=lambda x: x.get("popularity", 0), reverse=True)
-    return items
-
-def search_packages(destination, start_date, end_date, package_type, price_min, price_max, rating_min, sort_by):
-    data = _load("packages_search.json")
-    if destination:
-        dest_lower = destination.lower()
-        data = [d for d in data if dest_lower in d["destination"].lower()]
-    data = _apply_filters(data, package_type, price_min, price_max, rating_min)
-    data = _apply_sort(data, sort_by)
-    return {"count": len(data), "items": data}
+    return current().document(f"packages/{name}")
+
+PACKAGE_SEARCH = SearchSpec(
+    fields={
+        "destination": field("destination", default=""),
+        "package_type": field("package_type", default=""),
+        "price": field("price", "amount", default=0),
+        "rating": field("rating", default=0),
+    },
+    sorts={
+        "price_asc": (lambda x: x["price"]["amount"], False),
+        "price_desc": (lambda x: x["price"]["amount"], True),
+        "rating": (lambda x: x.get("rating", 0), True),
+        "popularity": (lambda x: x.get("popularity", 0), True),
+    },
+)
+
+@cached_search("packages", lower=("destination", "package_type"))
+def search_packages(destination, start_date, end_date, package_type, price_min, price_max, rating_min, sort_by,
+                    limit=None, cursor=None):
+    conditions = [
+        ("destination", "contains", destination),
+        ("package_type", "in", package_type),
+        ("price", ">=", price_min),
+        ("price", "<=", price_max),
+        ("rating", ">=", rating_min),
+    ]
+    items, total, next_cursor = PACKAGE_SEARCH.search(
+        _load("packages_search.json"), conditions, sort_by, limit, cursor
+    )
+    return {"count": total, "items": items, "next_cursor": next_cursor}
+
+def _nights(start_date: str, end_date: str) -> int:
+    try:
+        nights = (date.fromisoformat(end_date) - date.fromisoformat(start_date)).days
+    except (TypeError, ValueError):
+        raise InvalidParameter("start_date and end_date must be YYYY-MM-DD")
+    if nights < 1:
+        raise InvalidParameter("end_date must be after start_date")
+    return nights
+
+def _priced(rows: np.ndarray, prices: np.ndarray):
+    """(rows, prices) without the rows whose price could not be converted to the base currency."""
+    keep = ~np.isnan(prices)
+    return rows[keep], prices[keep]
+
+def _destination_airports(snapshot: Snapshot, destination: str) -> List[str]:
+    """Airport codes for a destination given as a city ("Paris, France") or an airport/metro code."""
+    airports = snapshot.airports
+    code = destination.strip().upper()
+    if code in airports.airports or code in METRO_AREAS:
+        return airports.metro(code)
+    return airports.serving(destination)
+
+def _flight_options(snapshot: Snapshot, origin: str, destination: str, start_date: str, end_date: str,
+                    seat_class: Optional[str]):
+    """(round-trip index, rows out on start_date and back on end_date, their prices in USD)."""
+    index = snapshot.flights.round_trip
+    rows = [
+        index.filter(index.rows(o, d, start_date), seat_class=seat_class, returnd=end_date)
+        for o in snapshot.airports.expand(origin) for d in _destination_airports(snapshot, destination)
+    ]
+    rows = np.concatenate([np.arange(0)] + rows)
+    prices = to_usd(index.price[rows], (index.itineraries[r].get("price", {}).get("currency") for r in rows))
+    return (index, *_priced(rows, prices))
+
+def _stay_options(snapshot: Snapshot, destination: str, start_date: str, end_date: str, nights: int,
+                  stay_rating_min: Optional[float], stars: Optional[int]):
+    """(stays catalog, rows bookable for every night, whole-stay prices in USD)."""
+    catalog = snapshot.stays
+    rows = catalog.filter(catalog.candidates(destination), rating=stay_rating_min, stars=stars,
+                          check_in=start_date, check_out=end_date)
+    prices = to_usd(catalog.price[rows] * nights, (catalog.stays[r].get("currency") for r in rows))
+    return (catalog, *_priced(rows, prices))
+
+def _car_options(snapshot: Snapshot, destination: str, start_date: str, end_date: str, nights: int,
+                 car_rating_min: Optional[float]):
+    """(car catalog, rentals picked up and returned in the destination city, free for the trip, prices in USD)."""
+    catalog = snapshot.cars
+    city = destination.split(",")[0].strip()
+    rows = catalog.candidates(city, city)
+    rows = rows[catalog.available(rows, parse_window(start_date, end_date), rental_availability)]
+    cars = catalog.take(rows)
+    if car_rating_min is not None:
+        keep = np.fromiter(((c.get("rating") or 0) >= car_rating_min for c in cars), dtype=bool, count=len(cars))
+        rows, cars = rows[keep], [c for c, k in zip(cars, keep) if k]
+    # Offers quote a per-day rate where they have one; otherwise their total stands for the trip
+    prices = np.fromiter(
+        (c["price"]["per_day"] * nights if c.get("price", {}).get("per_day") else c.get("price", {}).get("total", 0)
+         for c in cars), dtype=np.float64, count=len(cars))
+    prices = to_usd(prices, (c.get("price", {}).get("currency") for c in cars))
+    return (catalog, *_priced(rows, prices))
+
+def build_packages(origin: str, destination: str, start_date: str, end_date: str, include_car: bool = False,
+                   price_max: Optional[float] = None, stay_rating_min: Optional[float] = None,
+                   stars: Optional[int] = None, car_rating_min: Optional[float] = None,
+                   seat_class: Optional[str] = None, limit: int = 20, cursor: Optional[str] = None):
+    """
+    Flight + stay (+ car) bundles for a trip, cheapest first.
+
+    Each component is narrowed on its own catalog (route and dates, stay
+    availability and ratings, car location and reservations) and priced for
+    the whole trip in USD, converted from each offer's own currency; offers
+    in a currency without a rate are left out, and `price_max` applies to
+    the converted total. Bundles are then enumerated best-first by total
+    price with `cheapest_combinations`, so only the combinations handed out
+    (plus a small frontier) are ever looked at. The cursor holds the rank
+    of the last bundle returned.
+    """
+    nights = _nights(start_date, end_date)
+    skip = decode_cursor(cursor)["p"] + 1 if cursor else 0
+
+    # Every component comes from the same catalog snapshot, even if a reload lands mid-request
+    snapshot = current()
+    flights, flight_rows, flight_prices = _flight_options(snapshot, origin, destination, start_date, end_date,
+                                                          seat_class)
+    stays, stay_rows, stay_prices = _stay_options(snapshot, destination, start_date, end_date, nights,
+                                                  stay_rating_min, stars)
+    components = [(flight_rows, flight_prices), (stay_rows, stay_prices)]
+    options = {"flights": len(flight_rows), "stays": len(stay_rows)}
+    if include_car:
+        cars, car_rows, car_prices = _car_options(snapshot, destination, start_date, end_date, nights,
+                                                  car_rating_min)
+        components.append((car_rows, car_prices))
+        options["cars"] = len(car_rows)
+
+    items, next_cursor = [], None
+    combinations = cheapest_combinations([prices for _, prices in components], price_max)
+    for rank, (total, picks) in enumerate(combinations):
+        if rank < skip:
+            continue
+        if len(items) == limit:
+            last = skip + limit - 1
+            next_cursor = encode_cursor({"s": None, "k": items[-1]["price"]["amount"], "p": last})
+            break
+        (flight_row, flight_price), (stay_row, stay_price) = [
+            (int(rows[i]), round(float(prices[i]), 2)) for (rows, prices), i in zip(components[:2], picks)]
+        stay = stays.stays[stay_row]
+        bundle = {
+            "id": "|".join(str(x) for x in (flights.itineraries[flight_row]["id"], stay.get("id"))),
+            "destination": destination,
+            "start_date": start_date,
+            "end_date": end_date,
+            "nights": nights,
+            "price": {
+                "amount": round(total, 2),
+                "currency": BASE_CURRENCY,
+                "flight": flight_price,
+                "stay": stay_price,
+            },
+            "rating": stay.get("rating"),
+            "flight": flights.itineraries[flight_row],
+            "stay": stay,
+        }
+        if include_car:
+            car_rows, car_prices = components[2]
+            car = cars.cars[int(car_rows[picks[2]])]
+            bundle["id"] += f"|{car.get('id')}"
+            bundle["price"]["car"] = round(float(car_prices[picks[2]]), 2)
+            bundle["car"] = car
+        items.append(bundle)
+
+    return {"items": items, "next_cursor": next_cursor, "options": options}
 
 def get_package_details(package_id: int):
-    details = _load("package_details.json")
-    return next((d for d in details if d["id"] == package_id), {})
+    return current().detail("packages", package_id) or {}
@@ -1,59 +1,132 @@
-import json
-from pathlib import Path
-from typing import Optional, List
-
-BASE = Path(__file__).resolve().parents[1] / "data" / "stays"
+from typing import List, Optional
+from app.catalog.geo import parse_bbox
+from app.catalog.stays import STAY_FACETS
+from app.catalog.store import current
+from app.core.cache import cached_search
+from app.core.errors import InvalidParameter
+from app.core.facets import parse_facets
+from app.core.pagination import top_k
 
 def load_json(filename: str):
-    path = BASE / filename
-    with open(path, encoding="utf-8") as f:
-        return json.load(f)
+    return current().document(f"stays/{filename}")
+
+_SORTS = {
+    "price_asc": (lambda x: x["price"], False),
+    "price_desc": (lambda x: x["price"], True),
+    "rating": (lambda x: x["rating"], True),
+    "popularity": (lambda x: x["reviews_count"], True),
+    "distance": (lambda x: x["distance_km"], False),
+}
+
+def _candidates(location: Optional[str], sort_by: Optional[str], lat: Optional[float], lng: Optional[float],
+                radius_km: Optional[float], bbox: Optional[str]):
+    if (lat is None) != (lng is None):
+        raise InvalidParameter("lat and lng must be given together")
+    near = None if lat is None else (lat, lng)
+    if radius_km is not None and near is None:
+        raise InvalidParameter("radius_km needs lat and lng")
+    if sort_by == "distance" and near is None:
+        raise InvalidParameter("sort_by=distance needs lat and lng")
+
+    catalog = current().stays
+    # Text and map constraints go through their indexes; every other filter is a vectorized pass over these rows
+    return catalog, catalog.candidates(location, parse_bbox(bbox) if bbox else None, near, radius_km)
+
+def _matching_stays(location: Optional[str], price_min: Optional[float], price_max: Optional[float],
+                    rating: Optional[float], stars: Optional[int], amenities: Optional[List[str]],
+                    sort_by: Optional[str] = None, lat: Optional[float] = None, lng: Optional[float] = None,
+                    radius_km: Optional[float] = None, bbox: Optional[str] = None,
+                    check_in: Optional[str] = None, check_out: Optional[str] = None,
+                    rooms: int = 1, facets: Optional[List[str]] = None):
+    """(generator of matching stays, facet counts or None)."""
+    catalog, candidates = _candidates(location, sort_by, lat, lng, radius_km, bbox)
+    filters = (price_min, price_max, rating, stars, amenities, check_in, check_out, rooms)
+    rows = catalog.filter(candidates, *filters)
+    counts = catalog.facets(candidates, facets, *filters) if facets else None
+    if lat is None:
+        return (catalog.stays[i] for i in rows), counts
+    distances = catalog.geo.distances(rows, lat, lng)
+    return ({**catalog.stays[i], "distance_km": round(float(d), 3)} for i, d in zip(rows, distances)), counts
 
+@cached_search("stays", lower=("location",))
 def search_stays(location: Optional[str], price_min: Optional[float], price_max: Optional[float],
                  rating: Optional[float], stars: Optional[int], amenities: Optional[List[str]],
-                 sort_by: Optional[str]):
-    data = load_json("stays_search.json")
-    stays = data["stays"]  # Access the 'stays' key
-
-    # Filters
-    if location:
-        stays = [s for s in stays if location.lower() in s["location"].lower()]
-    if price_min is not None:
-        stays = [s for s in stays if s["price"] >= price_min]
-    if price_max is not None:
-        stays = [s for s in stays if s["price"] <= price_max]
-    if rating is not None:
-        stays = [s for s in stays if s["rating"] >= rating]
-    if stars is not None:
-        stays = [s for s in stays if s["stars"] == stars]
-    if amenities:
-        stays = [s for s in stays if all(a in s["amenities"] for a in amenities)]
-
-    # Sorting
-    if sort_by == "price_asc":
-        stays.sort(key=lambda x: x["price"])
-    elif sort_by == "price_desc":
-        stays.sort(key=lambda x: x["price"], reverse=True)
-    elif sort_by == "rating":
-        stays.sort(key=lambda x: x["rating"], reverse=True)
-    elif sort_by == "popularity":
-        stays.sort(key=lambda x: x["reviews_count"], reverse=True)
-
-    return stays
+                 sort_by: Optional[str], limit: Optional[int] = None, cursor: Optional[str] = None,
+                 lat: Optional[float] = None, lng: Optional[float] = None,
+                 radius_km: Optional[float] = None, bbox: Optional[str] = None,
+                 check_in: Optional[str] = None, check_out: Optional[str] = None, rooms: int = 1,
+                 facets: Optional[str] = None):
+    names = parse_facets(facets, STAY_FACETS)
+    stays, counts = _matching_stays(
+        location, price_min, price_max, rating, stars, amenities, sort_by, lat, lng, radius_km, bbox,
+        check_in, check_out, rooms, names
+    )
+
+    # Sorting / paging
+    items, total, next_cursor = top_k(stays, _SORTS.get(sort_by), sort_by, limit, cursor)
+
+    # Unpaged requests without facets keep the original bare-list response
+    if counts is not None:
+        return {"count": total, "items": items, "next_cursor": next_cursor, "facets": counts}
+    if limit is None and cursor is None:
+        return items
+    return {"count": total, "items": items, "next_cursor": next_cursor}
+
+def stream_stays(location: Optional[str], price_min: Optional[float], price_max: Optional[float],
+                 rating: Optional[float], stars: Optional[int], amenities: Optional[List[str]],
+                 sort_by: Optional[str], limit: Optional[int] = None, cursor: Optional[str] = None,
+                 lat: Optional[float] = None, lng: Optional[float] = None,
+                 radius_km: Optional[float] = None, bbox: Optional[str] = None,
+                 check_in: Optional[str] = None, check_out: Optional[str] = None, rooms: int = 1):
+    """(generator of stays, total, next cursor) for NDJSON responses."""
+    stays, _ = _matching_stays(
+        location, price_min, price_max, rating, stars, amenities, sort_by, lat, lng, radius_km, bbox,
+        check_in, check_out, rooms
+    )
+    sort = _SORTS.get(sort_by)
+    if sort is None and limit is None and cursor is None:
+        # File order: matches go out as the filters produce them; the total is not known up front
+        return stays, None, None
+    items, total, next_cursor = top_k(stays, sort, sort_by, limit, cursor)
+    return iter(items), total, next_cursor
+
+def suggest_locations(prefix: str, limit: int = 10):
+    """Location autocomplete: prefix lookups on the stays location trigram index."""
+    return current().stays.suggest_locations(prefix, limit)
 
 def get_stay_details(stay_id: str):
-    details = load_json("stays_details.json")
-    stays = details["stays"]  # Access the 'stays' key
-    return next((s for s in stays if s["id"] == stay_id), {})
+    return current().detail("stays", stay_id) or {}
 
-def get_stay_reviews(stay_id: str):
-    reviews = load_json("stays_reviews.json")
-    return [r for r in reviews if r["stay_id"] == stay_id]
+def get_stay_reviews(stay_id: str, limit: Optional[int] = None, cursor: Optional[str] = None,
+                     sort: Optional[str] = None, aggregates_only: bool = False):
+    store = current().reviews
+    if aggregates_only:
+        return {"stay_id": stay_id, "summary": store.summary(stay_id)}
+    # Without paging options keep the original bare-list response
+    if limit is None and cursor is None and sort is None:
+        return store.all(stay_id)
+    items, next_cursor = store.page(stay_id, sort, limit or 20, cursor)
+    return {
+        "stay_id": stay_id,
+        "summary": store.summary(stay_id),
+        "items": items,
+        "next_cursor": next_cursor,
+    }
 
 def get_nearby_places(stay_id: str):
     nearby = load_json("stays_nearby.json")
     return [n for n in nearby if n["stay_id"] == stay_id]
 
-def get_stay_availability(stay_id: str):
-    availability = load_json("stays_availability.json")
-    return next((a for a in availability if a["stay_id"] == stay_id), {})
+def get_stay_availability(stay_id: str, check_in: Optional[str] = None, check_out: Optional[str] = None):
+    availability = current().stays.availability
+    if check_in or check_out:
+        if not (check_in and check_out):
+            raise InvalidParameter("check_in and check_out must be given together")
+        return {
+            "stay_id": stay_id,
+            "check_in": check_in,
+            "check_out": check_out,
+            "rooms": availability.rooms(stay_id, check_in, check_out),
+        }
+    records = availability.records.get(str(stay_id))
+    return records[0] if records else {}
@@ -1,8 +1,4 @@
-import json
-from pathlib import Path
-
-BASE_DIR = Path(__file__).resolve().parents[1]
-DATA_DIR = BASE_DIR / "data"
+from app.catalog.store import current
 
 class TripsService:
     def plan_trip(self, db, payload):
@@ -48,8 +44,7 @@ class TripsService:
         db.commit()
         return True
     def _load(self, name: str):
-        with open(DATA_DIR / f"{name}.json", encoding="utf-8") as f:
-            return json.load(f)
+        return current().document(f"{name}.json")
 
     def get_trips(self):
         return self._load("trips_list")
\ No newline at end of file
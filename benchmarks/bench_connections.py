@@ -0,0 +1,104 @@
+"""
+Benchmark the connection finder on a synthetic flight network.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_connections --airports 3000 --flights-per-airport 40
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from app.catalog.flights import FlightIndex
+from app.catalog.routing import ConnectionGraph
+
+AIRLINES = ["AA", "DL", "JL", "IB", "SQ", "QF"]
+SEAT_CLASSES = ["economy", "premium_economy", "business", "first"]
+
+def airport_code(i: int) -> str:
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    return letters[i // 676 % 26] + letters[i // 26 % 26] + letters[i % 26]
+
+def generate_itineraries(airports: int, flights_per_airport: int, days: int, hubs: int, seed: int):
+    """One-way itineraries shaped like one_way.json; hubs get most traffic and fly everywhere."""
+    rnd = random.Random(seed)
+    codes = [airport_code(i) for i in range(airports)]
+    hub_codes = codes[:hubs]
+    start = datetime(2025, 9, 1)
+    items = []
+    for day in range(days):
+        for origin in codes:
+            is_hub = origin in hub_codes
+            for n in range(flights_per_airport * (20 if is_hub else 1)):
+                if is_hub:
+                    dest = rnd.choice(codes)
+                else:
+                    dest = rnd.choice(hub_codes) if rnd.random() < 0.7 else rnd.choice(codes)
+                if dest == origin:
+                    continue
+                airline = rnd.choice(AIRLINES)
+                depart = start + timedelta(days=day, minutes=rnd.randint(0, 24 * 60 - 1))
+                minutes = rnd.randint(45, 900)
+                items.append({
+                    "id": f"ow-{airline}-{origin}-{dest}-{depart:%Y%m%d%H%M}-{n}",
+                    "trip_type": "one_way",
+                    "airline": {"code": airline, "name": airline},
+                    "stops": 0,
+                    "seat_classes": rnd.sample(SEAT_CLASSES, rnd.randint(1, 4)),
+                    "price": {"total": rnd.randint(50, 1500), "currency": "USD"},
+                    "duration_total_minutes": minutes,
+                    "legs": [{
+                        "direction": "outbound",
+                        "segments": [{
+                            "flight_number": f"{airline} {rnd.randint(100, 9999)}",
+                            "airline": airline,
+                            "from": {"code": origin},
+                            "to": {"code": dest},
+                            "depart_utc": depart.strftime("%Y-%m-%dT%H:%M:00Z"),
+                            "arrive_utc": (depart + timedelta(minutes=minutes)).strftime("%Y-%m-%dT%H:%M:00Z"),
+                            "duration_minutes": minutes,
+                        }],
+                    }],
+                })
+    return codes, items
+
+def main():
+    parser = argparse.ArgumentParser(description="Connection finder benchmark")
+    parser.add_argument("--airports", type=int, default=2000)
+    parser.add_argument("--flights-per-airport", type=int, default=30, help="Departures per airport per day")
+    parser.add_argument("--days", type=int, default=2)
+    parser.add_argument("--hubs", type=int, default=25)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--max-stops", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    codes, items = generate_itineraries(args.airports, args.flights_per_airport, args.days, args.hubs, args.seed)
+    t1 = time.perf_counter()
+    index = FlightIndex(items)
+    graph = ConnectionGraph(index)
+    t2 = time.perf_counter()
+    print(f"Generated {len(items)} itineraries over {len(codes)} airports in {t1 - t0:.2f}s")
+    print(f"Built index + graph in {t2 - t1:.2f}s")
+
+    rnd = random.Random(args.seed + 1)
+    for objective in ("price", "duration"):
+        timings = []
+        found = 0
+        for _ in range(args.queries):
+            origin, dest = rnd.sample(codes, 2)
+            q0 = time.perf_counter()
+            paths = graph.search(origin, dest, "2025-09-01", args.k, objective, args.max_stops)
+            timings.append(time.perf_counter() - q0)
+            found += len(paths)
+        timings.sort()
+        p50 = timings[len(timings) // 2] * 1000
+        p95 = timings[int(len(timings) * 0.95) - 1] * 1000
+        print(f"{objective:>8}: {args.queries} queries, p50 {p50:.1f} ms, p95 {p95:.1f} ms, "
+              f"{found / args.queries:.1f} paths/query")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark the stays geo grid on synthetic properties clustered around cities.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_geo --properties 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.catalog.geo import GeoGrid
+
+def generate_points(properties: int, cities: int, seed: int):
+    """Properties scattered (about 10 km) around random city centres."""
+    rng = np.random.default_rng(seed)
+    centres = np.column_stack([rng.uniform(-60, 70, cities), rng.uniform(-180, 180, cities)])
+    which = rng.integers(0, cities, properties)
+    lat = np.clip(centres[which, 0] + rng.normal(0, 0.1, properties), -90, 90)
+    lng = (centres[which, 1] + rng.normal(0, 0.1, properties) + 180) % 360 - 180
+    return centres, lat, lng
+
+def report(name: str, timings, found):
+    timings = sorted(timings)
+    p50 = timings[len(timings) // 2] * 1000
+    p95 = timings[int(len(timings) * 0.95) - 1] * 1000
+    print(f"{name:>7}: {len(timings)} queries, p50 {p50:.3f} ms, p95 {p95:.3f} ms, "
+          f"{sum(found) / len(found):.0f} stays/query")
+
+def main():
+    parser = argparse.ArgumentParser(description="Stays geo search benchmark")
+    parser.add_argument("--properties", type=int, default=1_000_000)
+    parser.add_argument("--cities", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--radius-km", type=float, default=15.0, help="City-scale search radius")
+    parser.add_argument("--box-degrees", type=float, default=0.2, help="Map viewport size (about a city)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    centres, lat, lng = generate_points(args.properties, args.cities, args.seed)
+    t0 = time.perf_counter()
+    grid = GeoGrid(lat, lng)
+    print(f"Indexed {args.properties} stays in {time.perf_counter() - t0:.2f}s")
+
+    rng = np.random.default_rng(args.seed + 1)
+    points = centres[rng.integers(0, args.cities, args.queries)] + rng.normal(0, 0.05, (args.queries, 2))
+
+    timings, found = [], []
+    for plat, plng in points:
+        half = args.box_degrees / 2
+        q0 = time.perf_counter()
+        rows = grid.within_bbox(plat - half, plng - half, plat + half, plng + half)
+        timings.append(time.perf_counter() - q0)
+        found.append(len(rows))
+    report("bbox", timings, found)
+
+    timings, found = [], []
+    for plat, plng in points:
+        q0 = time.perf_counter()
+        rows, _ = grid.within_radius(plat, plng, args.radius_km)
+        timings.append(time.perf_counter() - q0)
+        found.append(len(rows))
+    report("radius", timings, found)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark package bundling: best-first enumeration against the full cross product.
+
+Each trial draws flight, stay and car offers priced in mixed currencies,
+converts them to USD and takes the cheapest page of bundles, the way
+`packages_service.build_packages` does once the components are narrowed.
+The cross product is only built (for checking) while it stays small.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_packages --flights 2000 --stays 5000 --cars 500
+"""
+
+import argparse
+import itertools
+import random
+import time
+
+import numpy as np
+
+from app.catalog.bundles import cheapest_combinations
+from app.core.currency import USD_RATES, to_usd
+
+# p95 the bundles endpoint is expected to stay under
+TARGET_MS = 100.0
+# Largest cross product also enumerated by brute force to check the results
+BRUTE_FORCE_MAX = 2_000_000
+
+def generate_offers(count: int, low: float, high: float, rnd: random.Random):
+    """(native prices, currencies) for `count` offers costing between low and high USD."""
+    currencies = [rnd.choice(list(USD_RATES)) for _ in range(count)]
+    prices = np.array([rnd.uniform(low, high) * USD_RATES[c] for c in currencies], dtype=np.float64)
+    return prices, currencies
+
+def bundle_page(components, limit, budget):
+    """Cheapest `limit` (total, picks) after converting every component to USD."""
+    prices = [to_usd(native, currencies) for native, currencies in components]
+    return list(itertools.islice(cheapest_combinations(prices, budget), limit)), prices
+
+def brute_force(prices, limit, budget):
+    totals = sorted(sum(float(p[i]) for p, i in zip(prices, picks))
+                    for picks in itertools.product(*[range(len(p)) for p in prices]))
+    if budget is not None:
+        totals = [t for t in totals if t <= budget]
+    return totals[:limit]
+
+def report(timings):
+    timings = sorted(timings)
+    p50 = timings[len(timings) // 2] * 1000
+    p95 = timings[int(len(timings) * 0.95) - 1] * 1000
+    return p50, p95
+
+def main():
+    parser = argparse.ArgumentParser(description="Package bundling benchmark")
+    parser.add_argument("--flights", type=int, default=2_000)
+    parser.add_argument("--stays", type=int, default=5_000)
+    parser.add_argument("--cars", type=int, default=500, help="0 bundles flights and stays only")
+    parser.add_argument("--limit", type=int, default=20, help="Bundles per page")
+    parser.add_argument("--budget", type=float, default=None, help="price_max in USD")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    components = [generate_offers(args.flights, 150, 1500, rnd), generate_offers(args.stays, 200, 3000, rnd)]
+    if args.cars:
+        components.append(generate_offers(args.cars, 80, 900, rnd))
+    sizes = [len(prices) for prices, _ in components]
+    print(f"Offers per component {sizes}, {int(np.prod(sizes, dtype=np.float64)):,} possible bundles")
+
+    timings = []
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        page, prices = bundle_page(components, args.limit, args.budget)
+        timings.append(time.perf_counter() - t0)
+
+    if np.prod(sizes, dtype=np.float64) <= BRUTE_FORCE_MAX:
+        expected = brute_force(prices, args.limit, args.budget)
+        assert np.allclose([total for total, _ in page], expected), "best-first and cross product disagree"
+        print("Checked against the full cross product")
+
+    p50, p95 = report(timings)
+    verdict = "within" if p95 < TARGET_MS else "OVER"
+    print(f"{len(page)} bundles | p50 {p50:.2f} ms, p95 {p95:.2f} ms ({verdict} the {TARGET_MS:.0f} ms target)")
+
+if __name__ == "__main__":
+    main()
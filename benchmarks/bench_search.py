@@ -0,0 +1,92 @@
+"""
+Benchmark the shared search engine against chained list-comprehension filters.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_search --items 200000
+"""
+
+import argparse
+import random
+import time
+
+from app.core.pagination import top_k
+from app.services.activities_service import ACTIVITY_SEARCH
+
+LOCATIONS = ["Paris, France", "New York, USA", "Tokyo, Japan", "Barcelona, Spain", "Cancun, Mexico"]
+CATEGORIES = ["Tours", "Museums", "Food & Dining", "Outdoor Activities", "Entertainment", "Wellness & Spa"]
+
+def generate_items(items: int, seed: int):
+    """Activities shaped like activities_search.json."""
+    rnd = random.Random(seed)
+    return [
+        {
+            "id": i,
+            "location": rnd.choice(LOCATIONS),
+            "category": rnd.choice(CATEGORIES),
+            "price": {"amount": rnd.randint(10, 400), "currency": "USD"},
+            "rating": round(rnd.uniform(3.0, 5.0), 1),
+            "popularity": rnd.randint(0, 1000),
+        }
+        for i in range(items)
+    ]
+
+def chained(items, location, category, price_min, price_max, rating_min):
+    """The per-filter list comprehensions the services used before the engine."""
+    if location:
+        items = [d for d in items if location.lower() in d["location"].lower()]
+    if category:
+        items = [i for i in items if i.get("category", "").lower() in {c.lower() for c in category}]
+    if price_min is not None:
+        items = [i for i in items if i.get("price", {}).get("amount", 0) >= price_min]
+    if price_max is not None:
+        items = [i for i in items if i.get("price", {}).get("amount", 0) <= price_max]
+    if rating_min is not None:
+        items = [i for i in items if i.get("rating", 0) >= rating_min]
+    return items
+
+QUERIES = {
+    "broad": (None, None, 20, None, 3.5),
+    "selective": ("tokyo", ["Museums"], 50, 150, 4.5),
+    "text-last": ("paris", None, None, 60, None),
+}
+
+def report(timings):
+    timings = sorted(timings)
+    p50 = timings[len(timings) // 2] * 1000
+    p95 = timings[int(len(timings) * 0.95) - 1] * 1000
+    return f"p50 {p50:.2f} ms, p95 {p95:.2f} ms"
+
+def main():
+    parser = argparse.ArgumentParser(description="Declarative search engine benchmark")
+    parser.add_argument("--items", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20, help="Page size ranked by price")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    items = generate_items(args.items, args.seed)
+    print(f"Generated {args.items} activities")
+    sort = ACTIVITY_SEARCH.sorts["price_asc"]
+
+    for name, (location, category, price_min, price_max, rating_min) in QUERIES.items():
+        conditions = [
+            ("location", "contains", location),
+            ("category", "in", category),
+            ("price", ">=", price_min),
+            ("price", "<=", price_max),
+            ("rating", ">=", rating_min),
+        ]
+        old, new = [], []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            expected = top_k(chained(items, location, category, price_min, price_max, rating_min),
+                             sort, "price_asc", args.limit, None)
+            old.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            result = ACTIVITY_SEARCH.search(items, conditions, "price_asc", args.limit)
+            new.append(time.perf_counter() - t0)
+            assert result == expected, f"{name}: engine and chained filters disagree"
+        print(f"{name:>9}: {expected[1]} matches | chained {report(old)} | engine {report(new)}")
+
+if __name__ == "__main__":
+    main()
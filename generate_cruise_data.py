@@ -0,0 +1,189 @@
+# Run from the repository root: python generate_cruise_data.py --count 20000
+import argparse
+import json
+import os
+import random
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from app.catalog.cruise_details import DETAILS_DIR, INDEX_NAME, SEGMENT_NAME, segment_generation
+
+
+DATA_DIR = Path(__file__).resolve().parent / "app" / "data" / "cruises"
+
+
+# Domain tables
+CRUISE_LINES = {
+    "Royal Caribbean": ["Wonder of the Seas", "Symphony of the Seas", "Oasis of the Seas", "Allure of the Seas"],
+    "Carnival": ["Carnival Celebration", "Mardi Gras", "Carnival Vista", "Carnival Horizon"],
+    "Norwegian": ["Norwegian Prima", "Norwegian Encore", "Norwegian Bliss", "Norwegian Escape"],
+    "MSC": ["MSC World Europa", "MSC Seashore", "MSC Grandiosa", "MSC Meraviglia"],
+    "Celebrity": ["Celebrity Beyond", "Celebrity Apex", "Celebrity Edge"],
+    "Princess": ["Sun Princess", "Discovery Princess", "Enchanted Princess"],
+    "Holland America": ["Rotterdam", "Nieuw Statendam", "Koningsdam"],
+}
+
+# destination -> (departure ports, ports of call)
+ROUTES: Dict[str, Tuple[List[str], List[str]]] = {
+    "Caribbean": (["Miami", "Fort Lauderdale", "Port Canaveral", "Galveston"],
+                  ["Cozumel", "Nassau", "Grand Cayman", "Roatan", "Costa Maya", "St. Maarten", "San Juan"]),
+    "Mediterranean": (["Barcelona", "Rome (Civitavecchia)", "Venice", "Athens (Piraeus)"],
+                      ["Marseille", "Naples", "Santorini", "Mykonos", "Dubrovnik", "Palma de Mallorca", "Valletta"]),
+    "Alaska": (["Seattle", "Vancouver"], ["Juneau", "Ketchikan", "Skagway", "Glacier Bay", "Sitka"]),
+    "Northern Europe": (["Southampton", "Copenhagen", "Amsterdam"],
+                        ["Oslo", "Stockholm", "Tallinn", "Helsinki", "Bergen", "Geiranger"]),
+    "Bahamas": (["Miami", "Port Canaveral", "New York"], ["Nassau", "Freeport", "Bimini", "CocoCay"]),
+    "Asia": (["Singapore", "Tokyo (Yokohama)", "Hong Kong"], ["Phuket", "Penang", "Ho Chi Minh City", "Osaka", "Busan"]),
+}
+NIGHTS = [3, 4, 5, 7, 7, 7, 10, 12, 14]
+CABINS = [("interior", 1.0), ("oceanview", 1.25), ("balcony", 1.6), ("suite", 2.8)]
+INCLUSIONS = ["Main dining room meals", "Buffet", "Entertainment", "Pools", "Fitness center", "Kids club"]
+EXTRAS = ["Specialty dining", "Drinks package", "Wi-Fi", "Spa", "Shore excursions", "Gratuities"]
+
+
+def seeded_random(seed: str) -> random.Random:
+    rnd = random.Random()
+    rnd.seed(seed)
+    return rnd
+
+
+def make_itinerary(rnd: random.Random, port: str, calls: List[str], nights: int, start: date) -> List[Dict]:
+    stops = [port]
+    for day in range(1, nights):
+        stops.append("At sea" if rnd.random() < 0.3 else rnd.choice(calls))
+    stops.append(port)
+    return [
+        {
+            "day": day + 1,
+            "date": (start + timedelta(days=day)).isoformat(),
+            "port": stop,
+            "arrive": None if day == 0 or stop == "At sea" else "08:00",
+            "depart": None if day == nights or stop == "At sea" else "17:00",
+        }
+        for day, stop in enumerate(stops)
+    ]
+
+
+def generate_records(count: int, start: date, days: int, seed: str) -> Tuple[List[Dict], List[Dict]]:
+    items_search: List[Dict] = []
+    items_details: List[Dict] = []
+    for i in range(count):
+        rnd = seeded_random(f"{seed}:{i}")
+        line = rnd.choice(sorted(CRUISE_LINES))
+        ship = rnd.choice(CRUISE_LINES[line])
+        destination = rnd.choice(sorted(ROUTES))
+        ports, calls = ROUTES[destination]
+        port = rnd.choice(ports)
+        nights = rnd.choice(NIGHTS)
+        departure = start + timedelta(days=rnd.randrange(days))
+        per_night = rnd.randint(70, 260)
+        price = per_night * nights
+        cruise_id = f"cruise-{i + 1}"
+
+        items_search.append(
+            {
+                "id": cruise_id,
+                "name": f"{nights}-Night {destination} from {port}",
+                "cruise_line": line,
+                "ship": ship,
+                "nights": nights,
+                "destination": destination,
+                "departure_port": port,
+                "departure_date": departure.isoformat(),
+                "price": price,
+                "currency": "USD",
+                "rating": round(rnd.uniform(3.8, 4.9), 1),
+            }
+        )
+        items_details.append(
+            {
+                "id": cruise_id,
+                "name": f"{nights}-Night {destination} from {port}",
+                "cruise_line": line,
+                "ship": {
+                    "name": ship,
+                    "year_built": rnd.randint(2008, 2024),
+                    "passengers": rnd.randrange(2500, 7000, 100),
+                    "decks": rnd.randint(14, 20),
+                },
+                "nights": nights,
+                "destination": destination,
+                "departure_port": port,
+                "departure_date": departure.isoformat(),
+                "return_date": (departure + timedelta(days=nights)).isoformat(),
+                "itinerary": make_itinerary(rnd, port, calls, nights, departure),
+                "cabins": [
+                    {"type": cabin, "price": round(price * factor), "available": rnd.randint(0, 40)}
+                    for cabin, factor in CABINS
+                ],
+                "included": rnd.sample(INCLUSIONS, k=4),
+                "extras": rnd.sample(EXTRAS, k=3),
+                "policies": {
+                    "free_cancellation_days": rnd.choice([30, 60, 90]),
+                    "deposit": round(price * 0.15),
+                },
+            }
+        )
+    return items_search, items_details
+
+
+def write_files(search_items: List[Dict], detail_items: List[Dict], segment_size: int) -> None:
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with open(DATA_DIR / "cruises_search.json", "w", encoding="utf-8") as f:
+        json.dump({"cruises": search_items}, f, ensure_ascii=False, indent=2)
+
+    # New segments get a new generation and never overwrite the ones a running server's index points at
+    details_dir = DATA_DIR / DETAILS_DIR
+    details_dir.mkdir(parents=True, exist_ok=True)
+    existing = [p.name for p in details_dir.glob("segment-*.jsonl")]
+    generation = max(map(segment_generation, existing), default=0) + 1
+
+    segments: List[str] = []
+    records: Dict[str, List[int]] = {}
+    for start in range(0, len(detail_items), segment_size):
+        name = SEGMENT_NAME.format(generation, len(segments))
+        offset = 0
+        with open(details_dir / name, "wb") as f:
+            for item in detail_items[start:start + segment_size]:
+                line = (json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+                records[item["id"]] = [len(segments), offset, len(line)]
+                f.write(line)
+                offset += len(line)
+        segments.append(name)
+
+    # Swap the index in atomically once every segment it names is on disk
+    temporary = details_dir / f"{INDEX_NAME}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump({"generation": generation, "segments": segments, "records": records}, f, separators=(",", ":"))
+    os.replace(temporary, details_dir / INDEX_NAME)
+
+    # Keep the previous generation for servers still on the old index until they reload
+    for name in existing:
+        if segment_generation(name) < generation - 1:
+            (details_dir / name).unlink()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate cruise search data and segmented cruise details")
+    parser.add_argument("--count", type=int, default=5000, help="Number of sailings to generate")
+    parser.add_argument("--days", type=int, default=365, help="Spread departures over this many future days")
+    parser.add_argument("--segment-size", type=int, default=1000, help="Detail documents per segment file")
+    parser.add_argument("--seed", type=str, default="cruises", help="Deterministic seed base")
+
+    args = parser.parse_args()
+    search_items, detail_items = generate_records(
+        count=args.count,
+        start=date.today() + timedelta(days=1),
+        days=args.days,
+        seed=args.seed,
+    )
+    write_files(search_items, detail_items, args.segment_size)
+    print(
+        f"Generated {len(search_items)} cruises and {len(detail_items)} detail documents "
+        f"in {(len(detail_items) + args.segment_size - 1) // args.segment_size} segment(s)."
+    )
+
+
+if __name__ == "__main__":
+    main()
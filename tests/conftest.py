@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.catalog.store import DatasetUnavailable, Snapshot
+from app.core.config import settings
+
+def _utc(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def itinerary(id, origin, destination, depart, minutes=120, price=100, currency="USD", airline="AA",
+              stops=0, seat_classes=("economy",), returns=None):
+    """A one-way (or, with `returns`, round-trip) itinerary shaped like the flight data files."""
+    out = datetime.fromisoformat(depart)
+    legs = [{"direction": "outbound", "segments": [{
+        "from": {"code": origin}, "to": {"code": destination},
+        "depart_utc": _utc(out), "arrive_utc": _utc(out + timedelta(minutes=minutes)),
+    }]}]
+    if returns is not None:
+        back = datetime.fromisoformat(returns)
+        legs.append({"direction": "inbound", "segments": [{
+            "from": {"code": destination}, "to": {"code": origin},
+            "depart_utc": _utc(back), "arrive_utc": _utc(back + timedelta(minutes=minutes)),
+        }]})
+    return {
+        "id": id,
+        "airline": {"code": airline, "name": f"{airline} Air"},
+        "stops": stops,
+        "seat_classes": list(seat_classes),
+        "duration_total_minutes": minutes,
+        "price": {"total": price, "currency": currency},
+        "legs": legs,
+    }
+
+def snapshot(**values) -> Snapshot:
+    """A catalog snapshot serving `values`; any other dataset is unavailable."""
+    def missing(name):
+        raise DatasetUnavailable(f"{name}: not loaded")
+    return Snapshot(values, {}, {}, 0.0, missing)
+
+@pytest.fixture(autouse=True)
+def no_search_cache(monkeypatch):
+    # Tests build their own catalogs, so results cached under the same arguments would leak between them
+    monkeypatch.setattr(settings, "SEARCH_CACHE_ENABLED", False)
@@ -0,0 +1,78 @@
+import math
+import random
+
+import pytest
+
+from app.catalog.airports import DEFAULT_RADIUS_KM, METRO_AREAS, AirportIndex
+from app.catalog.flights import FlightCatalog
+from app.services import flights_service
+from conftest import itinerary, snapshot
+
+AIRPORTS = [
+    {"code": "JFK", "city": "New York", "coordinates": {"lat": 40.6413, "lng": -73.7781}},
+    {"code": "LGA", "city": "New York", "coordinates": {"lat": 40.7769, "lng": -73.8740}},
+    {"code": "EWR", "city": "Newark", "coordinates": {"lat": 40.6895, "lng": -74.1745}},
+    {"code": "HPN", "city": "White Plains", "latitude": 41.0670, "longitude": -73.7076},
+    {"code": "PHL", "city": "Philadelphia", "coordinates": {"lat": 39.8744, "lng": -75.2424}},
+    {"code": "LAX", "city": "Los Angeles", "coordinates": {"lat": 33.9416, "lng": -118.4085}},
+    {"code": "BUR", "city": "Burbank", "coordinates": {"lat": 34.1975, "lng": -118.3585}},
+    {"code": "XYZ", "city": "Los Angeles"},  # no coordinates
+]
+
+def haversine(a, b):
+    lat1, lng1, lat2, lng2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * 6371.0 * math.asin(math.sqrt(h))
+
+def generate_airports(rnd, count):
+    return [{"code": f"A{i:02d}", "city": rnd.choice(["North", "South", "East"]),
+             "coordinates": {"lat": rnd.uniform(40, 42), "lng": rnd.uniform(-75, -72)}} for i in range(count)]
+
+@pytest.mark.parametrize("seed", range(6))
+def test_within_matches_a_distance_scan(seed):
+    rnd = random.Random(seed)
+    airports = generate_airports(rnd, 80)
+    index = AirportIndex(airports)
+    points = {a["code"]: (a["coordinates"]["lat"], a["coordinates"]["lng"]) for a in airports}
+    for _ in range(20):
+        code = rnd.choice(airports)["code"]
+        radius = rnd.choice([0, 25, 60, 150])
+        distances = {other: haversine(points[code], p) for other, p in points.items()}
+        expected = sorted((d, other) for other, d in distances.items() if d <= radius)
+        got = index.within(code.lower(), radius)
+        assert sorted(got) == sorted(other for _, other in expected)
+        assert [distances[c] for c in got] == sorted(distances[c] for c in got)
+
+def test_metro_codes_expand_to_their_airports_and_city_siblings():
+    index = AirportIndex.from_document({"airports": AIRPORTS})
+    assert index.expand("nyc") == ["JFK", "LGA", "EWR"]
+    assert index.expand("QLA") == METRO_AREAS["QLA"] + ["XYZ"]
+    assert index.expand("JFK") == ["JFK"]
+
+def test_nearby_adds_metro_siblings_and_airports_in_range():
+    index = AirportIndex(AIRPORTS)
+    assert set(index.expand("JFK", nearby=True)) == {"JFK", "LGA", "EWR", "HPN"}
+    assert set(index.expand("JFK", nearby=True, radius_km=30)) == {"JFK", "LGA", "EWR"}
+    # PHL is 151 km from JFK but 128 km from EWR, which the radius is measured from too
+    assert set(index.expand("JFK", nearby=True, radius_km=140)) == {"JFK", "LGA", "EWR", "HPN", "PHL"}
+    assert index.within("XYZ", DEFAULT_RADIUS_KM) == []
+
+def test_serving_finds_airports_by_city_name():
+    index = AirportIndex(AIRPORTS)
+    assert index.serving("Los Angeles, USA") == ["LAX", "XYZ", "BUR", "LGB", "SNA", "ONT"]
+    assert index.serving(" ") == []
+
+def test_metro_search_covers_every_member_route(monkeypatch):
+    flights = [itinerary("A", "JFK", "LAX", "2025-09-01T08:00:00", price=300),
+               itinerary("B", "EWR", "LAX", "2025-09-01T09:00:00", price=200),
+               itinerary("C", "HPN", "LAX", "2025-09-01T10:00:00", price=100)]
+    monkeypatch.setattr(flights_service, "current",
+                        lambda: snapshot(flights=FlightCatalog(flights, []), airports=AirportIndex(AIRPORTS)))
+    result = flights_service.search_one_way("NYC", "LAX", "2025-09-01", 1, None, None, None, None, None,
+                                            "price_asc")
+    assert [f["id"] for f in result["items"]] == ["B", "A"]
+    assert result["airports"] == {"origin": ["JFK", "LGA", "EWR"], "destination": ["LAX"]}
+
+    result = flights_service.search_one_way("JFK", "LAX", "2025-09-01", 1, None, None, None, None, None,
+                                            "price_asc", expand_nearby=True, radius_km=50)
+    assert [f["id"] for f in result["items"]] == ["C", "B", "A"]
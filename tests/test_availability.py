@@ -0,0 +1,120 @@
+import random
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.catalog.availability import AvailabilityIndex
+from app.catalog.stays import StayCatalog
+from app.core.errors import InvalidParameter
+
+START = date(2025, 9, 1)
+STAY_IDS = [f"stay-{i}" for i in range(6)]
+ROOM_IDS = ["room-001", "room-002", "room-003"]
+
+def day(offset):
+    return (START + timedelta(days=offset)).isoformat()
+
+def generate_records(rnd, count):
+    records = []
+    for i in range(count):
+        start = rnd.randint(0, 20)
+        rooms = []
+        for room_id in rnd.sample(ROOM_IDS, rnd.randint(1, 3)):
+            room = {"room_id": room_id, "available": rnd.random() < 0.7}
+            if rnd.random() < 0.5:
+                room["available_count"] = rnd.randint(0, 3)
+            rooms.append(room)
+        records.append({"id": f"avail-{i}", "stay_id": rnd.choice(STAY_IDS[:5]),  # the last stay has none
+                        "check_in": day(start), "check_out": day(start + rnd.randint(1, 6)), "rooms": rooms})
+    return records
+
+def nightly(records):
+    """(stay, room, day) -> rooms free, replaying records by check-in so later ones win."""
+    free = {}
+    for record in sorted(records, key=lambda r: r["check_in"]):
+        first = date.fromisoformat(record["check_in"])
+        nights = (date.fromisoformat(record["check_out"]) - first).days
+        for room in record["rooms"]:
+            count = room.get("available_count", 1 if room["available"] else 0)
+            for n in range(nights):
+                free[(record["stay_id"], room["room_id"], first + timedelta(days=n))] = count
+    return free
+
+def brute_rooms(free, stay_id, check_in, check_out):
+    nights = [date.fromisoformat(check_in) + timedelta(days=n)
+              for n in range((date.fromisoformat(check_out) - date.fromisoformat(check_in)).days)]
+    room_ids = {room for stay, room, _ in free if stay == stay_id}
+    return {room: min(free.get((stay_id, room, night), 0) for night in nights) for room in room_ids}
+
+@pytest.mark.parametrize("seed", range(10))
+def test_stay_availability_matches_nightly_replay(seed):
+    rnd = random.Random(seed)
+    records = generate_records(rnd, 25)
+    index = AvailabilityIndex(records, STAY_IDS)
+    free = nightly(records)
+    rows = np.arange(len(STAY_IDS))
+
+    # Windows starting before, inside and after the published horizon, down to a single night
+    for start in range(-3, 30):
+        for length in (1, 2, 4, 9):
+            check_in, check_out = day(start), day(start + length)
+            for rooms in (1, 2):
+                expected = [any(n >= rooms for n in brute_rooms(free, s, check_in, check_out).values())
+                            for s in STAY_IDS]
+                assert index.available(rows, check_in, check_out, rooms).tolist() == expected
+            for stay_id in STAY_IDS:
+                got = {r["room_id"]: r["available_count"] for r in index.rooms(stay_id, check_in, check_out)}
+                assert got == brute_rooms(free, stay_id, check_in, check_out)
+
+def test_check_out_night_is_not_needed():
+    records = [{"stay_id": "stay-0", "check_in": day(0), "check_out": day(2),
+                "rooms": [{"room_id": "room-001", "available": True}]}]
+    index = AvailabilityIndex(records, ["stay-0"])
+    rows = np.arange(1)
+    assert index.available(rows, day(0), day(2)).tolist() == [True]
+    assert index.available(rows, day(1), day(2)).tolist() == [True]
+    assert index.available(rows, day(1), day(3)).tolist() == [False]
+    assert index.available(rows, day(-1), day(1)).tolist() == [False]
+
+def test_later_record_wins_where_records_overlap():
+    records = [
+        {"stay_id": "stay-0", "check_in": day(3), "check_out": day(5),
+         "rooms": [{"room_id": "room-001", "available": False}]},
+        {"stay_id": "stay-0", "check_in": day(0), "check_out": day(10),
+         "rooms": [{"room_id": "room-001", "available": True}]},
+    ]
+    index = AvailabilityIndex(records, ["stay-0"])
+    rows = np.arange(1)
+    assert index.available(rows, day(0), day(3)).tolist() == [True]
+    assert index.available(rows, day(2), day(4)).tolist() == [False]
+    assert index.available(rows, day(5), day(10)).tolist() == [True]
+
+@pytest.mark.parametrize("check_in, check_out", [(day(2), day(2)), (day(3), day(1)), ("soon", day(1))])
+def test_invalid_stay_windows_are_rejected(check_in, check_out):
+    index = AvailabilityIndex(generate_records(random.Random(0), 5), STAY_IDS)
+    with pytest.raises(InvalidParameter):
+        index.available(np.arange(len(STAY_IDS)), check_in, check_out)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_stay_search_keeps_only_available_stays(seed):
+    rnd = random.Random(seed)
+    records = generate_records(rnd, 25)
+    stays = [{"id": stay_id, "price": rnd.choice([90, 150])} for stay_id in STAY_IDS]
+    catalog = StayCatalog(stays, availability=records)
+    free = nightly(records)
+    rows = np.arange(len(stays))
+    for _ in range(40):
+        start = rnd.randint(-2, 24)
+        check_in, check_out = day(start), day(start + rnd.randint(1, 5))
+        rooms, price_max = rnd.choice([1, 2]), rnd.choice([None, 100])
+        expected = [s["id"] for s in stays
+                    if (price_max is None or s["price"] <= price_max)
+                    and any(n >= rooms for n in brute_rooms(free, s["id"], check_in, check_out).values())]
+        got = catalog.filter(rows, price_max=price_max, check_in=check_in, check_out=check_out, rooms=rooms)
+        assert [s["id"] for s in catalog.take(got)] == expected
+
+def test_stay_search_needs_both_dates():
+    catalog = StayCatalog([{"id": "stay-0"}])
+    with pytest.raises(InvalidParameter):
+        catalog.filter(np.arange(1), check_in=day(0))
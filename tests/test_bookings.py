@@ -0,0 +1,106 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.catalog.cars import CarCatalog
+from app.catalog.rentals import RentalAvailability, RentalUnavailable, parse_window
+from app.catalog.store import DatasetUnavailable
+from app.core.cache import SearchCache
+from app.db import models, schemas
+from app.db.database import Base, get_db
+from app.routers import bookings
+from app.services import bookings_service
+from conftest import snapshot
+
+CARS = [
+    {"id": 1, "pickup": {"city": "Paris", "datetime": "2025-09-01T10:00"},
+     "dropoff": {"city": "Paris", "datetime": "2025-09-05T10:00"}, "price": {"total": 200}},
+    {"id": 2, "pickup": {"city": "Paris", "datetime": "2025-09-02T10:00"},
+     "dropoff": {"city": "Paris", "datetime": "2025-09-03T10:00"}, "price": {"total": 80}},
+]
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, autoflush=False, autocommit=False)()
+    yield session
+    session.close()
+
+@pytest.fixture
+def availability(monkeypatch):
+    availability = RentalAvailability()
+    monkeypatch.setattr(bookings_service, "rental_availability", availability)
+    return availability
+
+@pytest.fixture
+def cars(monkeypatch):
+    monkeypatch.setattr(bookings_service, "current", lambda: snapshot(cars=CarCatalog(CARS)))
+
+def car_booking(item_id, pickup=None, dropoff=None):
+    details = json.dumps({"pickup_datetime": pickup, "dropoff_datetime": dropoff}) if pickup else None
+    return schemas.BookingCreate(booking_type="car", item_id=item_id, details=details, price=100.0)
+
+def search_key(pickup=None, dropoff=None, location="Paris"):
+    """A car search cache key the way cached_search builds it."""
+    return ("cars", "search_cars", ("pickup_location", location),
+            ("pickup_datetime", pickup), ("dropoff_datetime", dropoff))
+
+def test_car_booking_reserves_the_offer_window(db, availability, cars):
+    bookings_service.create_booking(db, car_booking(1))
+    assert availability.reservations(1) == [parse_window("2025-09-01T10:00", "2025-09-05T10:00")]
+    with pytest.raises(RentalUnavailable):
+        bookings_service.create_booking(db, car_booking(1, "2025-09-04T10:00", "2025-09-06T10:00"))
+    # Back to back with the first booking
+    bookings_service.create_booking(db, car_booking(1, "2025-09-05T10:00", "2025-09-06T10:00"))
+    assert db.query(models.Booking).count() == 2
+
+def test_booking_drops_only_overlapping_car_searches(db, availability, cars, monkeypatch):
+    cache = SearchCache(100, 1000, 60)
+    monkeypatch.setattr(bookings_service, "search_cache", cache)
+    overlapping = search_key("2025-09-02T00:00", "2025-09-03T00:00")
+    touching = search_key("2025-09-05T10:00", "2025-09-07T00:00")
+    unwindowed = search_key()
+    other_namespace = ("stays",) + overlapping[1:]
+    for key in (overlapping, touching, unwindowed, other_namespace):
+        cache.put(key, {"items": []})
+
+    bookings_service.create_booking(db, car_booking(1))
+    assert not cache.get(overlapping)[0]
+    assert all(cache.get(key)[0] for key in (touching, unwindowed, other_namespace))
+
+def test_stored_bookings_are_restored(db, availability, cars):
+    for booking in (car_booking(1), car_booking(2, "2025-09-10T08:00", "2025-09-11T08:00"), car_booking(99)):
+        db.add(models.Booking(**booking.dict()))
+    db.add(models.Booking(booking_type="car", item_id=2, details='{"pickup_datetime": "soon"}'))
+    db.commit()
+
+    bookings_service.restore_car_reservations(db)
+    assert availability.reservations(1) == [parse_window("2025-09-01T10:00", "2025-09-05T10:00")]
+    assert availability.reservations(2) == [parse_window("2025-09-10T08:00", "2025-09-11T08:00")]
+    assert availability.reservations(99) == []
+
+def test_restore_is_skipped_without_the_cars_dataset(db, availability, monkeypatch, capsys):
+    monkeypatch.setattr(bookings_service, "current", lambda: snapshot())
+    db.add(models.Booking(**car_booking(1).dict()))
+    db.commit()
+    bookings_service.restore_car_reservations(db)
+    assert len(availability) == 0
+    assert "not restored" in capsys.readouterr().out
+
+def test_booking_without_the_cars_dataset_is_a_503(db, availability, monkeypatch):
+    monkeypatch.setattr(bookings_service, "current", lambda: snapshot())
+    with pytest.raises(DatasetUnavailable):
+        bookings_service.create_booking(db, car_booking(1))
+
+    app = FastAPI()
+    app.include_router(bookings.router)
+    app.dependency_overrides[get_db] = lambda: db
+    response = TestClient(app).post("/bookings/create", json=car_booking(1).dict())
+    assert response.status_code == 503
+    assert db.query(models.Booking).count() == 0
@@ -0,0 +1,118 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from app.catalog.airports import AirportIndex
+from app.catalog.bundles import cheapest_combinations
+from app.catalog.cars import CarCatalog
+from app.catalog.flights import FlightCatalog
+from app.catalog.rentals import RentalAvailability
+from app.catalog.stays import StayCatalog
+from app.core.currency import USD_RATES
+from app.services import packages_service
+from conftest import itinerary, snapshot
+
+def brute_force(costs, budget=None):
+    bundles = sorted((sum(float(c[i]) for c, i in zip(costs, picks)), picks)
+                     for picks in itertools.product(*[range(len(c)) for c in costs]))
+    return [b for b in bundles if budget is None or b[0] <= budget]
+
+def random_costs(rnd, dims):
+    # Small integer prices, so many bundles tie on total
+    return [np.array([rnd.randint(1, 30) for _ in range(rnd.randint(1, 9))], dtype=np.float64)
+            for _ in range(dims)]
+
+@pytest.mark.parametrize("seed", range(40))
+def test_every_combination_comes_out_cheapest_first(seed):
+    rnd = random.Random(seed)
+    costs = random_costs(rnd, rnd.choice([1, 2, 3, 4]))
+    budget = rnd.choice([None, float(rnd.randint(5, 80))])
+    got = list(cheapest_combinations(costs, budget))
+    expected = brute_force(costs, budget)
+
+    assert [total for total, _ in got] == [total for total, _ in expected]
+    assert sorted(picks for _, picks in got) == sorted(picks for _, picks in expected)
+    for total, picks in got:
+        assert total == sum(float(c[i]) for c, i in zip(costs, picks))
+
+def test_prefix_is_the_cheapest_k():
+    rnd = random.Random(7)
+    costs = [np.array([rnd.uniform(50, 900) for _ in range(40)]) for _ in range(3)]
+    got = list(itertools.islice(cheapest_combinations(costs), 25))
+    assert [total for total, _ in got] == pytest.approx([total for total, _ in brute_force(costs)[:25]])
+
+def test_budget_below_the_cheapest_bundle_yields_nothing():
+    costs = [np.array([10.0, 20.0]), np.array([5.0])]
+    assert list(cheapest_combinations(costs, budget=14.0)) == []
+    assert list(cheapest_combinations(costs, budget=15.0)) == [(15.0, (0, 0))]
+
+def test_an_empty_component_yields_nothing():
+    assert list(cheapest_combinations([np.array([1.0, 2.0]), np.array([])])) == []
+    assert list(cheapest_combinations([])) == []
+
+AIRPORTS = [{"code": "JFK", "city": "New York"}, {"code": "CDG", "city": "Paris"}, {"code": "ORY", "city": "Paris"}]
+
+def generate_trip(rnd):
+    """Round trips to Paris, Paris stays open for some nights and Paris rentals, in mixed currencies."""
+    flights = [itinerary(f"F{i}", "JFK", rnd.choice(["CDG", "ORY", "LHR"]), "2025-09-01T08:00:00",
+                         price=rnd.randint(300, 900), currency=rnd.choice(["USD", "EUR", "EUR", "XXX"]),
+                         returns=rnd.choice(["2025-09-04T10:00:00", "2025-09-04T18:00:00", "2025-09-05T10:00:00"]))
+               for i in range(rnd.randint(3, 10))]
+    stays = [{"id": f"S{i}", "location": rnd.choice(["Paris, France", "Paris, France", "Lyon, France"]),
+              "price": rnd.randint(50, 300), "currency": rnd.choice(["USD", "GBP"]), "rating": 4.0}
+             for i in range(rnd.randint(2, 8))]
+    # Some stays are only open for the first two nights
+    availability = [{"stay_id": s["id"], "check_in": "2025-09-01",
+                     "check_out": rnd.choice(["2025-09-03", "2025-09-10", "2025-09-10"]),
+                     "rooms": [{"room_id": "r1", "available": True}]} for s in stays]
+    cars = [{"id": i, "pickup": {"city": "Paris"}, "dropoff": {"city": rnd.choice(["Paris", "Paris", "Nice"])},
+             "price": rnd.choice([{"total": 200, "currency": "EUR"}, {"per_day": 40, "total": 999}])}
+            for i in range(rnd.randint(1, 5))]
+    return flights, stays, availability, cars
+
+def trip_bundles(flights, stays, availability, cars, include_car, price_max):
+    """(USD total, ids) of every flight + stay (+ car) for JFK -> Paris, 2025-09-01 to 2025-09-04."""
+    def usd(amount, currency):
+        return amount / USD_RATES[currency] if currency in USD_RATES else None
+    options = [
+        [(usd(f["price"]["total"], f["price"]["currency"]), f["id"]) for f in flights
+         if f["legs"][0]["segments"][0]["to"]["code"] in ("CDG", "ORY")
+         and f["legs"][1]["segments"][0]["depart_utc"].startswith("2025-09-04")],
+        [(usd(s["price"] * 3, s["currency"]), s["id"]) for s, a in zip(stays, availability)
+         if s["location"] == "Paris, France" and a["check_out"] == "2025-09-10"],
+    ]
+    if include_car:
+        options.append([(usd(c["price"].get("per_day", 0) * 3 or c["price"]["total"], c["price"].get("currency")
+                             or "USD"), str(c["id"])) for c in cars if c["dropoff"]["city"] == "Paris"])
+    out = []
+    for combo in itertools.product(*[[o for o in opts if o[0] is not None] for opts in options]):
+        total = sum(price for price, _ in combo)
+        if price_max is None or total <= price_max:
+            out.append((total, "|".join(i for _, i in combo)))
+    return sorted(out)
+
+@pytest.mark.parametrize("include_car", [False, True])
+@pytest.mark.parametrize("seed", range(10))
+def test_packages_match_every_combination(monkeypatch, seed, include_car):
+    rnd = random.Random(seed)
+    flights, stays, availability, cars = generate_trip(rnd)
+    monkeypatch.setattr(packages_service, "rental_availability", RentalAvailability())
+    monkeypatch.setattr(packages_service, "current", lambda: snapshot(
+        flights=FlightCatalog([], flights), stays=StayCatalog(stays, availability=availability),
+        cars=CarCatalog(cars), airports=AirportIndex(AIRPORTS)))
+    price_max = rnd.choice([None, 1200.0])
+    expected = trip_bundles(flights, stays, availability, cars, include_car, price_max)
+
+    got, cursor = [], None
+    while True:
+        page = packages_service.build_packages("JFK", "Paris, France", "2025-09-01", "2025-09-04", include_car,
+                                               price_max, limit=3, cursor=cursor)
+        got.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert [b["price"]["amount"] for b in got] == [round(total, 2) for total, _ in expected]
+    assert sorted(b["id"] for b in got) == sorted(ids for _, ids in expected)
+    assert all(b["price"]["currency"] == "USD" for b in got)
@@ -0,0 +1,130 @@
+import random
+
+import pytest
+
+from app.core import cache
+from app.core.cache import SearchCache, cached_search
+from app.core.config import settings
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class Reference:
+    """The same policy spelled out: a list in recency order, scanned on every operation."""
+
+    def __init__(self, max_entries, max_items, ttl, clock):
+        self.max_entries, self.max_items, self.ttl, self.clock = max_entries, max_items, ttl, clock
+        self.entries = []  # [key, expires, weight, value], least recently used first
+
+    def find(self, key):
+        return next((e for e in self.entries if e[0] == key), None)
+
+    def get(self, key):
+        entry = self.find(key)
+        if entry is not None and entry[1] <= self.clock():
+            self.entries.remove(entry)
+            entry = None
+        if entry is None:
+            return False, None
+        self.entries.remove(entry)
+        self.entries.append(entry)
+        return True, entry[3]
+
+    def put(self, key, value, weight):
+        if weight > self.max_items:
+            return
+        entry = self.find(key)
+        if entry is not None:
+            self.entries.remove(entry)
+        self.entries.append([key, self.clock() + self.ttl, weight, value])
+        while len(self.entries) > self.max_entries or sum(e[2] for e in self.entries) > self.max_items:
+            self.entries.pop(0)
+
+    def invalidate(self, namespace):
+        self.entries = [e for e in self.entries if namespace is not None and e[0][0] != namespace]
+
+@pytest.mark.parametrize("seed", range(10))
+def test_cache_matches_the_reference_policy(seed):
+    rnd = random.Random(seed)
+    clock = Clock()
+    limits = (rnd.choice([3, 8, 50]), rnd.choice([5, 20, 1000]), rnd.choice([5.0, 50.0]))
+    search_cache, reference = SearchCache(*limits, clock=clock), Reference(*limits, clock)
+    for step in range(2000):
+        key = (rnd.choice(["flights", "stays"]), rnd.randint(0, 12))
+        op = rnd.random()
+        if op < 0.45:
+            assert search_cache.get(key) == reference.get(key)
+        elif op < 0.9:
+            weight = rnd.randint(1, 6)
+            search_cache.put(key, step, weight)
+            reference.put(key, step, weight)
+        elif op < 0.95:
+            clock.now += rnd.uniform(0, 4)
+        else:
+            namespace = rnd.choice([None, "flights"])
+            search_cache.invalidate(namespace)
+            reference.invalidate(namespace)
+        stats = search_cache.stats()
+        assert stats["entries"] == len(reference.entries)
+        assert stats["items"] == sum(e[2] for e in reference.entries)
+
+def test_targeted_invalidation_keeps_other_keys():
+    search_cache = SearchCache(10, 100, 60)
+    for key in [("cars", 1), ("cars", 2), ("stays", 1)]:
+        search_cache.put(key, key)
+    search_cache.invalidate("cars", match=lambda key: key[1] == 1)
+    assert [search_cache.get(k)[0] for k in [("cars", 1), ("cars", 2), ("stays", 1)]] == [False, True, True]
+
+def test_result_from_before_an_invalidation_is_not_stored():
+    search_cache = SearchCache(10, 100, 60)
+    generation = search_cache.generation("flights")
+    search_cache.invalidate("stays")
+    search_cache.put(("flights", 1), "kept", generation=generation)
+    assert search_cache.get(("flights", 1)) == (True, "kept")
+
+    search_cache.invalidate("flights")
+    search_cache.put(("flights", 2), "stale", generation=generation)
+    generation = search_cache.generation("flights")
+    search_cache.invalidate()
+    search_cache.put(("flights", 3), "stale", generation=generation)
+    assert search_cache.stats()["entries"] == 0
+
+@pytest.fixture
+def enabled(monkeypatch):
+    search_cache = SearchCache(100, 1000, 60)
+    monkeypatch.setattr(settings, "SEARCH_CACHE_ENABLED", True)
+    monkeypatch.setattr(cache, "search_cache", search_cache)
+    return search_cache
+
+def test_equivalent_queries_share_one_entry(enabled):
+    calls = []
+
+    @cached_search("stays", upper=("code",), lower=("location",), ignore=("passengers",))
+    def search(code, location, amenities, passengers=1, sort_by=None):
+        calls.append(1)
+        return {"items": [code, location]}
+
+    first = search("jfk", "Paris", ["wifi", "pool"])
+    assert search("JFK", "PARIS", ("pool", "wifi"), passengers=3) is first
+    search("JFK", "Paris", ["wifi", "pool"], sort_by="price_asc")
+    assert len(calls) == 2
+    assert enabled.stats()["namespaces"]["stays"] == {"hits": 1, "misses": 2, "hit_rate": 0.3333}
+
+def test_errors_and_unhashable_arguments_are_not_cached(enabled):
+    calls = []
+
+    @cached_search("stays")
+    def search(value):
+        calls.append(1)
+        return {"error": "bad"} if value == "bad" else {"items": []}
+
+    search("bad")
+    search("bad")
+    search({"not": "hashable"})
+    search({"not": "hashable"})
+    assert len(calls) == 4
+    assert enabled.stats()["entries"] == 0
@@ -0,0 +1,91 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from app.catalog.calendar import MAX_WINDOW_DAYS, FareCalendar
+from app.catalog.flights import FlightIndex
+from app.core.currency import USD_RATES
+from app.core.errors import InvalidParameter
+from conftest import itinerary
+
+START = date(2025, 9, 1)
+
+def day(offset):
+    return (START + timedelta(days=offset)).isoformat()
+
+def generate(rnd, count, round_trip):
+    flights = []
+    for i in range(count):
+        origin, destination = rnd.choice([("JFK", "LAX"), ("LAX", "JFK")])
+        out = rnd.randint(0, 9)
+        currency = rnd.choice(list(USD_RATES))
+        flights.append(itinerary(
+            f"{'R' if round_trip else 'F'}{i}", origin, destination, f"{day(out)}T{rnd.randint(0, 23):02d}:00:00",
+            price=round(rnd.uniform(80, 600) * USD_RATES[currency]), currency=currency,
+            airline=rnd.choice(["AA", "UA"]), stops=rnd.choice([0, 1]),
+            returns=f"{day(out + rnd.randint(1, 5))}T10:00:00" if round_trip else None,
+        ))
+    return flights
+
+def usd(flight):
+    return flight["price"]["total"] / USD_RATES[flight["price"]["currency"]]
+
+def cheapest(flights, key, airline=None):
+    """key(flight) -> (USD price, id) of the cheapest flight from JFK to LAX, first in file order on ties."""
+    best = {}
+    for f in flights:
+        segment = f["legs"][0]["segments"][0]
+        if (segment["from"]["code"], segment["to"]["code"]) != ("JFK", "LAX"):
+            continue
+        if airline and f["airline"]["code"] != airline:
+            continue
+        k = key(f)
+        if k not in best or usd(f) < best[k][0]:
+            best[k] = (usd(f), f["id"])
+    return {k: (round(price, 2), flight_id) for k, (price, flight_id) in best.items()}
+
+@pytest.mark.parametrize("airline", [None, "UA"])
+@pytest.mark.parametrize("seed", range(6))
+def test_one_way_days_match_the_cheapest_flight(seed, airline):
+    one_way = generate(random.Random(seed), 120, False)
+    calendar = FareCalendar(FlightIndex(one_way), FlightIndex([]))
+    result = calendar.one_way("jfk", "lax", day(-1), day(10), airline=airline)
+
+    best = cheapest(one_way, lambda f: f["legs"][0]["segments"][0]["depart_utc"][:10], airline)
+    assert result["currency"] == "USD"
+    for entry in result["days"]:
+        price, flight_id = best.get(entry["date"], (None, None))
+        assert (entry["min_price"], entry["flight_id"]) == (price, flight_id)
+        assert entry["currency"] == ("USD" if price is not None else None)
+    assert (result["cheapest"]["min_price"], result["cheapest"]["flight_id"]) == min(best.values(),
+                                                                                      key=lambda b: b[0])
+
+@pytest.mark.parametrize("seed", range(6))
+def test_round_trip_grid_matches_the_cheapest_pair(seed):
+    round_trip = generate(random.Random(seed), 200, True)
+    calendar = FareCalendar(FlightIndex([]), FlightIndex(round_trip))
+    result = calendar.round_trip("JFK", "LAX", day(0), day(9), day(1), day(14))
+
+    best = cheapest(round_trip, lambda f: (f["legs"][0]["segments"][0]["depart_utc"][:10],
+                                           f["legs"][1]["segments"][0]["depart_utc"][:10]))
+    assert result["currency"] == "USD"
+    for i, d in enumerate(result["depart_dates"]):
+        for j, r in enumerate(result["return_dates"]):
+            assert result["prices"][i][j] == best.get((d, r), (None,))[0]
+    assert result["cheapest"]["min_price"] == min(price for price, _ in best.values())
+
+def test_cheapest_day_is_compared_in_usd():
+    one_way = [
+        itinerary("EUR", "JFK", "LAX", "2025-09-01T08:00:00", price=231, currency="EUR"),
+        itinerary("USD", "JFK", "LAX", "2025-09-02T08:00:00", price=250, currency="USD"),
+        itinerary("XXX", "JFK", "LAX", "2025-09-03T08:00:00", price=1, currency="XXX"),
+    ]
+    result = FareCalendar(FlightIndex(one_way), FlightIndex([])).one_way("JFK", "LAX", day(0), day(2))
+    assert [d["min_price"] for d in result["days"]] == [round(231 / 0.85, 2), 250.0, None]
+    assert result["cheapest"]["flight_id"] == "USD"
+
+@pytest.mark.parametrize("start, end", [(day(3), day(1)), ("tomorrow", day(1)), (day(0), day(MAX_WINDOW_DAYS))])
+def test_invalid_windows_are_rejected(start, end):
+    with pytest.raises(InvalidParameter):
+        FareCalendar(FlightIndex([]), FlightIndex([])).one_way("JFK", "LAX", start, end)
@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from app.catalog.cars import CarCatalog
+from app.services import cars_service
+from conftest import snapshot
+
+PLACES = [
+    {"city": "Los Angeles", "airport_code": "LAX"},
+    {"city": "San Francisco", "airport_code": "SFO"},
+    {"city": "Sanford", "airport_code": "SFB"},
+    {"city": "Angers", "airport_code": None},
+    {"city": "Las Vegas", "airport_code": "LAS"},
+]
+LOCATIONS = [{"id": "cl-1", "city": "Los Angeles", "airport_code": "LAX"},
+             {"id": "cl-2", "city": "Angers", "airport_code": None}]
+
+def generate_cars(rnd, count):
+    return [{"id": i, "pickup": dict(rnd.choice(PLACES)), "dropoff": dict(rnd.choice(PLACES)),
+             "price": {"total": rnd.choice([40, 60, 80])}, "rating": rnd.choice([3.9, 4.5])} for i in range(count)]
+
+def place_matches(place, query, ids):
+    """The original rule (substring of the city, or the airport code), plus the location id."""
+    query = query.lower()
+    airport = (place.get("airport_code") or "").lower()
+    return query in place["city"].lower() or query == airport or ids.get((place["city"], place["airport_code"])) == query
+
+QUERIES = ["LAX", "lax", "an", "San", "s", "Angeles", "sfb", "cl-1", "CL-2", "Paris", "x", "LA"]
+
+@pytest.mark.parametrize("seed", range(6))
+def test_location_lookups_match_a_scan(seed):
+    rnd = random.Random(seed)
+    cars = generate_cars(rnd, 200)
+    catalog = CarCatalog(cars, LOCATIONS)
+    ids = {(entry["city"], entry["airport_code"]): entry["id"] for entry in LOCATIONS}
+    for _ in range(50):
+        pickup, dropoff = rnd.choice([None] + QUERIES), rnd.choice([None] + QUERIES)
+        expected = [c["id"] for c in cars
+                    if (not pickup or place_matches(c["pickup"], pickup, ids))
+                    and (not dropoff or place_matches(c["dropoff"], dropoff, ids))]
+        assert [c["id"] for c in catalog.take(catalog.candidates(pickup, dropoff))] == expected
+
+def test_locations_match_without_accents_or_case():
+    cars = [{"id": 1, "pickup": {"city": "Zürich", "airport_code": "ZRH"}},
+            {"id": 2, "pickup": {"city": "São Paulo", "airport_code": "GRU"}},
+            {"id": 3, "pickup": None}]
+    catalog = CarCatalog(cars)
+    assert catalog.candidates("zurich").tolist() == [0]
+    assert catalog.candidates("SAO PAULO").tolist() == [1]
+    assert catalog.candidates("zür").tolist() == [0]
+    assert catalog.candidates().tolist() == [0, 1, 2]
+
+def test_car_search_pages_the_location_matches(monkeypatch):
+    cars = generate_cars(random.Random(0), 100)
+    monkeypatch.setattr(cars_service, "current", lambda: snapshot(cars=CarCatalog(cars, LOCATIONS)))
+    result = cars_service.search_cars("cl-1", "san", None, None, None, None, None, None, 60, None, None, None,
+                                      None, "price_desc", limit=5)
+    expected = sorted((c for c in cars if c["pickup"]["airport_code"] == "LAX"
+                       and c["dropoff"]["city"] in ("San Francisco", "Sanford") and c["price"]["total"] <= 60),
+                      key=lambda c: c["price"]["total"], reverse=True)
+    assert result["count"] == len(expected)
+    assert result["items"] == expected[:5]
@@ -0,0 +1,60 @@
+import json
+from datetime import date
+
+import pytest
+
+import generate_cruise_data
+from app.catalog.cruise_details import DETAILS_DIR, INDEX_NAME, CruiseDetailStore, scan_segments, segment_generation
+
+@pytest.fixture
+def generated(tmp_path, monkeypatch):
+    """Writes 50 sailings in segments of 8 into tmp_path, the way the generator lays them out."""
+    monkeypatch.setattr(generate_cruise_data, "DATA_DIR", tmp_path)
+    _, details = generate_cruise_data.generate_records(50, date(2025, 9, 1), 60, "test")
+    generate_cruise_data.write_files([], details, 8)
+    return tmp_path / DETAILS_DIR, details
+
+def read_index(directory):
+    return json.loads((directory / INDEX_NAME).read_text(encoding="utf-8"))
+
+@pytest.mark.parametrize("from_index", [True, False])
+def test_every_document_is_read_back(generated, from_index):
+    directory, details = generated
+    details_store = CruiseDetailStore(directory, read_index(directory) if from_index else None, cache_size=4)
+    assert len(details_store) == len(details)
+    for record in details + details[::-1]:
+        assert details_store.get(record["id"]) == record
+    assert details_store.get("missing") is None
+
+def test_scan_matches_the_written_index(generated):
+    directory, _ = generated
+    index = read_index(directory)
+    assert scan_segments(directory) == (index["segments"], index["records"])
+
+def test_rewrites_keep_one_older_generation(generated):
+    directory, details = generated
+    for _ in range(3):
+        generate_cruise_data.write_files([], details[:10], 8)
+    generations = sorted({segment_generation(p.name) for p in directory.glob("segment-*.jsonl")})
+    assert generations == [3, 4]
+    assert read_index(directory)["generation"] == 4
+    assert len(CruiseDetailStore(directory)) == 10
+
+def test_stale_index_is_a_miss_and_reported_once(generated):
+    directory, details = generated
+    calls = []
+    details_store = CruiseDetailStore(directory, read_index(directory), on_stale=lambda: calls.append(1))
+    index = read_index(directory)
+    for name in index["segments"]:
+        (directory / name).write_text("", encoding="utf-8")
+    assert details_store.get(details[0]["id"]) is None
+    assert details_store.get(details[-1]["id"]) is None
+    assert calls == [1]
+
+def test_legacy_documents_fill_in_missing_ids(generated):
+    directory, details = generated
+    legacy = {"cruise_details": [{"id": "legacy-1", "name": "Old"}, {"id": details[0]["id"], "name": "Shadowed"}]}
+    details_store = CruiseDetailStore(directory, read_index(directory), legacy=legacy)
+    assert details_store.get("legacy-1")["name"] == "Old"
+    assert details_store.get(details[0]["id"]) == details[0]
+    assert len(details_store) == len(details) + 1
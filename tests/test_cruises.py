@@ -0,0 +1,69 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from app.catalog.cruises import CruiseCatalog
+from app.services import cruises_service
+from conftest import snapshot
+from generate_cruise_data import generate_records
+
+START = date(2025, 9, 1)
+
+def day(offset):
+    return (START + timedelta(days=offset)).isoformat()
+
+def scan(cruises, date_from=None, date_to=None, cruise_line=None, nights=None, nights_min=None, nights_max=None,
+         destination=None, departure_port=None, price_min=None, price_max=None):
+    """Ids the original list comprehensions (plus the new ranges) return, in file order."""
+    return [c["id"] for c in cruises
+            if (not date_from or c["departure_date"] >= date_from)
+            and (not date_to or c["departure_date"] <= date_to)
+            and (not cruise_line or c["cruise_line"].lower() == cruise_line.lower())
+            and (not nights or c["nights"] == nights)
+            and (nights_min is None or c["nights"] >= nights_min)
+            and (nights_max is None or c["nights"] <= nights_max)
+            and (not destination or destination.lower() in c["destination"].lower())
+            and (not departure_port or departure_port.lower() in c["departure_port"].lower())
+            and (price_min is None or c["price"] >= price_min)
+            and (price_max is None or c["price"] <= price_max)]
+
+def random_query(rnd):
+    return {
+        "date_from": rnd.choice([None, "", day(rnd.randint(-5, 60))]),
+        "date_to": rnd.choice([None, day(rnd.randint(0, 70))]),
+        "cruise_line": rnd.choice([None, None, "carnival", "MSC", "Disney"]),
+        "nights": rnd.choice([None, None, 0, 7, 9]),
+        "nights_min": rnd.choice([None, 5]),
+        "nights_max": rnd.choice([None, 10]),
+        "destination": rnd.choice([None, None, "caribbean", "ASIA", "an"]),
+        "departure_port": rnd.choice([None, None, "miami", "a", "Atlantis"]),
+        "price_min": rnd.choice([None, 700]),
+        "price_max": rnd.choice([None, 1500]),
+    }
+
+@pytest.mark.parametrize("seed", range(8))
+def test_select_matches_the_chained_filters(seed):
+    rnd = random.Random(seed)
+    cruises, _ = generate_records(400, START, 60, f"test-{seed}")
+    catalog = CruiseCatalog.from_document({"cruises": cruises})
+    for _ in range(80):
+        query = random_query(rnd)
+        assert [c["id"] for c in catalog.take(catalog.select(**query))] == scan(cruises, **query)
+
+@pytest.mark.parametrize("limit", [1, 7, 100])
+def test_cruise_pages_walk_the_matches_once(monkeypatch, limit):
+    cruises, _ = generate_records(150, START, 60, "pages")
+    monkeypatch.setattr(cruises_service, "current", lambda: snapshot(cruises=CruiseCatalog(cruises)))
+    expected = scan(cruises, date_from=day(10), nights_max=7)
+    assert [c["id"] for c in cruises_service.search_cruises(day(10), nights_max=7)] == expected
+
+    seen, cursor = [], None
+    while True:
+        page = cruises_service.search_cruises(day(10), nights_max=7, limit=limit, cursor=cursor)
+        assert page["count"] == len(expected)
+        seen.extend(c["id"] for c in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == expected
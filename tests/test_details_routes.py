@@ -0,0 +1,42 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers import activities, cars, cruises, flights, packages, stays, things_to_do
+from app.services import (activities_service, cars_service, cruises_service, flights_service, packages_service,
+                          stays_service, things_to_do_service)
+from conftest import snapshot
+
+# (detail URL for record id 1 / ttd-1, service module, dataset the service reads)
+DETAIL_ROUTES = [
+    ("/activities/details/1", activities_service, "details/activities"),
+    ("/cars/details/1", cars_service, "details/cars"),
+    ("/cruises/1", cruises_service, "cruise_details"),
+    ("/flights/details/1", flights_service, "details/flights"),
+    ("/packages/details/1", packages_service, "details/packages"),
+    ("/stays/details/1", stays_service, "details/stays"),
+    ("/things-to-do/ttd-1", things_to_do_service, "details/things_to_do"),
+]
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    for module in (activities, cars, cruises, flights, packages, stays, things_to_do):
+        app.include_router(module.router)
+    return TestClient(app)
+
+@pytest.mark.parametrize("url, service, dataset", DETAIL_ROUTES)
+def test_unavailable_details_are_a_503(client, monkeypatch, url, service, dataset):
+    monkeypatch.setattr(service, "current", lambda: snapshot())
+    response = client.get(url)
+    assert response.status_code == 503
+    assert dataset in response.json()["detail"]
+
+@pytest.mark.parametrize("url, service, dataset", [r for r in DETAIL_ROUTES if r[2].startswith("details/")])
+def test_loaded_details_are_served(client, monkeypatch, url, service, dataset):
+    record_id = url.rsplit("/", 1)[1]
+    record = {"id": record_id, "name": "Record 1"}
+    monkeypatch.setattr(service, "current", lambda: snapshot(**{dataset: {record_id: record}}))
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.json()["name"] == "Record 1"
@@ -0,0 +1,107 @@
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from app.catalog.cars import CarCatalog
+from app.catalog.flights import FLIGHT_FACETS, FlightIndex
+from app.catalog.stays import StayCatalog
+from app.core.errors import InvalidParameter
+from app.core.facets import parse_facets, price_histogram
+from test_flight_index import AIRPORTS, chained, generate_fares, random_filters
+
+# facet -> the filter arguments it ignores when counted
+FLIGHT_FILTERS = {"airline": ("airline",), "stops": ("stops",), "seat_class": ("seat_class",),
+                  "price": ("price_min", "price_max")}
+
+def flight_counts(facet, matched):
+    if facet == "airline":
+        return Counter(f["airline"]["code"] for f in matched)
+    if facet == "stops":
+        return Counter("2+" if f["stops"] >= 2 else str(f["stops"]) for f in matched)
+    if facet == "seat_class":
+        return Counter(name for f in matched for name in f["seat_classes"])
+    return price_histogram(np.array([f["price"]["total"] for f in matched], dtype=np.float64))
+
+def nonzero(counts):
+    return {k: v for k, v in counts.items() if v}
+
+@pytest.mark.parametrize("seed", range(8))
+def test_flight_facets_match_the_chained_filters(seed):
+    rnd = random.Random(seed)
+    flights = generate_fares(rnd, 300, round_trip=True)
+    index = FlightIndex(flights)
+    for _ in range(30):
+        origins, destinations = rnd.sample(AIRPORTS[:3], rnd.randint(1, 2)), rnd.sample(AIRPORTS[:3], 1)
+        filters = random_filters(rnd, round_trip=True)
+        filters.pop("sort_by")
+        got = index.facets(origins, destinations, list(FLIGHT_FACETS), **filters)
+        for facet, own in FLIGHT_FILTERS.items():
+            matched = chained(flights, origins, destinations, **{k: v for k, v in filters.items() if k not in own})
+            expected = flight_counts(facet, matched)
+            if facet == "price":
+                assert got[facet] == expected
+            else:
+                assert nonzero(got[facet]) == dict(expected)
+
+def test_flight_facets_list_every_value_seen():
+    flights = generate_fares(random.Random(0), 50)
+    index = FlightIndex(flights)
+    got = index.facets("JFK", "LAX", ["airline", "stops", "seat_class"], airline="ZZ")
+    assert set(got["airline"]) == {"AA", "UA", "DL"}
+    assert list(got["stops"]) == ["0", "1", "2+"]
+    assert list(got["seat_class"])[:4] == ["economy", "premium_economy", "business", "first"]
+
+CAR_TYPES = ["SUV", "suv", "Compact", "Van"]
+COMPANIES = ["Hertz", "Avis", "AVIS"]
+
+def generate_cars(rnd, count):
+    return [{"id": i, "car_type": rnd.choice(CAR_TYPES), "company": rnd.choice(COMPANIES),
+             "transmission": rnd.choice(["automatic", "manual"]), "fuel_policy": rnd.choice(["full", "empty"]),
+             "price": {"total": rnd.choice([30, 55, 90])}, "capacity": {"seats": rnd.choice([2, 5, 7])},
+             "free_cancellation": rnd.choice([True, False, None])} for i in range(count)]
+
+def car_matches(car, car_type=None, company=None, price_max=None, seats_min=None, transmission=None,
+                free_cancellation=None):
+    return ((not car_type or car["car_type"].lower() in {c.lower() for c in car_type})
+            and (not company or car["company"].lower() in {c.lower() for c in company})
+            and (price_max is None or car["price"]["total"] <= price_max)
+            and (seats_min is None or car["capacity"]["seats"] >= seats_min)
+            and (not transmission or car["transmission"] == transmission)
+            and (free_cancellation is None or car["free_cancellation"] is free_cancellation))
+
+@pytest.mark.parametrize("seed", range(6))
+def test_car_facets_match_per_car_checks(seed):
+    rnd = random.Random(seed)
+    cars = generate_cars(rnd, 200)
+    catalog = CarCatalog(cars)
+    rows = np.arange(len(cars))
+    own = {"car_type": ("car_type",), "company": ("company",), "transmission": ("transmission",),
+           "price": ("price_max",)}
+    for _ in range(30):
+        filters = {"car_type": rnd.choice([None, ["suv"], ["Compact", "VAN"]]), "company": rnd.choice([None, ["avis"]]),
+                   "price_max": rnd.choice([None, 55]), "seats_min": rnd.choice([None, 5]),
+                   "transmission": rnd.choice([None, "manual"]), "free_cancellation": rnd.choice([None, True])}
+        got = catalog.facets(rows, list(own), **filters)
+        for facet, ignored in own.items():
+            matched = [c for c in cars if car_matches(c, **{k: v for k, v in filters.items() if k not in ignored})]
+            if facet == "price":
+                assert got[facet] == price_histogram(np.array([c["price"]["total"] for c in matched], dtype=float))
+            else:
+                # Case-insensitive values are counted under the first spelling seen
+                label = {c[facet].lower(): c[facet] for c in reversed(cars)}
+                assert nonzero(got[facet]) == dict(Counter(label[c[facet].lower()] for c in matched))
+
+def test_stay_star_facet_ignores_the_star_filter():
+    stays = [{"id": i, "stars": stars, "price": 100 + i} for i, stars in enumerate([3, 4, 4, 5, 3])]
+    stays.append({"id": 5, "price": 300})
+    catalog = StayCatalog(stays)
+    got = catalog.facets(np.arange(len(stays)), ["stars", "price"], price_max=103, stars=4)
+    assert got["stars"] == {"3": 1, "4": 2, "5": 1}
+    assert got["price"] == price_histogram(np.array([101.0, 102.0]))
+
+def test_unknown_facets_are_rejected():
+    assert parse_facets("price, airline,price", FLIGHT_FACETS) == ["price", "airline"]
+    with pytest.raises(InvalidParameter):
+        parse_facets("airline,colour", FLIGHT_FACETS)
@@ -0,0 +1,136 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from app.catalog.flights import FlightIndex
+from conftest import itinerary
+
+AIRPORTS = ["JFK", "LAX", "SFO", "EWR"]
+START = date(2025, 9, 1)
+
+def generate_flights(rnd, count):
+    flights = []
+    for i in range(count):
+        origin, via, destination = rnd.sample(AIRPORTS, 3)
+        depart = f"{START + timedelta(days=rnd.randint(0, 40))}T{rnd.randint(0, 23):02d}:00:00"
+        flight = itinerary(f"F{i}", origin, via if rnd.random() < 0.3 else destination, depart,
+                           minutes=rnd.randrange(60, 600, 30))
+        if flight["legs"][0]["segments"][0]["to"]["code"] == via:
+            # A connection: the route runs from the first segment's origin to the last segment's destination
+            flight["legs"][0]["segments"].append({"from": {"code": via}, "to": {"code": destination},
+                                                  "depart_utc": "2025-12-01T00:00:00Z",
+                                                  "arrive_utc": "2025-12-01T02:00:00Z"})
+        flights.append(flight)
+    return flights
+
+def scan(flights, origin, destination, depart=None):
+    """Ids on a route the per-request scan found, by departure date and then file order like the index rows."""
+    found = [f for f in flights
+             if f["legs"][0]["segments"][0]["from"]["code"] == origin.upper()
+             and f["legs"][0]["segments"][-1]["to"]["code"] == destination.upper()
+             and (not depart or f["legs"][0]["segments"][0]["depart_utc"].startswith(depart))]
+    return [f["id"] for f in sorted(found, key=lambda f: f["legs"][0]["segments"][0]["depart_utc"][:10])]
+
+@pytest.mark.parametrize("seed", range(8))
+def test_route_and_date_lookups_match_a_scan(seed):
+    rnd = random.Random(seed)
+    flights = generate_flights(rnd, 400)
+    index = FlightIndex(flights)
+    assert len(index) == len(flights)
+    for _ in range(60):
+        origin, destination = rnd.sample(AIRPORTS, 2)
+        day = START + timedelta(days=rnd.randint(-1, 41))
+        depart = rnd.choice([None, day.isoformat(), day.isoformat()[:7], "2025-1"])
+        got = [f["id"] for f in index.take(index.rows(origin.lower(), destination, depart))]
+        assert got == scan(flights, origin, destination, depart)
+
+def test_routes_are_listed_once():
+    flights = generate_flights(random.Random(0), 200)
+    index = FlightIndex(flights)
+    expected = {(f["legs"][0]["segments"][0]["from"]["code"], f["legs"][0]["segments"][-1]["to"]["code"])
+                for f in flights}
+    assert sorted(index.routes()) == sorted(expected)
+
+def test_itineraries_without_segments_are_skipped():
+    flights = [itinerary("A", "JFK", "LAX", "2025-09-01T08:00:00"), {"id": "B", "legs": []}, {"id": "C"}]
+    index = FlightIndex(flights)
+    assert len(index) == 1
+    assert index.take(index.rows("JFK", "LAX", "2025-09-01")) == [flights[0]]
+    assert len(index.rows("LAX", "JFK")) == 0
+
+def generate_fares(rnd, count, round_trip=False):
+    """Itineraries between two airports with few distinct filter and sort values, so ties are common."""
+    flights = []
+    for i in range(count):
+        origin, destination = rnd.sample(AIRPORTS[:3], 2)
+        out = START + timedelta(days=rnd.randint(0, 3))
+        flights.append(itinerary(
+            f"F{i}", origin, destination, f"{out}T{rnd.choice([8, 12, 18]):02d}:00:00",
+            minutes=rnd.choice([90, 120, 300]), price=rnd.choice([99, 150, 150.5, 420]),
+            airline=rnd.choice(["AA", "UA", "DL"]), stops=rnd.choice([0, 1, 2, 3]),
+            seat_classes=rnd.sample(["economy", "business", "first"], rnd.randint(0, 2)),
+            returns=f"{out + timedelta(days=rnd.randint(1, 3))}T10:00:00" if round_trip else None,
+        ))
+    return flights
+
+def chained(flights, origins, destinations, depart=None, returnd=None, seat_class=None, stops=None,
+            airline=None, price_min=None, price_max=None, sort_by=None):
+    """The list comprehensions and sorted() calls of the original flight search."""
+    out = [r for r in flights
+           if r["legs"][0]["segments"][0]["from"]["code"] in origins
+           and r["legs"][0]["segments"][-1]["to"]["code"] in destinations]
+    if depart:
+        out = [r for r in out if r["legs"][0]["segments"][0]["depart_utc"].startswith(depart)]
+    if returnd:
+        out = [r for r in out if r["legs"][1]["segments"][0]["depart_utc"].startswith(returnd)]
+    if seat_class:
+        out = [r for r in out if seat_class in r.get("seat_classes", [])]
+    if stops is not None:
+        out = [r for r in out if (r["stops"] == stops if stops in (0, 1) else r["stops"] >= 2)]
+    if airline:
+        out = [r for r in out if r["airline"]["code"] == airline.upper()]
+    if price_min is not None:
+        out = [r for r in out if r["price"]["total"] >= price_min]
+    if price_max is not None:
+        out = [r for r in out if r["price"]["total"] <= price_max]
+    if sort_by == "price_asc":
+        out = sorted(out, key=lambda r: r["price"]["total"])
+    elif sort_by == "price_desc":
+        out = sorted(out, key=lambda r: r["price"]["total"], reverse=True)
+    elif sort_by == "duration":
+        out = sorted(out, key=lambda r: r["duration_total_minutes"])
+    elif sort_by == "departure_time":
+        out = sorted(out, key=lambda r: r["legs"][0]["segments"][0]["depart_utc"])
+    return out
+
+def random_filters(rnd, round_trip=False):
+    filters = {
+        "depart": rnd.choice([None, "2025-09-02", "2025-09"]),
+        "seat_class": rnd.choice([None, "economy", "first", "premium_economy"]),
+        "stops": rnd.choice([None, 0, 1, 2]),
+        "airline": rnd.choice([None, "aa", "UA", "ZZ"]),
+        "price_min": rnd.choice([None, 150]),
+        "price_max": rnd.choice([None, 150.5, 400]),
+        "sort_by": rnd.choice([None, "price_asc", "price_desc", "duration", "departure_time"]),
+    }
+    if round_trip:
+        filters["returnd"] = rnd.choice([None, "2025-09-04", "2025-09"])
+    return filters
+
+@pytest.mark.parametrize("round_trip", [False, True])
+@pytest.mark.parametrize("seed", range(8))
+def test_select_matches_the_chained_filters(seed, round_trip):
+    rnd = random.Random(seed)
+    flights = generate_fares(rnd, 300, round_trip)
+    index = FlightIndex(flights)
+    for _ in range(40):
+        origins = rnd.sample(AIRPORTS[:3], rnd.randint(1, 2))
+        destinations = rnd.sample(AIRPORTS[:3], rnd.randint(1, 2))
+        filters = random_filters(rnd, round_trip)
+        expected = [f["id"] for f in chained(flights, origins, destinations, **filters)]
+        origin = origins[0] if len(origins) == 1 else origins
+        items, total, cursor = index.search(origin, destinations, **filters)
+        assert [f["id"] for f in items] == expected
+        assert total == len(expected)
+        assert cursor is None
@@ -0,0 +1,55 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.catalog.airports import AirportIndex
+from app.catalog.flights import FlightCatalog
+from app.routers import flights
+from app.services import flights_service
+from conftest import itinerary, snapshot
+
+ONE_WAY = "/flights/search/one-way?origin=JFK&destination=LAX&depart=2025-09-01"
+ROUND_TRIP = "/flights/search/round-trip?origin=JFK&destination=LAX&depart=2025-09-01&returnd=2025-09-05"
+CONNECTIONS = "/flights/search/connections?origin=JFK&destination=LAX&depart=2025-09-01"
+NDJSON = {"Accept": "application/x-ndjson"}
+
+@pytest.fixture
+def client(monkeypatch):
+    catalog = FlightCatalog(
+        [itinerary(f"F{i}", "JFK", "LAX", f"2025-09-01T{8 + i:02d}:00:00", price=100 + i) for i in range(5)],
+        [itinerary(f"R{i}", "JFK", "LAX", f"2025-09-01T{8 + i:02d}:00:00", price=300 + i,
+                   returns="2025-09-05T10:00:00") for i in range(5)],
+    )
+    monkeypatch.setattr(flights_service, "current",
+                        lambda: snapshot(flights=catalog, airports=AirportIndex([])))
+    app = FastAPI()
+    app.include_router(flights.router)
+    return TestClient(app)
+
+@pytest.mark.parametrize("url", [ONE_WAY, ROUND_TRIP])
+@pytest.mark.parametrize("headers", [{}, NDJSON])
+def test_bad_cursor_is_a_400_in_json_and_ndjson(client, url, headers):
+    response = client.get(url + "&limit=2&cursor=garbage", headers=headers)
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+@pytest.mark.parametrize("url", [ONE_WAY, ROUND_TRIP])
+def test_unknown_facet_is_a_400(client, url):
+    response = client.get(url + "&facets=bogus")
+    assert response.status_code == 400
+    assert "bogus" in response.json()["detail"]
+
+def test_bad_connection_date_is_a_400(client):
+    response = client.get(CONNECTIONS.replace("2025-09-01", "September"))
+    assert response.status_code == 400
+
+def test_valid_search_pages_through_results(client):
+    first = client.get(ONE_WAY + "&limit=2&sort_by=price_asc").json()
+    second = client.get(ONE_WAY + f"&limit=2&sort_by=price_asc&cursor={first['next_cursor']}").json()
+    assert [f["id"] for f in first["items"] + second["items"]] == ["F0", "F1", "F2", "F3"]
+    assert first["count"] == 5
+
+@pytest.mark.parametrize("url", [ONE_WAY, ROUND_TRIP, CONNECTIONS])
+def test_unavailable_dataset_is_a_503(client, monkeypatch, url):
+    monkeypatch.setattr(flights_service, "current", lambda: snapshot())
+    assert client.get(url).status_code == 503
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from app.catalog.geo import GeoGrid, haversine_km, parse_bbox
+from app.core.errors import InvalidParameter
+
+def generate_points(rng, count):
+    """Points clustered near the antimeridian, a pole and a city, plus a few without coordinates."""
+    centres = np.array([[0.0, 179.9], [89.5, 0.0], [48.85, 2.35]])
+    which = rng.integers(0, len(centres), count)
+    lat = np.clip(centres[which, 0] + rng.normal(0, 0.3, count), -90, 90)
+    lng = (centres[which, 1] + rng.normal(0, 0.3, count) + 180) % 360 - 180
+    lat[rng.integers(0, count, 5)] = np.nan
+    return lat, lng
+
+def in_box(lat, lng, south, west, north, east):
+    inside = (lat >= south) & (lat <= north)
+    return inside & (((lng >= west) & (lng <= east)) if west <= east else ((lng >= west) | (lng <= east)))
+
+@pytest.mark.parametrize("seed", range(10))
+def test_boxes_match_a_full_scan(seed):
+    rng = np.random.default_rng(seed)
+    lat, lng = generate_points(rng, 3000)
+    grid = GeoGrid(lat, lng, cell_degrees=rng.choice([0.05, 0.1, 1.0]))
+    for _ in range(40):
+        south, north = np.sort(rng.uniform(-1, 90, 2))
+        west, east = rng.uniform(-180, 180, 2)  # west > east crosses the antimeridian
+        expected = np.flatnonzero(in_box(lat, lng, south, west, north, east))
+        assert grid.within_bbox(south, west, north, east).tolist() == expected.tolist()
+
+@pytest.mark.parametrize("seed", range(10))
+def test_radius_matches_a_full_scan(seed):
+    rng = np.random.default_rng(seed)
+    lat, lng = generate_points(rng, 3000)
+    grid = GeoGrid(lat, lng)
+    for _ in range(40):
+        centre = rng.integers(0, len(lat))
+        plat, plng = (0.0, 180.0) if np.isnan(lat[centre]) else (lat[centre], lng[centre])
+        radius = rng.choice([1.0, 15.0, 60.0, 500.0])
+        distance = haversine_km(lat, lng, plat, plng)
+        expected = np.flatnonzero(distance <= radius)
+        rows, distances = grid.within_radius(plat, plng, radius)
+        assert rows.tolist() == expected.tolist()
+        assert distances == pytest.approx(distance[expected])
+
+def test_haversine_known_distance():
+    # Paris to London
+    assert haversine_km(np.array([51.5074]), np.array([-0.1278]), 48.8566, 2.3522)[0] == pytest.approx(343.5, abs=1)
+
+@pytest.mark.parametrize("value", ["1,2,3", "a,b,c,d", "10,0,5,1", "0,-181,1,0", "-91,0,0,1"])
+def test_malformed_boxes_are_rejected(value):
+    with pytest.raises(InvalidParameter):
+        parse_bbox(value)
+
+def test_box_is_parsed_in_order():
+    assert parse_bbox("48.8,2.2,48.9,2.4") == (48.8, 2.2, 48.9, 2.4)
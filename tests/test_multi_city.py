@@ -0,0 +1,86 @@
+import itertools
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.catalog.flights import FlightIndex
+from app.catalog.multi_city import Leg, build_itineraries, parse_legs
+from app.core.currency import USD_RATES
+from app.core.errors import InvalidParameter
+from conftest import itinerary
+
+ROUTE = [Leg("JFK", "LAX", "2025-09-01"), Leg("LAX", "SEA", "2025-09-01"), Leg("SEA", "JFK", "2025-09-02")]
+
+def generate_flights(rnd, per_leg):
+    flights = []
+    for leg in ROUTE:
+        for _ in range(rnd.randint(1, per_leg)):
+            depart = datetime.fromisoformat(leg.date) + timedelta(minutes=rnd.randrange(0, 24 * 60, 30))
+            currency = rnd.choice(list(USD_RATES))
+            flights.append(itinerary(
+                f"F{len(flights)}", leg.origin, leg.destination, depart.isoformat(),
+                minutes=rnd.randrange(60, 600, 30), price=round(rnd.uniform(50, 400) * USD_RATES[currency]),
+                currency=currency, airline=rnd.choice(["AA", "UA"]),
+            ))
+    return flights
+
+def usd(flight):
+    return flight["price"]["total"] / USD_RATES[flight["price"]["currency"]]
+
+def brute_force(flights, legs, objective, airline=None, price_min=None, price_max=None):
+    """(cost, ids) of every itinerary flying the legs in order, cheapest first."""
+    options = [[f for f in flights
+                if (f["legs"][0]["segments"][0]["from"]["code"], f["legs"][0]["segments"][0]["to"]["code"])
+                == (leg.origin, leg.destination)
+                and f["legs"][0]["segments"][0]["depart_utc"].startswith(leg.date)
+                and (airline is None or f["airline"]["code"] == airline)
+                and (price_max is None or usd(f) <= price_max)] for leg in legs]
+    out = []
+    for combo in itertools.product(*options):
+        segments = [f["legs"][0]["segments"][0] for f in combo]
+        if any(b["depart_utc"] < a["arrive_utc"] for a, b in zip(segments, segments[1:])):
+            continue
+        price = sum(map(usd, combo))
+        if (price_max is not None and price > price_max) or (price_min is not None and price < price_min):
+            continue
+        cost = sum(f["duration_total_minutes"] for f in combo) if objective == "duration" else price
+        out.append((cost, tuple(f["id"] for f in combo)))
+    return sorted(out)
+
+@pytest.mark.parametrize("objective", ["price", "duration"])
+@pytest.mark.parametrize("seed", range(12))
+def test_best_itineraries_match_every_combination(objective, seed):
+    rnd = random.Random(seed)
+    flights = generate_flights(rnd, 5)
+    legs = ROUTE[:rnd.choice([2, 3])]
+    filters = {"airline": rnd.choice([None, "AA"]), "price_min": rnd.choice([None, 300.0]),
+               "price_max": rnd.choice([None, 900.0])}
+    k = rnd.choice([3, 10, 200])
+
+    expected = brute_force(flights, legs, objective, **filters)
+    got = build_itineraries(FlightIndex(flights), legs, objective, k, **filters)
+    by_id = {f["id"]: f for f in flights}
+    costs = [sum(by_id[i]["duration_total_minutes"] for i in g["components"]) if objective == "duration"
+             else g["price"]["total"] for g in got]
+    assert costs == pytest.approx([cost for cost, _ in expected[:k]], abs=0.01)
+    if k >= len(expected):
+        assert sorted(tuple(g["components"]) for g in got) == sorted(ids for _, ids in expected)
+
+def test_legs_in_different_currencies_are_totalled_in_usd():
+    flights = [
+        itinerary("A", "JFK", "LAX", "2025-09-01T08:00:00", price=100, currency="USD"),
+        itinerary("B", "LAX", "SEA", "2025-09-01T14:00:00", price=85, currency="EUR"),
+        itinerary("C", "LAX", "SEA", "2025-09-01T15:00:00", price=5500, currency="JPY"),
+    ]
+    flights[0]["price"]["member_price"] = 90
+    flights[1]["price"]["member_price"] = 68
+    got = build_itineraries(FlightIndex(flights), ROUTE[:2])
+    assert [g["components"] for g in got] == [["A", "C"], ["A", "B"]]
+    assert got[0]["price"] == {"total": 150.0, "currency": "USD"}
+    assert got[1]["price"] == {"total": 200.0, "currency": "USD", "member_price": 170.0}
+
+@pytest.mark.parametrize("values", [["JFK-LAX-2025-09-01"], ["JFK-LAX", "LAX-SEA-2025-09-01"], ["JFK-LAX-Sept"]])
+def test_malformed_legs_are_rejected(values):
+    with pytest.raises(InvalidParameter):
+        parse_legs(values)
@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from app.catalog.flights import FlightIndex
+from app.core.errors import InvalidParameter
+from app.core.pagination import decode_cursor, encode_cursor, top_k
+from conftest import itinerary
+
+SORTS = {
+    "price_asc": (lambda x: x["price"], False),
+    "price_desc": (lambda x: x["price"], True),
+    "rating": (lambda x: x["rating"], True),
+}
+
+def generate_items(count, rnd):
+    # Few distinct keys, so most ranks are decided by the position tie-break
+    return [{"id": i, "price": rnd.randint(0, 20), "rating": rnd.choice([3.5, 4.0, 4.5])} for i in range(count)]
+
+def expected_order(items, sort_by):
+    if sort_by is None:
+        return list(items)
+    key, reverse = SORTS[sort_by]
+    return sorted(items, key=key, reverse=reverse)  # stable, like the heap's position tie-break
+
+@pytest.mark.parametrize("sort_by", [None, "price_asc", "price_desc", "rating"])
+@pytest.mark.parametrize("count", [0, 1, 7, 250])
+def test_top_k_matches_a_full_sort(sort_by, count):
+    items = generate_items(count, random.Random(count))
+    page, total, next_cursor = top_k(items, SORTS.get(sort_by), sort_by, None, None)
+    assert page == expected_order(items, sort_by)
+    assert total == count
+    assert next_cursor is None
+
+@pytest.mark.parametrize("sort_by", [None, "price_asc", "price_desc", "rating"])
+@pytest.mark.parametrize("limit", [1, 3, 10, 50])
+def test_cursor_pages_cover_the_sorted_list_once(sort_by, limit):
+    items = generate_items(123, random.Random(limit))
+    pages, cursor = [], None
+    while True:
+        page, total, cursor = top_k(items, SORTS.get(sort_by), sort_by, limit, cursor)
+        assert total == len(items)
+        assert len(page) <= limit
+        pages.extend(page)
+        if cursor is None:
+            break
+    assert pages == expected_order(items, sort_by)
+
+def test_exact_last_page_has_no_cursor():
+    items = generate_items(20, random.Random(0))
+    page, _, cursor = top_k(items, SORTS["price_asc"], "price_asc", 10, None)
+    page, _, cursor = top_k(items, SORTS["price_asc"], "price_asc", 10, cursor)
+    assert len(page) == 10
+    assert cursor is None
+
+def test_cursor_is_tied_to_its_sort():
+    items = generate_items(30, random.Random(0))
+    _, _, cursor = top_k(items, SORTS["price_asc"], "price_asc", 5, None)
+    with pytest.raises(InvalidParameter):
+        top_k(items, SORTS["rating"], "rating", 5, cursor)
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "!!", encode_cursor({"k": 1})])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(InvalidParameter):
+        decode_cursor(cursor)
+
+@pytest.mark.parametrize("sort_by", [None, "price_asc", "price_desc", "duration", "departure_time"])
+@pytest.mark.parametrize("limit", [1, 4, 25])
+def test_flight_pages_cover_the_sorted_rows_once(sort_by, limit):
+    rnd = random.Random(limit)
+    flights = [itinerary(f"F{i}", "JFK", "LAX", f"2025-09-01T{rnd.randint(0, 3):02d}:00:00",
+                         minutes=rnd.choice([60, 90]), price=rnd.choice([100, 120.5, 300]))
+               for i in range(90)]
+    index = FlightIndex(flights)
+    expected, total, _ = index.select("JFK", "LAX", sort_by=sort_by)
+    pages, cursor = [], None
+    while True:
+        rows, count, cursor = index.select("JFK", "LAX", sort_by=sort_by, limit=limit, cursor=cursor)
+        assert count == total
+        assert len(rows) <= limit
+        pages.extend(rows.tolist())
+        if cursor is None:
+            break
+    assert pages == expected.tolist()
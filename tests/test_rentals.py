@@ -0,0 +1,85 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.catalog.cars import CarCatalog
+from app.catalog.rentals import RentalAvailability, RentalUnavailable, parse_window, to_minutes
+from app.core.errors import InvalidParameter
+
+def overlaps(reservations, start, end):
+    return any(s < end and start < e for s, e in reservations)
+
+@pytest.mark.parametrize("seed", range(10))
+def test_rental_reservations_match_interval_scan(seed):
+    rnd = random.Random(seed)
+    availability = RentalAvailability()
+    booked = {rental: [] for rental in ("car-1", "car-2", "car-3")}
+    for _ in range(300):
+        rental = rnd.choice(list(booked))
+        # Coarse grid, so windows often touch or share an edge exactly
+        start = rnd.randint(0, 40) * 60
+        end = start + rnd.randint(1, 6) * 60
+        action = rnd.random()
+        if action < 0.5:
+            if overlaps(booked[rental], start, end):
+                with pytest.raises(RentalUnavailable):
+                    availability.reserve(rental, start, end)
+            else:
+                availability.reserve(rental, start, end)
+                booked[rental].append((start, end))
+        elif action < 0.7 and booked[rental]:
+            start, end = rnd.choice(booked[rental])
+            availability.release(rental, start, end)
+            booked[rental].remove((start, end))
+        else:
+            assert availability.is_free(rental, start, end) == (not overlaps(booked[rental], start, end))
+            assert sorted(availability.blocked(start, end)) == sorted(
+                r for r, reservations in booked.items() if overlaps(reservations, start, end))
+        assert availability.reservations(rental) == sorted(booked[rental])
+
+def test_back_to_back_rentals_share_the_boundary_minute():
+    availability = RentalAvailability()
+    availability.reserve("car-1", 600, 720)
+    assert availability.is_free("car-1", 720, 800)
+    assert availability.is_free("car-1", 500, 600)
+    assert not availability.is_free("car-1", 719, 800)
+    assert not availability.is_free("car-1", 500, 601)
+    availability.reserve("car-1", 720, 800)
+    availability.reserve("car-1", 500, 600)
+    assert availability.reservations("car-1") == [(500, 600), (600, 720), (720, 800)]
+
+def test_load_skips_overlapping_reservations():
+    availability = RentalAvailability()
+    availability.load([("car-1", 0, 100), ("car-1", 50, 150), ("car-1", 100, 200), ("car-2", 0, 0)])
+    assert availability.reservations("car-1") == [(0, 100), (100, 200)]
+    assert availability.reservations("car-2") == []
+
+def test_rental_windows_are_parsed_in_utc():
+    assert parse_window(None, None) is None
+    assert parse_window("2025-09-01T10:00:00Z", "2025-09-01T14:00:00+02:00") == (
+        to_minutes("2025-09-01T10:00"), to_minutes("2025-09-01T12:00"))
+    for start, end in [("2025-09-01T10:00", None), ("2025-09-01T10:00", "2025-09-01T10:00"), ("later", "soon")]:
+        with pytest.raises(InvalidParameter):
+            parse_window(start, end)
+
+@pytest.mark.parametrize("reserved", [2, 30])
+def test_available_cars_match_an_interval_scan(reserved):
+    # Candidates outnumbering the reserved rentals are checked through blocked(), the rest one by one
+    rnd = random.Random(reserved)
+    catalog = CarCatalog([{"id": i} for i in range(20)])
+    availability = RentalAvailability()
+    booked = {str(i): [] for i in range(40)}  # ids 20-39 are not in the catalog
+    while len(availability) < reserved:
+        rental = rnd.choice(list(booked))
+        start = rnd.randint(0, 40) * 60
+        end = start + rnd.randint(1, 6) * 60
+        if not overlaps(booked[rental], start, end):
+            availability.reserve(rental, start, end)
+            booked[rental].append((start, end))
+    for _ in range(100):
+        start = rnd.randint(0, 45) * 60
+        end = start + rnd.randint(1, 8) * 60
+        rows = np.array(sorted(rnd.sample(range(20), rnd.randint(0, 20))), dtype=np.int64)
+        expected = [not overlaps(booked[str(i)], start, end) for i in rows]
+        assert catalog.available(rows, (start, end), availability).tolist() == expected
@@ -0,0 +1,73 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from app.catalog.reviews import REVIEW_SORTS, ReviewStore
+from app.core.errors import InvalidParameter
+
+def generate_reviews(rnd, count):
+    reviews = []
+    for i in range(count):
+        review = {"id": i, "stay_id": rnd.choice(["S1", "S2", 3]),
+                  "rating": rnd.choice([None, 1, 2.4, 2.6, 4, 5]),
+                  "date": rnd.choice([str(date(2025, 1, 1) + timedelta(days=rnd.randint(0, 5))), "", "someday"])}
+        if rnd.random() < 0.7:
+            review["helpful_votes"] = rnd.randint(0, 3)
+        reviews.append(review)
+    return reviews
+
+def expected_order(reviews, sort):
+    """A stay's reviews in file order, sorted stably the plain way."""
+    def ordinal(r):
+        try:
+            return date.fromisoformat(r["date"]).toordinal()
+        except ValueError:
+            return 0
+    keys = {
+        "newest": (ordinal, True), "oldest": (ordinal, False),
+        "rating_desc": (lambda r: r["rating"] or 0, True), "rating_asc": (lambda r: r["rating"] or 0, False),
+        "helpful": (lambda r: r.get("helpful_votes", 0), True),
+    }
+    key, descending = keys[sort]
+    # Descending but still first-in-file first on ties, like the store
+    return sorted(reviews, key=lambda r: -key(r) if descending else key(r))
+
+@pytest.mark.parametrize("sort", list(REVIEW_SORTS))
+@pytest.mark.parametrize("limit", [1, 3, 50])
+def test_pages_walk_each_stays_reviews_in_order(sort, limit):
+    reviews = generate_reviews(random.Random(limit), 120)
+    store = ReviewStore.from_document({"reviews": reviews})
+    for stay_id in ["S1", "S2", "3", "unknown"]:
+        own = [r for r in reviews if str(r["stay_id"]) == stay_id]
+        assert store.all(stay_id) == own
+        pages, cursor = [], None
+        while True:
+            items, cursor = store.page(stay_id, sort, limit, cursor)
+            assert len(items) <= limit
+            pages.extend(items)
+            if cursor is None:
+                break
+        assert pages == expected_order(own, sort)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_summary_matches_the_reviews(seed):
+    reviews = generate_reviews(random.Random(seed), 200)
+    store = ReviewStore(reviews)
+    for stay_id in ["S1", "S2", "3"]:
+        ratings = [r["rating"] for r in reviews if str(r["stay_id"]) == stay_id and r["rating"] is not None]
+        summary = store.summary(stay_id)
+        assert summary["count"] == sum(str(r["stay_id"]) == stay_id for r in reviews)
+        assert summary["average_rating"] == round(sum(ratings) / len(ratings), 2)
+        assert summary["histogram"] == {str(s): sum(min(5, max(1, round(r))) == s for r in ratings)
+                                        for s in range(1, 6)}
+    assert store.summary("unknown") == {"count": 0, "average_rating": None,
+                                        "histogram": {str(s): 0 for s in range(1, 6)}}
+
+def test_unknown_sort_and_foreign_cursor_are_rejected():
+    store = ReviewStore(generate_reviews(random.Random(0), 30))
+    with pytest.raises(InvalidParameter):
+        store.page("S1", "funniest")
+    _, cursor = store.page("S1", "newest", 1)
+    with pytest.raises(InvalidParameter):
+        store.page("S1", "oldest", 1, cursor)
@@ -0,0 +1,105 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.catalog.flights import FlightIndex
+from app.catalog.routing import ConnectionGraph
+from app.core.currency import USD_RATES
+from app.core.errors import InvalidParameter
+from conftest import itinerary
+
+AIRPORTS = ["JFK", "ORD", "DEN", "LAX", "SEA"]
+START = datetime(2025, 9, 1)
+
+def generate_flights(rnd, count):
+    flights = []
+    for i in range(count):
+        origin, destination = rnd.sample(AIRPORTS, 2)
+        depart = START + timedelta(minutes=rnd.randrange(0, 2 * 24 * 60, 30))
+        currency = rnd.choice(list(USD_RATES))
+        flights.append(itinerary(f"F{i}", origin, destination, depart.isoformat(), minutes=rnd.randrange(60, 400, 30),
+                                 price=round(rnd.uniform(50, 500) * USD_RATES[currency]), currency=currency))
+    return flights
+
+def usd(flight):
+    return flight["price"]["total"] / USD_RATES[flight["price"]["currency"]]
+
+def epoch(timestamp):
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+
+def brute_force(flights, origin, destination, max_stops, min_gap, max_gap, objective):
+    """Every simple path departing origin on START's day, with its cost."""
+    def depart(f):
+        return epoch(f["legs"][0]["segments"][0]["depart_utc"])
+
+    def arrive(f):
+        return epoch(f["legs"][0]["segments"][-1]["arrive_utc"])
+
+    def source(f):
+        return f["legs"][0]["segments"][0]["from"]["code"]
+
+    def target(f):
+        return f["legs"][0]["segments"][-1]["to"]["code"]
+
+    day = epoch(START.strftime("%Y-%m-%dT00:00:00Z"))
+    paths = []
+
+    def extend(path, visited):
+        last = path[-1]
+        if target(last) == destination:
+            cost = sum(map(usd, path)) if objective == "price" else arrive(last) - depart(path[0])
+            paths.append((cost, tuple(f["id"] for f in path)))
+            return
+        if len(path) > max_stops:
+            return
+        for f in flights:
+            gap = depart(f) - arrive(last)
+            if source(f) == target(last) and min_gap * 60 <= gap <= max_gap * 60 and target(f) not in visited:
+                extend(path + [f], visited | {target(f)})
+
+    for f in flights:
+        if source(f) == origin and day <= depart(f) < day + 86400 and target(f) != origin:
+            extend([f], {origin, target(f)})
+    return sorted(paths)
+
+@pytest.mark.parametrize("objective", ["price", "duration"])
+@pytest.mark.parametrize("seed", range(8))
+def test_all_paths_come_out_in_cost_order(objective, seed):
+    rnd = random.Random(seed)
+    flights = generate_flights(rnd, 120)
+    index = FlightIndex(flights)
+    graph = ConnectionGraph(index)
+    origin, destination = rnd.sample(AIRPORTS, 2)
+    max_stops, min_gap, max_gap = rnd.choice([1, 2, 3]), 60, rnd.choice([240, 720, 1440])
+
+    expected = brute_force(flights, origin, destination, max_stops, min_gap, max_gap, objective)
+    # k above the number of paths: the search must return every one of them, cheapest first
+    paths = graph.search(origin, destination, START.date().isoformat(), len(expected) + 10, objective,
+                         max_stops, min_gap, max_gap)
+    got = [tuple(index.itineraries[r]["id"] for r in rows) for rows in paths]
+    assert sorted(got) == sorted(ids for _, ids in expected)
+    costs = {ids: cost for cost, ids in expected}
+    assert [costs[ids] for ids in got] == pytest.approx([cost for cost, _ in expected])
+
+def test_legs_in_different_currencies_are_totalled_in_usd():
+    index = FlightIndex([
+        itinerary("A", "JFK", "ORD", "2025-09-01T08:00:00", price=200, currency="USD"),
+        itinerary("B", "ORD", "LAX", "2025-09-01T12:00:00", price=11000, currency="JPY"),
+        # Cheaper by raw number, dearer in USD
+        itinerary("C", "JFK", "LAX", "2025-09-01T09:00:00", price=350, currency="EUR"),
+    ])
+    graph = ConnectionGraph(index)
+    paths = graph.search("JFK", "LAX", "2025-09-01", 5)
+    described = [graph.describe(rows) for rows in paths]
+    assert [d["components"] for d in described] == [["A", "B"], ["C"]]
+    assert described[0]["price"] == {"total": 300.0, "currency": "USD"}
+    assert described[1]["price"] == {"total": round(350 / 0.85, 2), "currency": "USD"}
+
+def test_unknown_currency_legs_are_not_used():
+    index = FlightIndex([itinerary("A", "JFK", "LAX", "2025-09-01T08:00:00", currency="XXX")])
+    assert ConnectionGraph(index).search("JFK", "LAX", "2025-09-01") == []
+
+def test_malformed_date_is_rejected():
+    with pytest.raises(InvalidParameter):
+        ConnectionGraph(FlightIndex([])).search("JFK", "LAX", "01/09/2025")
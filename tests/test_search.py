@@ -0,0 +1,174 @@
+import random
+
+import pytest
+
+from app.core.search import SAMPLE_FROM, SearchSpec, field
+from app.services import activities_service, flights_service
+from conftest import itinerary, snapshot
+
+SPEC = SearchSpec(
+    fields={
+        "location": field("location", default=""),
+        "category": field("category", default=""),
+        "tags": field("tags", default=()),
+        "price": field("price", "amount", default=0),
+        "rating": field("rating", default=None),
+        "free_cancellation": field("free_cancellation", default=False),
+    },
+    sorts={
+        "price_asc": (lambda x: x.get("price", {}).get("amount", 0), False),
+        "rating": (lambda x: x.get("rating") or 0, True),
+    },
+)
+
+LOCATIONS = ["Paris, France", "New York, USA", "Tokyo, Japan", "Barcelona, Spain"]
+CATEGORIES = ["Tours", "Museums", "Food & Dining", "Outdoor Activities"]
+TAGS = ["family", "night", "guided", "accessible"]
+
+def generate_items(count, rnd):
+    items = []
+    for i in range(count):
+        item = {"id": i, "location": rnd.choice(LOCATIONS), "category": rnd.choice(CATEGORIES),
+                "tags": rnd.sample(TAGS, rnd.randint(0, 3)), "free_cancellation": rnd.random() < 0.5}
+        # Some items lack a price or rating, as in the data files
+        if rnd.random() < 0.9:
+            item["price"] = {"amount": rnd.randint(0, 300), "currency": "USD"}
+        if rnd.random() < 0.8:
+            item["rating"] = rnd.choice([None, 3.0, 3.5, 4.0, 4.5, 5.0])
+        items.append(item)
+    return items
+
+def chained(items, location, categories, tag, price_min, price_max, rating_min, free_cancellation):
+    """The list comprehensions the engine replaced, one per filter."""
+    if location:
+        items = [i for i in items if location.lower() in i.get("location", "").lower()]
+    if categories:
+        items = [i for i in items if i.get("category", "").lower() in {c.lower() for c in categories}]
+    if tag:
+        items = [i for i in items if tag in i.get("tags", ())]
+    if price_min is not None:
+        items = [i for i in items if i.get("price", {}).get("amount", 0) >= price_min]
+    if price_max is not None:
+        items = [i for i in items if i.get("price", {}).get("amount", 0) <= price_max]
+    if rating_min is not None:
+        items = [i for i in items if i.get("rating") is not None and i["rating"] >= rating_min]
+    if free_cancellation is not None:
+        items = [i for i in items if i.get("free_cancellation", False) == free_cancellation]
+    return items
+
+def random_query(rnd):
+    return (
+        rnd.choice([None, "", "paris", "YORK", "o"]),
+        rnd.choice([None, [], ["museums"], ["Tours", "Food & Dining"]]),
+        rnd.choice([None, "family", "night"]),
+        rnd.choice([None, 0, 50, 150]),
+        rnd.choice([None, 100, 250]),
+        rnd.choice([None, 3.5, 4.5]),
+        rnd.choice([None, True, False]),
+    )
+
+def conditions(location, categories, tag, price_min, price_max, rating_min, free_cancellation):
+    return [
+        ("location", "contains", location),
+        ("category", "in", categories),
+        ("tags", "has", tag),
+        ("price", ">=", price_min),
+        ("price", "<=", price_max),
+        ("rating", ">=", rating_min),
+        ("free_cancellation", "==", free_cancellation),
+    ]
+
+# Below and above SAMPLE_FROM: condition order from the priors, then from a measured sample
+@pytest.mark.parametrize("count", [40, SAMPLE_FROM * 2])
+@pytest.mark.parametrize("seed", range(15))
+def test_filter_matches_chained_filters(count, seed):
+    rnd = random.Random(seed)
+    items = generate_items(count, rnd)
+    query = random_query(rnd)
+    assert list(SPEC.filter(items, conditions(*query))) == chained(items, *query)
+
+@pytest.mark.parametrize("sort_by", [None, "price_asc", "rating"])
+@pytest.mark.parametrize("seed", range(5))
+def test_search_pages_match_sorted_chained_filters(sort_by, seed):
+    rnd = random.Random(seed)
+    items = generate_items(SAMPLE_FROM * 2, rnd)
+    query = random_query(rnd)
+    expected = chained(items, *query)
+    if sort_by:
+        key, reverse = SPEC.sorts[sort_by]
+        expected = sorted(expected, key=key, reverse=reverse)
+
+    pages, cursor = [], None
+    while True:
+        page, total, cursor = SPEC.search(items, conditions(*query), sort_by, 25, cursor)
+        assert total == len(expected)
+        pages.extend(page)
+        if cursor is None:
+            break
+    assert pages == expected
+
+def test_unknown_operator_is_rejected():
+    with pytest.raises(ValueError):
+        SPEC.predicate([("price", "~", 1)])
+
+def original_activities(items, location, category, price_min, price_max, rating_min, sort_by):
+    """search_activities before the shared engine."""
+    if location:
+        items = [d for d in items if location.lower() in d["location"].lower()]
+    if category:
+        items = [i for i in items if i.get("category", "").lower() in {c.lower() for c in category}]
+    if price_min is not None:
+        items = [i for i in items if i.get("price", {}).get("amount", 0) >= price_min]
+    if price_max is not None:
+        items = [i for i in items if i.get("price", {}).get("amount", 0) <= price_max]
+    if rating_min is not None:
+        items = [i for i in items if i.get("rating", 0) >= rating_min]
+    if sort_by in activities_service.ACTIVITY_SEARCH.sorts:
+        key, reverse = activities_service.ACTIVITY_SEARCH.sorts[sort_by]
+        items = sorted(items, key=key, reverse=reverse)
+    return items
+
+@pytest.mark.parametrize("seed", range(6))
+def test_activity_search_matches_the_original_filters(monkeypatch, seed):
+    rnd = random.Random(seed)
+    # Activities always carry a price (the sorts index it) and never a null rating
+    items = [{k: v for k, v in item.items() if k != "rating" or v is not None}
+             for item in generate_items(300, rnd) if "price" in item]
+    monkeypatch.setattr(activities_service, "current",
+                        lambda: snapshot(**{"activities/activities_search.json": items}))
+    for _ in range(30):
+        location, categories, _, price_min, price_max, rating_min, _ = random_query(rnd)
+        sort_by = rnd.choice([None, "price_asc", "price_desc", "rating", "popularity"])
+        result = activities_service.search_activities(location, None, categories, price_min, price_max, rating_min,
+                                                      sort_by)
+        expected = original_activities(items, location, categories, price_min, price_max, rating_min, sort_by)
+        assert result["items"] == expected
+        assert result["count"] == len(expected)
+
+def original_multi_city(items, seat_class, stops, airline, price_min, price_max):
+    """The static multi-city filters before the shared engine."""
+    if seat_class:
+        items = [r for r in items if seat_class in r.get("seat_classes", [])]
+    if stops is not None:
+        items = [r for r in items if (r.get("stops") == stops if stops in (0, 1) else r.get("stops", 0) >= 2)]
+    if airline:
+        items = [r for r in items if r.get("airline", {}).get("code") == airline.upper()]
+    if price_min is not None:
+        items = [r for r in items if r.get("price", {}).get("total", 0) >= price_min]
+    if price_max is not None:
+        items = [r for r in items if r.get("price", {}).get("total", 0) <= price_max]
+    return items
+
+@pytest.mark.parametrize("seed", range(6))
+def test_static_multi_city_search_matches_the_original_filters(monkeypatch, seed):
+    rnd = random.Random(seed)
+    items = [itinerary(f"M{i}", "JFK", "LAX", f"2025-09-0{rnd.randint(1, 5)}T08:00:00", price=rnd.randint(200, 900),
+                       airline=rnd.choice(["AA", "UA"]), stops=rnd.randint(0, 3),
+                       seat_classes=rnd.sample(["economy", "business"], rnd.randint(0, 2))) for i in range(200)]
+    monkeypatch.setattr(flights_service, "current", lambda: snapshot(**{"flights/multi_city.json": items}))
+    for _ in range(30):
+        filters = (rnd.choice([None, "business"]), rnd.choice([None, 0, 1, 2]), rnd.choice([None, "ua"]),
+                   rnd.choice([None, 400]), rnd.choice([None, 700]))
+        result = flights_service.search_multi_city(1, *filters, "price_asc")
+        expected = sorted(original_multi_city(items, *filters), key=lambda r: r["price"]["total"])
+        assert result["items"] == expected
@@ -0,0 +1,59 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.catalog.stays import AmenityBits, StayCatalog
+
+AMENITIES = [f"amenity-{i}" for i in range(70)]  # more than one 64-bit word
+
+def generate_stays(rnd, count):
+    stays = []
+    for i in range(count):
+        stay = {"id": f"S{i}", "location": "Paris", "amenities": rnd.sample(AMENITIES[:8] + AMENITIES[-3:], 4)}
+        if rnd.random() < 0.9:
+            stay["price"] = rnd.choice([80, 120, 200])
+        if rnd.random() < 0.9:
+            stay["rating"] = rnd.choice([3.5, 4.2, 4.8])
+        if rnd.random() < 0.9:
+            stay["stars"] = rnd.randint(2, 5)
+        stays.append(stay)
+    return stays
+
+def chained(stays, price_min=None, price_max=None, rating=None, stars=None, amenities=None):
+    """The per-stay checks the vectorized filters replaced."""
+    out = stays
+    if price_min is not None:
+        out = [s for s in out if "price" in s and s["price"] >= price_min]
+    if price_max is not None:
+        out = [s for s in out if "price" in s and s["price"] <= price_max]
+    if rating is not None:
+        out = [s for s in out if "rating" in s and s["rating"] >= rating]
+    if stars is not None:
+        out = [s for s in out if s.get("stars") == stars]
+    if amenities:
+        out = [s for s in out if all(a in s["amenities"] for a in amenities)]
+    return [s["id"] for s in out]
+
+@pytest.mark.parametrize("seed", range(10))
+def test_filters_match_per_stay_checks(seed):
+    rnd = random.Random(seed)
+    stays = generate_stays(rnd, 300)
+    catalog = StayCatalog(stays, AMENITIES)
+    rows = np.arange(len(stays))
+    for _ in range(50):
+        filters = {
+            "price_min": rnd.choice([None, 100]),
+            "price_max": rnd.choice([None, 120]),
+            "rating": rnd.choice([None, 4.2]),
+            "stars": rnd.choice([None, 3]),
+            "amenities": rnd.choice([None, [], rnd.sample(AMENITIES[:8], 1), [AMENITIES[1], AMENITIES[-1]],
+                                     ["not-offered"]]),
+        }
+        assert [s["id"] for s in catalog.take(catalog.filter(rows, **filters))] == chained(stays, **filters)
+
+def test_known_amenities_keep_their_bits():
+    bits = AmenityBits([["pool", "extra"]], known=["wifi", "pool"])
+    assert bits.codes == {"wifi": 0, "pool": 1, "extra": 2}
+    assert bits.mask(["gym"]) is None
+    assert bits.has_all(np.array([0]), ["pool", "extra"]).tolist() == [True]
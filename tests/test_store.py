@@ -0,0 +1,135 @@
+import json
+import os
+import time
+
+import pytest
+
+from app.catalog import store
+from app.catalog.store import DATASETS, CatalogStore, Dataset, DatasetUnavailable
+from app.core.cache import SearchCache
+
+class Builds:
+    """Dataset builder that counts its calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, *documents):
+        self.calls += 1
+        return {"documents": documents}
+
+@pytest.fixture
+def data(tmp_path, monkeypatch):
+    """A store over tmp_path with two datasets: `numbers` and `pair` (a.json and optional b.json)."""
+    builds = {"numbers": Builds(), "pair": Builds()}
+    monkeypatch.setattr(store, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(store, "DATASETS", {
+        "numbers": Dataset(("numbers.json",), builds["numbers"], ("numbers",)),
+        "pair": Dataset(("a.json", "b.json"), builds["pair"], ("pairs",), optional=("b.json",)),
+    })
+    cache = SearchCache(100, 1000, 60)
+    monkeypatch.setattr(store, "search_cache", cache)
+    write(tmp_path / "numbers.json", [1, 2, 3])
+    write(tmp_path / "a.json", {"a": 1})
+    return tmp_path, builds, cache
+
+def write(path, value):
+    """Write JSON and move the mtime forward, so a rewrite is seen as a change even within one clock tick."""
+    path.write_text(value if isinstance(value, str) else json.dumps(value), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+def test_load_builds_every_dataset_once(data):
+    _, builds, _ = data
+    catalog = CatalogStore()
+    snapshot = catalog.current()
+    assert snapshot.get("numbers") == {"documents": ([1, 2, 3],)}
+    assert snapshot.get("pair") == {"documents": ({"a": 1}, None)}  # missing optional file
+    catalog.current().get("numbers")
+    assert [b.calls for b in builds.values()] == [1, 1]
+    assert catalog.status()["errors"] == {}
+
+def test_reload_rebuilds_only_changed_datasets(data):
+    tmp_path, builds, _ = data
+    catalog = CatalogStore()
+    catalog.load()
+    assert catalog.reload().result() == []
+    write(tmp_path / "b.json", {"b": 2})
+    assert catalog.changed() == ["pair"]
+    assert catalog.reload().result() == ["pair"]
+    assert catalog.current().get("pair") == {"documents": ({"a": 1}, {"b": 2})}
+    assert [b.calls for b in builds.values()] == [1, 2]
+    assert sorted(catalog.reload(force=True).result()) == ["numbers", "pair"]
+
+def test_old_snapshot_is_untouched_by_a_reload(data):
+    tmp_path, _, _ = data
+    catalog = CatalogStore()
+    before = catalog.current()
+    write(tmp_path / "numbers.json", [4])
+    catalog.reload().result()
+    assert before.get("numbers") == {"documents": ([1, 2, 3],)}
+    assert catalog.current().get("numbers") == {"documents": ([4],)}
+    with pytest.raises(TypeError):
+        before.values["numbers"] = None
+
+def test_reload_clears_only_the_rebuilt_namespaces(data):
+    tmp_path, _, cache = data
+    catalog = CatalogStore()
+    catalog.load()
+    cache.put(("numbers", "search"), [1])
+    cache.put(("pairs", "search"), [1])
+    write(tmp_path / "numbers.json", [4])
+    catalog.reload().result()
+    assert not cache.get(("numbers", "search"))[0]
+    assert cache.get(("pairs", "search"))[0]
+
+def test_broken_file_keeps_the_loaded_version(data):
+    tmp_path, _, _ = data
+    catalog = CatalogStore()
+    catalog.load()
+    write(tmp_path / "numbers.json", "{not json")
+    assert catalog.reload().result() == []
+    assert catalog.current().get("numbers") == {"documents": ([1, 2, 3],)}
+    assert "numbers" in catalog.status()["errors"]
+    # Recorded against the broken file, so it is not parsed again until it changes
+    assert catalog.changed() == []
+
+def test_failed_dataset_is_retried_only_once_its_files_change(data):
+    tmp_path, builds, _ = data
+    write(tmp_path / "numbers.json", "{not json")
+    catalog = CatalogStore()
+    catalog.load()
+    for _ in range(3):
+        with pytest.raises(DatasetUnavailable):
+            catalog.current().get("numbers")
+    assert builds["numbers"].calls == 0
+    assert catalog.reloads == 0
+
+    write(tmp_path / "numbers.json", [5])
+    assert catalog.current().get("numbers") == {"documents": ([5],)}
+    assert catalog.status()["errors"] == {}
+
+def test_unknown_dataset_is_a_key_error(data):
+    with pytest.raises(KeyError):
+        CatalogStore().current().get("nope")
+
+def test_watcher_reloads_changed_files(data):
+    tmp_path, _, _ = data
+    catalog = CatalogStore()
+    catalog.load()
+    catalog.watch(0.05)
+    try:
+        write(tmp_path / "numbers.json", [9])
+        deadline = time.monotonic() + 5
+        while catalog.current().get("numbers") != {"documents": ([9],)} and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert catalog.current().get("numbers") == {"documents": ([9],)}
+        assert catalog.status()["watching"]
+    finally:
+        catalog.stop()
+    assert not catalog.status()["watching"]
+
+def test_every_registered_file_ships_with_the_app():
+    missing = [(name, filename) for name, dataset in DATASETS.items() for filename in dataset.files
+               if filename not in dataset.optional and not (store.DATA_DIR / filename).exists()]
+    assert missing == []
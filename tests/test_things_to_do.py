@@ -0,0 +1,110 @@
+import json
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from app.catalog.things_to_do import CategoryView, ThingsToDoCatalog, activity_image
+from app.core.errors import InvalidParameter
+from app.services import things_to_do_service
+from conftest import snapshot
+
+START = date(2025, 9, 1)
+LOCATIONS = ["Paris, France", "Paris Disneyland, France", "Orlando, FL", "Grand Canyon, AZ", "paris, TX"]
+CATEGORIES = ["Tours", "Museums", "tours", "Food & Dining"]
+
+def day(offset):
+    return (START + timedelta(days=offset)).isoformat()
+
+def generate_activities(rnd, count):
+    return [{"id": f"ttd-{i + 1}", "name": f"Activity {i + 1}", "location": rnd.choice(LOCATIONS),
+             "category": rnd.choice(CATEGORIES), "duration": rnd.choice(["2 hours", "Full day", "full DAY"]),
+             "rating": rnd.choice([3.9, 4.5, 4.8]), "reviews_count": rnd.randint(0, 500),
+             "price": rnd.choice([25, 60, 120]),
+             "available_dates": [day(d) for d in rnd.sample(range(30), rnd.randint(0, 8))]} for i in range(count)]
+
+def scan(items, location, date_from, date_to=None, category=None, price_min=None, price_max=None, duration=None,
+         min_rating=None):
+    """The original comprehensions, with the date widened to a range when `date_to` is given."""
+    return [i["id"] for i in items
+            if (not location or location.lower() in i["location"].lower())
+            and any(date_from <= d <= (date_to or date_from) for d in i["available_dates"])
+            and (not category or i["category"].lower() == category.lower())
+            and (not duration or i["duration"].lower() == duration.lower())
+            and (min_rating is None or i["rating"] >= min_rating)
+            and (price_min is None or i["price"] >= price_min)
+            and (price_max is None or i["price"] <= price_max)]
+
+@pytest.mark.parametrize("seed", range(8))
+def test_select_matches_the_chained_filters(seed):
+    rnd = random.Random(seed)
+    items = generate_activities(rnd, 300)
+    catalog = ThingsToDoCatalog.from_document({"things_to_do": items})
+    for _ in range(80):
+        start = rnd.randint(-2, 31)
+        query = {
+            "location": rnd.choice([None, "", "paris", "FRANCE", "a", "Tokyo"]),
+            "date_from": day(start),
+            "date_to": rnd.choice([None, day(start), day(start + rnd.randint(1, 10))]),
+            "category": rnd.choice([None, "TOURS", "museums", "Nightlife"]),
+            "duration": rnd.choice([None, "full day"]),
+            "min_rating": rnd.choice([None, 4.5]),
+            "price_min": rnd.choice([None, 60]),
+            "price_max": rnd.choice([None, 60, 100]),
+        }
+        assert [i["id"] for i in catalog.take(catalog.select(**query))] == scan(items, **query)
+
+def test_reversed_date_range_is_rejected():
+    catalog = ThingsToDoCatalog(generate_activities(random.Random(0), 10))
+    with pytest.raises(InvalidParameter):
+        catalog.select(None, day(5), day(4))
+
+def test_search_results_do_not_change_the_catalog(monkeypatch):
+    items = generate_activities(random.Random(0), 50)
+    monkeypatch.setattr(things_to_do_service, "current",
+                        lambda: snapshot(things_to_do=ThingsToDoCatalog(items)))
+    results = things_to_do_service.search_things_to_do("paris", day(0), date_to=day(29))
+    assert [r["id"] for r in results] == scan(items, "paris", day(0), day(29))
+    assert all("imageUrl" in r for r in results)
+    assert not any("imageUrl" in i for i in items)
+
+def grouped(items, category=None):
+    """The original per-request grouping into landing-page cards."""
+    if category:
+        items = [i for i in items if i["category"].lower() == category.lower()]
+    groups = {}
+    for i in items:
+        groups.setdefault(i["category"], []).append({
+            "id": int(i["id"].split("-")[1]), "title": i["name"], "rating": i["rating"],
+            "reviewsCount": i["reviews_count"], "duration": i["duration"], "price": i["price"],
+            "originalPrice": None, "currency": "USD", "imageUrl": activity_image(i["id"]),
+            "tags": ["Free cancellation"], "memberPrice": False,
+        })
+    return [{"category": name, "items": cards} for name, cards in groups.items()]
+
+@pytest.mark.parametrize("category", [None, "tours", "Museums", "FOOD & DINING"])
+def test_category_view_matches_the_original_grouping(category):
+    items = generate_activities(random.Random(1), 120)
+    view = CategoryView(items)
+    assert json.loads(view.render(category)) == grouped(items, category)
+    assert view.render("Nightlife") is None
+
+@pytest.mark.parametrize("limit", [1, 4, 50])
+def test_category_pages_continue_one_category(limit):
+    items = generate_activities(random.Random(limit), 120)
+    view = CategoryView(items)
+    full = {block["category"]: block["items"] for block in grouped(items)}
+    for block in json.loads(view.render(limit=limit)):
+        cards, cursor = block["items"], block["next_cursor"]
+        assert block["count"] == len(full[block["category"]])
+        while cursor:
+            [block] = json.loads(view.render(limit=limit, cursor=cursor))
+            cards += block["items"]
+            cursor = block["next_cursor"]
+        assert cards == full[block["category"]]
+
+def test_cursor_from_another_category_is_rejected():
+    view = CategoryView(generate_activities(random.Random(0), 60))
+    [block] = json.loads(view.render("museums", limit=1))
+    with pytest.raises(InvalidParameter):
+        view.render("food & dining", limit=1, cursor=block["next_cursor"])
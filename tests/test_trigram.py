@@ -0,0 +1,38 @@
+import random
+from collections import Counter
+
+import pytest
+
+from app.catalog.stays import StayCatalog
+from app.catalog.trigram import TrigramIndex
+
+def generate_texts(rnd, count):
+    # A small alphabet, so short and repeated substrings are everywhere; some texts are shorter than a trigram
+    return [rnd.choice([None, ""]) if rnd.random() < 0.05
+            else "".join(rnd.choice("abcAB ,") for _ in range(rnd.randint(0, 12))) for _ in range(count)]
+
+@pytest.mark.parametrize("seed", range(10))
+def test_search_matches_a_substring_scan(seed):
+    rnd = random.Random(seed)
+    texts = generate_texts(rnd, 300)
+    index = TrigramIndex(texts)
+    assert len(index) == len(texts)
+    for _ in range(100):
+        query = "".join(rnd.choice("abcAB ,z") for _ in range(rnd.randint(0, 5)))
+        prefix = rnd.random() < 0.4
+        lowered = [(t or "").lower() for t in texts]
+        expected = [row for row, text in enumerate(lowered)
+                    if (text.startswith(query.lower()) if prefix else query.lower() in text)]
+        assert index.search(query, prefix=prefix).tolist() == expected
+
+def test_suggestions_count_stays_per_location():
+    rnd = random.Random(0)
+    cities = ["Paris, France", "Parma, Italy", "paris, Texas", "Lyon, France", "Sparta, Greece"]
+    stays = [{"id": i, "location": rnd.choice(cities)} for i in range(200)]
+    catalog = StayCatalog(stays)
+    counts = Counter(s["location"] for s in stays if s["location"].lower().startswith("par"))
+    first_seen = {s["location"]: i for i, s in reversed(list(enumerate(stays)))}
+    expected = sorted(counts, key=lambda name: (-counts[name], first_seen[name]))
+    assert catalog.suggest_locations("PAR") == expected
+    assert catalog.suggest_locations("par", limit=1) == expected[:1]
+    assert catalog.suggest_locations("x") == []